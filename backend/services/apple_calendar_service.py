@@ -6,17 +6,20 @@ Handles bidirectional sync between Apple Calendar and NodeFlow
 import os
 import sys
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-import requests
-from requests.auth import HTTPBasicAuth
-import xml.etree.ElementTree as ET
-from dateutil import parser
+from typing import Dict, List, Optional, Any, Tuple
 import pytz
 
 # Add parent directory to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../utils'))
 from utils.config import config
+from utils.event_writer import bulk_upsert_events, compute_content_hash, CHUNK_SIZE
+from utils.event_cache import invalidate_user_events
+from utils.ical_parser import iter_events, expand_events
+from backend.services.caldav_client import CalDAVClient
+
+# Only the first few calendars of an account are synced
+MAX_CALENDARS = 3
 
 # Optional import for sync tracking
 try:
@@ -75,14 +78,12 @@ class AppleCalendarSync:
 
             print(f"📅 [APPLE SYNC] Using calendar {calendar_id}")
 
-            # Fetch events from Apple Calendar
-            apple_events = self._fetch_apple_events(credentials, date_range)
-            print(f"📥 [APPLE SYNC] Fetched {len(apple_events)} events from Apple Calendar")
-
-            # Sync events to NodeFlow calendar using batch processing
-            synced_count = self._sync_events_batch_apple(apple_events, user_id, calendar_id)
+            # Fetch only changed resources from Apple Calendar and write them in chunks
+            result = self._sync_apple_changes(credentials, user_id, calendar_id, date_range)
+            synced_count = result['synced']
 
-            print(f"✅ [APPLE SYNC] Successfully synced {synced_count} events")
+            print(f"✅ [APPLE SYNC] Successfully synced {synced_count} events "
+                  f"({result['fetched']} fetched, {result['deleted']} removed)")
 
             # Track sync event (if available)
             if SYNC_TRACKING_AVAILABLE and sync_tracker and EventType:
@@ -95,7 +96,7 @@ class AppleCalendarSync:
                         metadata={
                             'calendar_id': calendar_id,
                             'events_synced': synced_count,
-                            'total_events': len(apple_events)
+                            'total_events': result['fetched']
                         }
                     )
                 except Exception as tracking_error:
@@ -104,7 +105,8 @@ class AppleCalendarSync:
             return {
                 'success': True,
                 'synced_events': synced_count,
-                'total_events': len(apple_events),
+                'total_events': result['fetched'],
+                'deleted_events': result['deleted'],
                 'calendar_id': calendar_id
             }
 
@@ -233,382 +235,237 @@ class AppleCalendarSync:
             print(f"❌ [APPLE SYNC] Failed to create active sync: {e}")
             return False
 
+    def _date_window(self, date_range: Optional[Dict[str, str]] = None) -> Tuple[str, str]:
+        """CalDAV time-range bounds (user range, or last 30 days to next 90 days)"""
+        if date_range and date_range.get('start_date') and date_range.get('end_date'):
+            # Parse user-provided date range
+            start_dt = datetime.strptime(date_range['start_date'], '%Y-%m-%d')
+            end_dt = datetime.strptime(date_range['end_date'], '%Y-%m-%d')
+            print(f"📅 [APPLE SYNC] Using user-specified date range: {date_range['start_date']} to {date_range['end_date']}")
+            return start_dt.strftime('%Y%m%dT000000Z'), end_dt.strftime('%Y%m%dT235959Z')
+
+        print(f"📅 [APPLE SYNC] Using default date range: last 30 days to next 90 days")
+        return (
+            (datetime.now() - timedelta(days=30)).strftime('%Y%m%dT000000Z'),
+            (datetime.now() + timedelta(days=90)).strftime('%Y%m%dT235959Z')
+        )
+
+    def _caldav_client(self, credentials: Dict) -> CalDAVClient:
+        return CalDAVClient(credentials['server_url'], credentials['username'], credentials['password'])
+
     def _fetch_apple_events(self, credentials: Dict, date_range: Optional[Dict[str, str]] = None) -> List[Dict]:
-        """Fetch events from Apple Calendar using CalDAV with optional date range filtering"""
+        """Fetch all events in the date range (stateless, used for connection tests)"""
         events = []
 
         try:
-            server_url = credentials['server_url']
-            username = credentials['username']
-            password = credentials['password']
-
-            # Build CalDAV calendar URL - Apple uses a specific format
-            # For iCloud, we need to discover the correct calendar URLs first
-            if 'icloud.com' in server_url:
-                # First, discover the user's calendar home
-                principal_url = f"{server_url}/principals/"
-
-                # Make a PROPFIND request to discover calendar home
-                propfind_body = '''<?xml version="1.0" encoding="utf-8" ?>
-                <D:propfind xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:caldav">
-                    <D:prop>
-                        <C:calendar-home-set/>
-                    </D:prop>
-                </D:propfind>'''
-
-                headers = {
-                    'Content-Type': 'text/xml; charset=utf-8',
-                    'Depth': '0'
-                }
+            start_date, end_date = self._date_window(date_range)
+            client = self._caldav_client(credentials)
 
-                print(f"🔍 [APPLE SYNC] Discovering calendar home from {principal_url}")
-
-                discovery_response = requests.request(
-                    'PROPFIND',
-                    principal_url,
-                    auth=HTTPBasicAuth(username, password),
-                    headers=headers,
-                    data=propfind_body,
-                    timeout=30
-                )
-
-                if discovery_response.status_code in [207, 200]:
-                    # Try to extract calendar home from response
-                    try:
-                        import xml.etree.ElementTree as ET
-                        root = ET.fromstring(discovery_response.text)
-                        calendar_home_elements = root.findall('.//{urn:ietf:params:xml:ns:caldav}calendar-home-set/{DAV:}href')
-
-                        if calendar_home_elements:
-                            calendar_home = calendar_home_elements[0].text
-                            if calendar_home.startswith('/'):
-                                calendar_url = f"{server_url}{calendar_home}"
-                            else:
-                                calendar_url = calendar_home
-                            print(f"✅ [APPLE SYNC] Discovered calendar home: {calendar_url}")
-                        else:
-                            # Fallback to common iCloud structure
-                            calendar_url = f"{server_url}/{username.split('@')[0]}/calendars/"
-                            print(f"⚠️ [APPLE SYNC] Using fallback calendar URL: {calendar_url}")
-                    except Exception as parse_error:
-                        # Fallback to common iCloud structure
-                        calendar_url = f"{server_url}/{username.split('@')[0]}/calendars/"
-                        print(f"⚠️ [APPLE SYNC] Calendar discovery parsing failed, using fallback: {calendar_url}")
-                else:
-                    # Fallback to common iCloud structure
-                    calendar_url = f"{server_url}/{username.split('@')[0]}/calendars/"
-                    print(f"⚠️ [APPLE SYNC] Calendar discovery failed ({discovery_response.status_code}), using fallback: {calendar_url}")
-            else:
-                # Generic CalDAV structure
-                principal_url = f"{server_url}/principals/users/{username}/"
-                calendar_url = f"{server_url}/{username.split('@')[0]}/calendars/home/"
-
-            # CalDAV REPORT request to get events
-            # Set date range for event fetching
-            if date_range and date_range.get('start_date') and date_range.get('end_date'):
-                # Parse user-provided date range
-                start_dt = datetime.strptime(date_range['start_date'], '%Y-%m-%d')
-                end_dt = datetime.strptime(date_range['end_date'], '%Y-%m-%d')
-                start_date = start_dt.strftime('%Y%m%dT000000Z')
-                end_date = end_dt.strftime('%Y%m%dT235959Z')
-                print(f"📅 [APPLE SYNC] Using user-specified date range: {date_range['start_date']} to {date_range['end_date']}")
-            else:
-                # Default: Get events from last 30 days to next 90 days
-                start_date = (datetime.now() - timedelta(days=30)).strftime('%Y%m%dT000000Z')
-                end_date = (datetime.now() + timedelta(days=90)).strftime('%Y%m%dT235959Z')
-                print(f"📅 [APPLE SYNC] Using default date range: last 30 days to next 90 days")
-
-            report_body = f'''<?xml version="1.0" encoding="utf-8" ?>
-            <C:calendar-query xmlns:C="urn:ietf:params:xml:ns:caldav" xmlns:D="DAV:">
-                <D:prop>
-                    <D:getetag/>
-                    <C:calendar-data/>
-                </D:prop>
-                <C:filter>
-                    <C:comp-filter name="VCALENDAR">
-                        <C:comp-filter name="VEVENT">
-                            <C:time-range start="{start_date}" end="{end_date}"/>
-                        </C:comp-filter>
-                    </C:comp-filter>
-                </C:filter>
-            </C:calendar-query>'''
-
-            headers = {
-                'Content-Type': 'text/xml; charset=utf-8',
-                'Depth': '1'
-            }
+            for collection in client.list_calendars()[:MAX_CALENDARS]:
+                for resource in client.query_events(collection['url'], start_date, end_date):
+                    if resource.get('data'):
+                        events.extend(self._parse_icalendar_events(resource['data'], start_date, end_date))
 
-            # For iCloud, we need to discover individual calendars first
-            if 'icloud.com' in server_url:
-                print(f"🔍 [APPLE SYNC] Discovering individual calendars from {calendar_url}")
-
-                # PROPFIND to discover calendars
-                calendar_propfind_body = '''<?xml version="1.0" encoding="utf-8" ?>
-                <D:propfind xmlns:D="DAV:" xmlns:C="urn:ietf:params:xml:ns:caldav">
-                    <D:prop>
-                        <D:resourcetype/>
-                        <D:displayname/>
-                        <C:supported-calendar-component-set/>
-                    </D:prop>
-                </D:propfind>'''
-
-                calendar_discovery_response = requests.request(
-                    'PROPFIND',
-                    calendar_url,
-                    auth=HTTPBasicAuth(username, password),
-                    headers={'Content-Type': 'text/xml; charset=utf-8', 'Depth': '1'},
-                    data=calendar_propfind_body,
-                    timeout=30
-                )
-
-                if calendar_discovery_response.status_code in [207, 200]:
-                    # Parse to find individual calendar URLs
-                    try:
-                        import xml.etree.ElementTree as ET
-                        root = ET.fromstring(calendar_discovery_response.text)
-
-                        calendar_urls = []
-                        print(f"🔍 [APPLE SYNC] Parsing calendar discovery response...")
-
-                        all_responses = root.findall('.//{DAV:}response')
-                        print(f"🔍 [APPLE SYNC] Found {len(all_responses)} response elements")
-
-                        for i, response_elem in enumerate(all_responses):
-                            href_elem = response_elem.find('.//{DAV:}href')
-                            resourcetype_elem = response_elem.find('.//{DAV:}resourcetype')
-                            displayname_elem = response_elem.find('.//{DAV:}displayname')
-
-                            href_text = href_elem.text if href_elem is not None else "None"
-                            display_name = displayname_elem.text if displayname_elem is not None else "No name"
-
-                            print(f"📋 [APPLE SYNC] Response {i+1}: href='{href_text}', name='{display_name}'")
-
-                            if href_elem is not None and resourcetype_elem is not None:
-                                # Check if it's a calendar resource
-                                calendar_elem = resourcetype_elem.find('.//{urn:ietf:params:xml:ns:caldav}calendar')
-                                if calendar_elem is not None:
-                                    href = href_elem.text
-                                    if href and not href.endswith('/'):
-                                        href += '/'
-
-                                    if href.startswith('/'):
-                                        full_url = f"https://p25-caldav.icloud.com:443{href}"
-                                    else:
-                                        full_url = href
-
-                                    calendar_urls.append(full_url)
-                                    print(f"📅 [APPLE SYNC] Found calendar: {full_url} (Name: {display_name})")
-                                else:
-                                    print(f"⚠️ [APPLE SYNC] Not a calendar: {href_text}")
-                            else:
-                                print(f"⚠️ [APPLE SYNC] Missing href or resourcetype in response {i+1}")
-
-                        print(f"📊 [APPLE SYNC] Total calendars discovered: {len(calendar_urls)}")
-
-                        # Try to fetch events from each calendar
-                        all_events = []
-                        for cal_url in calendar_urls[:3]:  # Limit to first 3 calendars
-                            print(f"🔍 [APPLE SYNC] Fetching events from calendar: {cal_url}")
-
-                            response = requests.request(
-                                'REPORT',
-                                cal_url,
-                                auth=HTTPBasicAuth(username, password),
-                                headers=headers,
-                                data=report_body,
-                                timeout=30
-                            )
-
-                            if response.status_code in [207, 200]:
-                                cal_events = self._parse_caldav_events(response.text)
-                                all_events.extend(cal_events)
-                                print(f"✅ [APPLE SYNC] Found {len(cal_events)} events in calendar")
-                            else:
-                                print(f"⚠️ [APPLE SYNC] Calendar {cal_url} returned {response.status_code}")
-
-                        events = all_events
-                        print(f"✅ [APPLE SYNC] Total events found: {len(events)}")
-
-                    except Exception as parse_error:
-                        print(f"❌ [APPLE SYNC] Failed to parse calendar discovery: {parse_error}")
-                        events = []
-                else:
-                    print(f"❌ [APPLE SYNC] Calendar discovery failed: {calendar_discovery_response.status_code}")
-                    events = []
-            else:
-                # For non-iCloud servers, try direct access
-                print(f"🔍 [APPLE SYNC] Fetching events from {calendar_url}")
-
-                response = requests.request(
-                    'REPORT',
-                    calendar_url,
-                    auth=HTTPBasicAuth(username, password),
-                    headers=headers,
-                    data=report_body,
-                    timeout=30
-                )
-
-                if response.status_code in [207, 200]:  # Multi-Status or OK
-                    # Parse CalDAV XML response
-                    events = self._parse_caldav_events(response.text)
-                    print(f"✅ [APPLE SYNC] Parsed {len(events)} events from CalDAV response")
-                else:
-                    print(f"❌ [APPLE SYNC] Failed to fetch events: {response.status_code}")
-                    print(f"Response: {response.text[:500]}")
-                    events = []
+            print(f"✅ [APPLE SYNC] Total events found: {len(events)}")
 
         except Exception as e:
             print(f"❌ [APPLE SYNC] Error fetching events: {e}")
 
         return events
 
-    def _parse_caldav_events(self, xml_response: str) -> List[Dict]:
-        """Parse CalDAV XML response to extract events"""
-        events = []
-        print(f"📥 [APPLE SYNC] Starting to parse CalDAV XML response ({len(xml_response)} chars)")
+    def _sync_apple_changes(self, credentials: Dict, user_id: str, calendar_id: str,
+                            date_range: Optional[Dict[str, str]] = None) -> Dict[str, int]:
+        """Stream changed resources per collection into calendar_events
 
-        try:
-            # Parse XML response
-            root = ET.fromstring(xml_response)
-            print(f"✅ [APPLE SYNC] Successfully parsed XML root element")
-
-            # Find all response elements (each contains an event)
-            response_elements = root.findall('.//{DAV:}response')
-            print(f"🔍 [APPLE SYNC] Found {len(response_elements)} response elements in CalDAV XML")
-
-            for i, response in enumerate(response_elements):
-                print(f"📋 [APPLE SYNC] Processing response element {i+1}/{len(response_elements)}")
-
-                calendar_data = response.find('.//{urn:ietf:params:xml:ns:caldav}calendar-data')
-
-                if calendar_data is not None:
-                    if calendar_data.text:
-                        print(f"📅 [APPLE SYNC] Found calendar-data in response {i+1} ({len(calendar_data.text)} chars)")
-                        # Parse iCalendar data
-                        event = self._parse_icalendar_event(calendar_data.text)
-                        if event:
-                            events.append(event)
-                            print(f"✅ [APPLE SYNC] Successfully parsed event: '{event.get('title', 'No title')}'")
-                        else:
-                            print(f"⚠️ [APPLE SYNC] Failed to parse iCalendar event in response {i+1}")
-                    else:
-                        print(f"⚠️ [APPLE SYNC] Empty calendar-data text in response {i+1}")
-                else:
-                    print(f"⚠️ [APPLE SYNC] No calendar-data element found in response {i+1}")
-                    # Let's check what's actually in this response
-                    href_elem = response.find('.//{DAV:}href')
-                    href_text = href_elem.text if href_elem is not None else "No href"
-                    print(f"🔍 [APPLE SYNC] Response {i+1} href: {href_text}")
+        Uses the stored ctag / sync-token / etags per collection so unchanged
+        calendars cost one PROPFIND and changed ones only transfer the delta.
+        Collection state is saved only when all of its writes succeeded.
+        """
+        start_date, end_date = self._date_window(date_range)
+        client = self._caldav_client(credentials)
+        states = self._load_caldav_state(user_id)
+        totals = {'synced': 0, 'fetched': 0, 'deleted': 0}
 
-            print(f"📊 [APPLE SYNC] Finished parsing: {len(events)} valid events extracted")
+        for collection in client.list_calendars()[:MAX_CALENDARS]:
+            state = states.get(collection['url'], {})
+            batch = []
+            removed = []
+            failed = False
 
-        except Exception as e:
-            print(f"❌ [APPLE SYNC] Error parsing CalDAV response: {e}")
-            print(f"📋 [APPLE SYNC] XML response preview: {xml_response[:500]}...")
+            try:
+                for resource in client.iter_changes(collection, state, start_date, end_date):
+                    if resource.get('deleted'):
+                        removed.extend(resource.get('external_ids') or [])
+                        continue
+
+                    # One resource holds a series: master, overrides and expanded occurrences
+                    events = self._parse_icalendar_events(resource['data'], start_date, end_date)
+                    entry = state['resources'].setdefault(resource['href'], {})
+                    external_ids = [event['external_id'] for event in events]
+                    previous_ids = entry.pop('external_ids', None) or (
+                        [entry['external_id']] if entry.get('external_id') else []
+                    )
+                    entry.pop('external_id', None)
+                    # Occurrences outside the current window slid out of it rather than being
+                    # deleted - keep their rows and remember them for when the resource is removed
+                    kept = [
+                        external_id for external_id in set(previous_ids) - set(external_ids)
+                        if self._outside_window(external_id, start_date, end_date)
+                    ]
+                    masters = {
+                        external_id.rsplit('_', 1)[0] for external_id in external_ids
+                        if self._occurrence_of(external_id)
+                    }
+                    entry['external_ids'] = external_ids + kept
+                    # Occurrences dropped by an EXDATE/RRULE edit
+                    removed.extend(set(previous_ids) - set(external_ids) - set(kept))
+                    if masters and not entry.get('recurring'):
+                        # Series stored as a single 'apple_<UID>' row before occurrences were expanded
+                        removed.extend(masters - set(external_ids) - set(previous_ids))
+                    entry['recurring'] = bool(masters)
+
+                    for event in events:
+                        batch.append(event)
+                        totals['fetched'] += 1
+
+                    if len(batch) >= CHUNK_SIZE:
+                        counts = self._sync_events_batch_apple(batch, user_id, calendar_id)
+                        totals['synced'] += counts['created'] + counts['updated'] + counts['unchanged']
+                        failed = failed or counts['failed'] > 0
+                        batch = []
+
+                if batch:
+                    counts = self._sync_events_batch_apple(batch, user_id, calendar_id)
+                    totals['synced'] += counts['created'] + counts['updated'] + counts['unchanged']
+                    failed = failed or counts['failed'] > 0
+
+                if removed:
+                    failed = not self._delete_apple_events(user_id, removed) or failed
+                    totals['deleted'] += len(removed)
+
+            except Exception as e:
+                print(f"❌ [APPLE SYNC] Calendar {collection.get('name') or collection['url']} failed: {e}")
+                failed = True
+
+            if not failed:
+                self._save_caldav_state(user_id, collection['url'], state)
+
+        return totals
+
+    def _occurrence_of(self, external_id: str) -> Optional[str]:
+        """Original start (YYYYMMDDTHHMMSS, UTC) of an 'apple_<UID>_<occurrence>' id, None for single events"""
+        suffix = external_id.rsplit('_', 1)[-1]
+        if len(suffix) == 15 and suffix[8] == 'T' and (suffix[:8] + suffix[9:]).isdigit():
+            return suffix
+        return None
 
-        return events
+    def _outside_window(self, external_id: str, start_date: str, end_date: str) -> bool:
+        occurrence = self._occurrence_of(external_id)
+        return occurrence is not None and not (start_date[:15] <= occurrence < end_date[:15])
 
-    def _parse_icalendar_event(self, ical_text: str) -> Optional[Dict]:
-        """Parse iCalendar format event to dictionary"""
-        print(f"📅 [APPLE SYNC] Parsing iCalendar event ({len(ical_text)} chars)")
-        print(f"📋 [APPLE SYNC] iCal preview: {ical_text[:200]}...")
+    def _load_caldav_state(self, user_id: str) -> Dict[str, Dict]:
+        """Per-collection CalDAV sync state (ctag, sync-token, synced window, href -> etag/external_ids)"""
+        try:
+            supabase = config.get_client_for_user(user_id)
+            result = supabase.table('apple_caldav_sync_state').select(
+                'collection_url, ctag, sync_token, window_start, window_end, resources'
+            ).eq('user_id', user_id).execute()
+            return {
+                row['collection_url']: {
+                    'ctag': row.get('ctag'),
+                    'sync_token': row.get('sync_token'),
+                    'window_start': row.get('window_start'),
+                    'window_end': row.get('window_end'),
+                    'resources': row.get('resources') or {}
+                }
+                for row in result.data or []
+            }
+        except Exception as e:
+            # No stored state - every collection does a full sync
+            print(f"⚠️ [APPLE SYNC] Could not load CalDAV sync state: {e}")
+            return {}
 
+    def _save_caldav_state(self, user_id: str, collection_url: str, state: Dict):
         try:
-            event = {}
-            lines = ical_text.strip().split('\n')
-            print(f"🔍 [APPLE SYNC] Processing {len(lines)} lines in iCalendar data")
-
-            vevent_started = False
-            for i, line in enumerate(lines):
-                line = line.strip()
-
-                # Check if we're in a VEVENT block
-                if line == 'BEGIN:VEVENT':
-                    vevent_started = True
-                    print(f"📍 [APPLE SYNC] Found VEVENT start at line {i+1}")
-                    continue
-                elif line == 'END:VEVENT':
-                    print(f"📍 [APPLE SYNC] Found VEVENT end at line {i+1}")
-                    break
+            supabase = config.get_client_for_user(user_id)
+            supabase.table('apple_caldav_sync_state').upsert({
+                'user_id': user_id,
+                'collection_url': collection_url,
+                'ctag': state.get('ctag'),
+                'sync_token': state.get('sync_token'),
+                'window_start': state.get('window_start'),
+                'window_end': state.get('window_end'),
+                'resources': state.get('resources') or {},
+                'last_synced_at': datetime.now().isoformat()
+            }, on_conflict='user_id,collection_url').execute()
+        except Exception as e:
+            print(f"⚠️ [APPLE SYNC] Could not save CalDAV sync state: {e}")
 
-                if not vevent_started:
-                    continue
+    def _delete_apple_events(self, user_id: str, external_ids: List[str]) -> bool:
+        """Remove events deleted on the CalDAV server in one query"""
+        try:
+            supabase = config.get_client_for_user(user_id)
+            supabase.table('calendar_events').delete().eq(
+                'user_id', user_id
+            ).eq('source_platform', 'apple').in_('external_id', external_ids).execute()
+            invalidate_user_events(user_id)
+            print(f"🗑️ [APPLE SYNC] Removed {len(external_ids)} deleted events")
+            return True
+        except Exception as e:
+            print(f"❌ [APPLE SYNC] Failed to remove deleted events: {e}")
+            return False
 
-                if line.startswith('SUMMARY:'):
-                    event['title'] = line.replace('SUMMARY:', '').strip()
-                    print(f"📝 [APPLE SYNC] Found title: '{event['title']}'")
-                elif line.startswith('DTSTART'):
-                    # Parse start time
-                    dt_value = line.split(':')[-1].strip()
-                    event['start_datetime'] = self._parse_ical_datetime(dt_value)
-                    print(f"⏰ [APPLE SYNC] Found start time: {event['start_datetime']}")
-                elif line.startswith('DTEND'):
-                    # Parse end time
-                    dt_value = line.split(':')[-1].strip()
-                    event['end_datetime'] = self._parse_ical_datetime(dt_value)
-                    print(f"⏰ [APPLE SYNC] Found end time: {event['end_datetime']}")
-                elif line.startswith('DESCRIPTION:'):
-                    event['description'] = line.replace('DESCRIPTION:', '').strip()
-                    print(f"📖 [APPLE SYNC] Found description: '{event['description'][:50]}...'")
-                elif line.startswith('LOCATION:'):
-                    event['location'] = line.replace('LOCATION:', '').strip()
-                    print(f"📍 [APPLE SYNC] Found location: '{event['location']}'")
-                elif line.startswith('UID:'):
-                    event['external_id'] = 'apple_' + line.replace('UID:', '').strip()
-                    print(f"🆔 [APPLE SYNC] Found UID: {event['external_id']}")
-
-            print(f"📊 [APPLE SYNC] Extracted fields: {list(event.keys())}")
-
-            # Only return if we have at least title and start time
-            if event.get('title') and event.get('start_datetime'):
-                print(f"✅ [APPLE SYNC] Event validation passed: has title and start time")
-
-                # Set default values
-                if not event.get('end_datetime'):
+    def _parse_icalendar_events(self, ical_text: str, start_date: str, end_date: str) -> List[Dict]:
+        """Parse a CalDAV resource into event dicts, expanding recurrences inside the window
+        
+        Non-recurring events keep 'apple_<UID>' as external_id; each occurrence
+        of a recurring series gets 'apple_<UID>_<original start in UTC>'.
+        """
+        events = []
+        try:
+            window_start = datetime.strptime(start_date, '%Y%m%dT%H%M%SZ').replace(tzinfo=pytz.UTC)
+            window_end = datetime.strptime(end_date, '%Y%m%dT%H%M%SZ').replace(tzinfo=pytz.UTC)
+            
+            for occurrence in expand_events(iter_events(ical_text), window_start, window_end):
+                if not occurrence.get('summary') or occurrence.get('start') is None:
+                    print(f"⚠️ [APPLE SYNC] Skipping event without SUMMARY/DTSTART "
+                          f"(title={bool(occurrence.get('summary'))}, start={occurrence.get('start') is not None})")
+                    continue
+                
+                start = occurrence['start']
+                end = occurrence.get('end') or start
+                if end == start and not occurrence['all_day']:
                     # Default to 1 hour duration
-                    start_dt = parser.parse(event['start_datetime'])
-                    end_dt = start_dt + timedelta(hours=1)
-                    event['end_datetime'] = end_dt.isoformat()
-                    print(f"⏰ [APPLE SYNC] Set default end time: {event['end_datetime']}")
-
-                event['platform'] = 'apple'
-                event['all_day'] = 'T' not in event['start_datetime']
-                print(f"📋 [APPLE SYNC] Final event: title='{event['title']}', all_day={event['all_day']}")
-
-                return event
-            else:
-                print(f"❌ [APPLE SYNC] Event validation failed: title={bool(event.get('title'))}, start_datetime={bool(event.get('start_datetime'))}")
-                if not event.get('title'):
-                    print(f"⚠️ [APPLE SYNC] Missing SUMMARY field")
-                if not event.get('start_datetime'):
-                    print(f"⚠️ [APPLE SYNC] Missing DTSTART field")
-
+                    end = start + timedelta(hours=1)
+                
+                external_id = 'apple_' + (occurrence.get('uid') or '')
+                if occurrence.get('occurrence_id'):
+                    external_id += '_' + occurrence['occurrence_id']
+                
+                event = {
+                    'title': occurrence['summary'],
+                    'start_datetime': self._ical_isoformat(start),
+                    'end_datetime': self._ical_isoformat(end),
+                    'description': occurrence.get('description') or '',
+                    'location': occurrence.get('location') or '',
+                    'external_id': external_id,
+                    'platform': 'apple',
+                    'all_day': occurrence['all_day']
+                }
+                # 내용 해시 (변경 없는 이벤트는 저장 생략)
+                event['content_hash'] = compute_content_hash(event)
+                events.append(event)
+        
         except Exception as e:
             print(f"❌ [APPLE SYNC] Error parsing iCalendar event: {e}")
-            print(f"📋 [APPLE SYNC] Failed iCal data: {ical_text}")
-
-        return None
-
-    def _parse_ical_datetime(self, dt_string: str) -> str:
-        """Parse iCalendar datetime format to ISO format"""
-        try:
-            # Handle different iCal datetime formats
-            if 'T' in dt_string:
-                # DateTime format (YYYYMMDDTHHmmss or with Z)
-                if dt_string.endswith('Z'):
-                    dt = datetime.strptime(dt_string, '%Y%m%dT%H%M%SZ')
-                    dt = dt.replace(tzinfo=pytz.UTC)
-                else:
-                    dt = datetime.strptime(dt_string[:15], '%Y%m%dT%H%M%S')
-            else:
-                # Date only format (YYYYMMDD)
-                dt = datetime.strptime(dt_string[:8], '%Y%m%d')
-
-            return dt.isoformat()
+        
+        return events
 
-        except Exception as e:
-            print(f"⚠️ [APPLE SYNC] Error parsing datetime {dt_string}: {e}")
-            return datetime.now().isoformat()
+    def _ical_isoformat(self, value) -> str:
+        """date -> midnight ISO string, datetime -> ISO string (floating times stay naive)"""
+        if not isinstance(value, datetime):
+            value = datetime(value.year, value.month, value.day)
+        return value.isoformat()
 
     def _sync_event_to_notionflow(self, user_id: str, calendar_id: str, event: Dict) -> bool:
         """Sync a single event to NodeFlow calendar using calendar_events table"""
@@ -635,6 +492,7 @@ class AppleCalendarSync:
                         'is_all_day': event.get('all_day', False),
                         'updated_at': datetime.now().isoformat()
                     }).eq('id', existing.data[0]['id']).execute()
+                    invalidate_user_events(user_id)
 
                     print(f"✅ [APPLE SYNC] Updated existing event: {event.get('title')}")
                     return bool(result.data)
@@ -656,6 +514,7 @@ class AppleCalendarSync:
             }
 
             result = supabase.table('calendar_events').insert(event_data).execute()
+            invalidate_user_events(user_id)
             print(f"✅ [APPLE SYNC] Created new event: {event.get('title')}")
             return bool(result.data)
 
@@ -665,108 +524,49 @@ class AppleCalendarSync:
             traceback.print_exc()
             return False
 
-    def _sync_events_batch_apple(self, events: List[Dict], user_id: str, calendar_id: str) -> int:
-        """Apple Calendar 이벤트들을 배치로 처리하여 중복 에러 방지"""
+    def _sync_events_batch_apple(self, events: List[Dict], user_id: str, calendar_id: str) -> Dict[str, int]:
+        """Apple Calendar 이벤트들을 일괄 upsert - content_hash가 같은 이벤트는 다시 쓰지 않음"""
+        counts = {'created': 0, 'updated': 0, 'unchanged': 0, 'failed': 0}
         if not events:
-            return 0
+            return counts
 
         try:
             print(f"💾 [APPLE BATCH] Processing {len(events)} Apple Calendar events")
 
-            # 1. 기존 이벤트들의 external_id 조회 (한 번의 쿼리로)
-            event_ids = [event.get('external_id') for event in events if event.get('external_id')]
-            if not event_ids:
-                return 0
-
-            supabase = config.get_client_for_user(user_id)
-            existing_result = supabase.table('calendar_events').select('external_id').eq(
-                'user_id', user_id
-            ).eq('source_platform', 'apple').in_('external_id', event_ids).execute()
-
-            existing_external_ids = set()
-            if existing_result and existing_result.data:
-                existing_external_ids = {item['external_id'] for item in existing_result.data}
-
-            print(f"🔍 [APPLE BATCH] Found {len(existing_external_ids)} existing events")
-
-            # 2. 새 이벤트와 업데이트 대상 분리
-            new_events = []
-            update_events = []
-
+            rows = []
             for event in events:
                 external_id = event.get('external_id')
                 if not external_id:
                     continue
 
-                if external_id in existing_external_ids:
-                    # 기존 이벤트 업데이트 대상
-                    update_events.append({
-                        'external_id': external_id,
-                        'data': {
-                            'title': event.get('title'),
-                            'description': event.get('description', ''),
-                            'start_datetime': event.get('start_datetime'),
-                            'end_datetime': event.get('end_datetime'),
-                            'location': event.get('location', ''),
-                            'is_all_day': event.get('all_day', False),
-                            'updated_at': datetime.now().isoformat()
-                        }
-                    })
-                else:
-                    # 새 이벤트 삽입 대상
-                    event_data = {
-                        'user_id': user_id,
-                        'calendar_id': calendar_id,
-                        'title': event.get('title', 'Untitled Event'),
-                        'description': event.get('description', ''),
-                        'start_datetime': event.get('start_datetime'),
-                        'end_datetime': event.get('end_datetime'),
-                        'location': event.get('location', ''),
-                        'is_all_day': event.get('all_day', False),
-                        'external_id': external_id,
-                        'source_platform': 'apple',
-                        'created_at': datetime.now().isoformat(),
-                        'updated_at': datetime.now().isoformat()
-                    }
-                    new_events.append(event_data)
-
-            synced_count = 0
-
-            # 3. 배치 삽입 (새 이벤트들)
-            if new_events:
-                try:
-                    insert_result = supabase.table('calendar_events').insert(new_events).execute()
-                    if insert_result and insert_result.data:
-                        synced_count += len(insert_result.data)
-                        print(f"✅ [APPLE BATCH] Created {len(insert_result.data)} new events")
-                except Exception as insert_error:
-                    print(f"❌ [APPLE BATCH] Insert failed: {insert_error}")
-
-            # 4. 개별 업데이트 (기존 이벤트들)
-            updated_count = 0
-            for update_item in update_events:
-                try:
-                    update_result = supabase.table('calendar_events').update(
-                        update_item['data']
-                    ).eq('user_id', user_id).eq(
-                        'external_id', update_item['external_id']
-                    ).eq('source_platform', 'apple').execute()
-
-                    if update_result and update_result.data:
-                        updated_count += 1
-                        synced_count += 1
-                except Exception as update_error:
-                    print(f"❌ [APPLE BATCH] Update failed for {update_item['external_id']}: {update_error}")
+                rows.append({
+                    'user_id': user_id,
+                    'calendar_id': calendar_id,
+                    'title': event.get('title', 'Untitled Event'),
+                    'description': event.get('description', ''),
+                    'start_datetime': event.get('start_datetime'),
+                    'end_datetime': event.get('end_datetime'),
+                    'location': event.get('location', ''),
+                    'is_all_day': event.get('all_day', False),
+                    'external_id': external_id,
+                    'source_platform': 'apple',
+                    'content_hash': event.get('content_hash')
+                })
+
+            if not rows:
+                return counts
 
-            if updated_count > 0:
-                print(f"✅ [APPLE BATCH] Updated {updated_count} existing events")
+            supabase = config.get_client_for_user(user_id)
+            counts = bulk_upsert_events(supabase, rows)
 
-            print(f"💾 [APPLE BATCH] Completed processing Apple Calendar events")
-            return synced_count
+            print(f"💾 [APPLE BATCH] Completed processing Apple Calendar events: "
+                  f"created={counts['created']} updated={counts['updated']} unchanged={counts['unchanged']}")
+            return counts
 
         except Exception as e:
             print(f"❌ [APPLE BATCH] Error processing batch: {e}")
-            return 0
+            counts['failed'] = len(events)
+            return counts
 
 # Create singleton instance
 apple_calendar_sync = AppleCalendarSync()
\ No newline at end of file
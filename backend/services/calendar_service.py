@@ -8,7 +8,8 @@ import sys
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import logging
-from supabase import create_client
+from utils.config import PooledClientProxy
+from utils.event_cache import invalidate_user_events
 from dotenv import load_dotenv
 
 # Add backend to path for service imports
@@ -31,7 +32,7 @@ class CalendarSyncService:
         if not self.supabase_url or not self.supabase_key:
             raise Exception("Supabase credentials not found")
             
-        self.supabase = create_client(self.supabase_url, self.supabase_key)
+        self.supabase = PooledClientProxy(self.supabase_url, self.supabase_key)
         
         # Initialize service providers
         self.google_service = GoogleCalendarService()
@@ -108,7 +109,7 @@ class CalendarSyncService:
             
             # Get events from platform
             if isinstance(provider, GoogleCalendarService):
-                events = self._sync_google_calendar(provider, start_date, end_date)
+                return self._sync_google_incremental(provider)
             elif isinstance(provider, NotionService):
                 events = self._sync_notion(provider, start_date, end_date)
             else:
@@ -125,6 +126,9 @@ class CalendarSyncService:
                 else:
                     failed += 1
             
+            if saved:
+                invalidate_user_events(self.user_id)
+            
             logger.info(f"Sync completed for {platform_name}: {saved} saved, {failed} failed")
 
             return {
@@ -138,37 +142,37 @@ class CalendarSyncService:
             logger.error(f"Error syncing platform: {e}")
             return {'error': str(e)}
     
-    def _sync_google_calendar(self, provider: GoogleCalendarService, start_date: datetime, end_date: datetime) -> List[Dict]:
-        """Sync Google Calendar events"""
-        events = []
-        
-        try:
-            # Get all Google calendars
-            calendars = provider.get_calendar_list(self.user_id)
-            
-            for calendar in calendars:
-                calendar_id = calendar.get('id', 'primary')
-                calendar_name = calendar.get('name', 'Google Calendar')
-                
-                # Get events from this calendar
-                google_events = provider.get_events(
-                    user_id=self.user_id,
-                    calendar_id=calendar_id,
-                    time_min=start_date,
-                    time_max=end_date
-                )
-                
-                # Convert Google events to our format
-                for event in google_events:
-                    formatted_event = self._format_google_event(event, calendar_id, calendar_name)
-                    if formatted_event:
-                        events.append(formatted_event)
-                        
-        except Exception as e:
-            logger.error(f"Error syncing Google Calendar: {e}")
-            
-        return events
-    
+    def _sync_google_incremental(self, provider: GoogleCalendarService) -> Dict[str, Any]:
+        """Sync Google Calendar with stored syncTokens (services/google_calendar_sync.py)
+
+        Only changes since the last sync are fetched, cancelled events are deleted,
+        and a calendar's token only advances after all of its writes succeeded.
+        The first sync (or one after 410 Gone) fetches the default window.
+        Calendars picked on the connection page are honored; without a selection
+        every calendar is synced, as the scheduler always did.
+        """
+        from services.google_calendar_sync import GoogleCalendarSyncService
+
+        credentials = provider.get_google_credentials(self.user_id)
+        result = GoogleCalendarSyncService().sync_user_events(
+            self.user_id, credentials=credentials, all_if_unselected=True
+        )
+        if not result.get('success'):
+            return {'error': result.get('error') or '; '.join(result.get('errors', []))}
+
+        created = result.get('events_created', 0)
+        updated = result.get('events_updated', 0)
+        logger.info(f"Sync completed for google: {created} created, {updated} updated, "
+                    f"{result.get('events_unchanged', 0)} unchanged, {result.get('events_failed', 0)} failed")
+        return {
+            'success': True,
+            'total_events': result.get('events_found', 0),
+            'saved': created + updated,
+            'created': created,
+            'updated': updated,
+            'failed': result.get('events_failed', 0)
+        }
+
     def _sync_notion(self, provider: NotionService, start_date: datetime, end_date: datetime) -> List[Dict]:
         """Sync Notion calendar events"""
         events = []
@@ -249,47 +253,6 @@ class CalendarSyncService:
             
         return events
     
-    def _format_google_event(self, event: Dict, calendar_id: str, calendar_name: str) -> Optional[Dict]:
-        """Format Google Calendar event for database"""
-        try:
-            # Extract start and end times
-            start = event.get('start', {})
-            end = event.get('end', {})
-            
-            # Handle all-day events vs timed events
-            if 'dateTime' in start:
-                start_datetime = start['dateTime']
-                end_datetime = end['dateTime']
-                is_all_day = False
-            elif 'date' in start:
-                start_datetime = f"{start['date']}T00:00:00Z"
-                end_datetime = f"{end['date']}T23:59:59Z"
-                is_all_day = True
-            else:
-                return None
-            
-            return {
-                'user_id': self.user_id,
-                'external_id': event.get('id'),
-                'title': event.get('summary', 'Untitled Event'),
-                'description': event.get('description', ''),
-                'start_datetime': start_datetime,
-                'end_datetime': end_datetime,
-                'is_all_day': is_all_day,
-                'location': event.get('location', ''),
-                'source_platform': 'google',
-                'source_calendar_id': calendar_id,
-                'source_calendar_name': calendar_name,
-                'status': event.get('status', 'confirmed'),
-                'attendees': [attendee.get('email') for attendee in event.get('attendees', [])],
-                'created_at': event.get('created', datetime.now().isoformat()),
-                'updated_at': event.get('updated', datetime.now().isoformat())
-            }
-            
-        except Exception as e:
-            logger.error(f"Error formatting Google event: {e}")
-            return None
-    
     def _format_notion_event(self, page: Dict, database_id: str, database_name: str) -> Optional[Dict]:
         """Format Notion page as calendar event"""
         try:
@@ -6,12 +6,26 @@
 import os
 import json
 import hashlib
+import threading
+import time as time_module
+from collections import OrderedDict
 from datetime import datetime, timezone, date, time
 from typing import Dict, List, Optional, Tuple, Set
 from dataclasses import dataclass
 from enum import Enum
 
-from supabase import create_client
+from utils.config import PooledClientProxy
+
+# Max ids/hashes per IN (...) filter in batch validation (keeps request URLs short)
+BATCH_QUERY_SIZE = 200
+
+EVENT_COLUMNS = 'id, title, status, calendar_id, start_datetime, end_datetime, start_date, end_date, is_all_day'
+FINGERPRINT_COLUMNS = 'id, content_hash, normalized_title, event_date, external_event_id, source_event_id'
+
+# In-memory fingerprint index: (user, platform) sets kept, and how long before reloading
+FINGERPRINT_INDEX_MAX_ENTRIES = int(os.getenv('VALIDATION_FINGERPRINT_INDEX_SIZE', '500'))
+FINGERPRINT_INDEX_TTL = int(os.getenv('VALIDATION_FINGERPRINT_INDEX_TTL', '300'))
+FINGERPRINT_PAGE_SIZE = 1000
 
 # Validation result enums
 class ValidationResult(Enum):
@@ -50,6 +64,55 @@ class ValidationReport:
     rejection_reason: Optional[str] = None
     validation_id: Optional[str] = None
 
+class FingerprintIndex:
+    """Active content fingerprints per (user, platform), keyed by content_hash
+
+    Loaded lazily on first lookup, evicted LRU across users, and refreshed
+    after FINGERPRINT_INDEX_TTL so writes from other processes are picked up.
+    """
+
+    def __init__(self, max_entries: int = FINGERPRINT_INDEX_MAX_ENTRIES, ttl: int = FINGERPRINT_INDEX_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Dict]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str, platform: str) -> Optional[Dict[str, Dict]]:
+        """Fingerprints by hash, or None if not loaded / expired"""
+        key = (str(user_id), platform)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            loaded_at, fingerprints = entry
+            if time_module.time() - loaded_at > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return fingerprints
+
+    def put(self, user_id: str, platform: str, fingerprints: Dict[str, Dict]):
+        key = (str(user_id), platform)
+        with self._lock:
+            self._entries[key] = (time_module.time(), fingerprints)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def add(self, user_id: str, platform: str, fingerprint: Dict):
+        """Write-through for a newly stored fingerprint (no-op if the set isn't loaded)"""
+        with self._lock:
+            entry = self._entries.get((str(user_id), platform))
+            if entry is not None:
+                entry[1][fingerprint['content_hash']] = fingerprint
+
+    def invalidate(self, user_id: str, platform: Optional[str] = None):
+        """Forget a user's loaded sets (all platforms when platform is None)"""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == str(user_id) and (platform is None or k[1] == platform)]:
+                del self._entries[key]
+
+
 class EventValidationService:
     """3-tier event validation service for sync operations"""
 
@@ -62,7 +125,8 @@ class EventValidationService:
         if not self.supabase_url or not self.supabase_key:
             raise ValueError("Supabase credentials not found")
 
-        self.supabase = create_client(self.supabase_url, self.supabase_key)
+        self.supabase = PooledClientProxy(self.supabase_url, self.supabase_key)
+        self.fingerprint_index = FingerprintIndex()
         print("✅ [VALIDATION] Service initialized")
 
     def generate_content_hash(self, title: str, event_date: date, event_time: Optional[time] = None) -> str:
@@ -96,47 +160,49 @@ class EventValidationService:
 
             # Query calendar_events table
             result = self.supabase.table('calendar_events').select(
-                'id, title, status, calendar_id, start_datetime, end_datetime, start_date, end_date, is_all_day'
+                EVENT_COLUMNS
             ).eq('user_id', user_id).eq('id', event_id).execute()
 
-            if not result.data:
-                print(f"❌ [VALIDATION] Tier 1 FAILED: Event {event_id} not found")
-                return ValidationTier(
-                    tier_number=1,
-                    passed=False,
-                    description="Event not found in database",
-                    details={'reason': 'event_not_found'}
-                )
-
-            event = result.data[0]
+            return self._tier1_from_row(event_id, result.data[0] if result.data else None)
 
-            # Check if event is cancelled
-            if event.get('status') == 'cancelled':
-                print(f"❌ [VALIDATION] Tier 1 FAILED: Event {event_id} is cancelled")
-                return ValidationTier(
-                    tier_number=1,
-                    passed=False,
-                    description="Event is cancelled",
-                    details={'reason': 'event_cancelled', 'status': event.get('status')}
-                )
+        except Exception as e:
+            print(f"❌ [VALIDATION] Tier 1 ERROR: {e}")
+            return ValidationTier(
+                tier_number=1,
+                passed=False,
+                description=f"Database check failed: {str(e)}",
+                details={'error': str(e)}
+            )
 
-            print(f"✅ [VALIDATION] Tier 1 PASSED: Event {event_id} exists and is active")
+    def _tier1_from_row(self, event_id: str, event: Optional[Dict]) -> ValidationTier:
+        """Tier 1 decision for an already-loaded calendar_events row (None = not found)"""
+        if not event:
+            print(f"❌ [VALIDATION] Tier 1 FAILED: Event {event_id} not found")
             return ValidationTier(
                 tier_number=1,
-                passed=True,
-                description="Event exists in database and is active",
-                details={'event_data': event}
+                passed=False,
+                description="Event not found in database",
+                details={'reason': 'event_not_found'}
             )
 
-        except Exception as e:
-            print(f"❌ [VALIDATION] Tier 1 ERROR: {e}")
+        # Check if event is cancelled
+        if event.get('status') == 'cancelled':
+            print(f"❌ [VALIDATION] Tier 1 FAILED: Event {event_id} is cancelled")
             return ValidationTier(
                 tier_number=1,
                 passed=False,
-                description=f"Database check failed: {str(e)}",
-                details={'error': str(e)}
+                description="Event is cancelled",
+                details={'reason': 'event_cancelled', 'status': event.get('status')}
             )
 
+        print(f"✅ [VALIDATION] Tier 1 PASSED: Event {event_id} exists and is active")
+        return ValidationTier(
+            tier_number=1,
+            passed=True,
+            description="Event exists in database and is active",
+            details={'event_data': event}
+        )
+
     def tier2_trash_check(self, event_id: str, calendar_id: str, trashed_events: List[Dict]) -> ValidationTier:
         """Tier 2: Check if event is in localStorage trash"""
         try:
@@ -184,35 +250,11 @@ class EventValidationService:
             print(f"🔍 [VALIDATION] Tier 3: Checking duplicate content for platform {target_platform}")
             print(f"🔐 [VALIDATION] Content hash: {content_hash[:12]}...")
 
-            # Query event_content_fingerprints table
-            result = self.supabase.table('event_content_fingerprints').select(
-                'id, content_hash, normalized_title, event_date, external_event_id, source_event_id'
-            ).eq('user_id', user_id).eq('platform', target_platform).eq(
-                'content_hash', content_hash
-            ).eq('is_active', True).execute()
-
-            if result.data:
-                existing_fingerprint = result.data[0]
-                print(f"❌ [VALIDATION] Tier 3 FAILED: Duplicate content found")
-                print(f"📋 [VALIDATION] Existing: {existing_fingerprint.get('normalized_title')} on {existing_fingerprint.get('event_date')}")
-
-                return ValidationTier(
-                    tier_number=3,
-                    passed=False,
-                    description="Duplicate content detected on target platform",
-                    details={
-                        'reason': 'duplicate_content',
-                        'existing_fingerprint': existing_fingerprint,
-                        'content_hash': content_hash
-                    }
-                )
+            # O(1) lookup in the user's fingerprint set for this platform
+            fingerprints = self.get_active_fingerprints(user_id, target_platform)
 
-            print(f"✅ [VALIDATION] Tier 3 PASSED: No duplicate content found")
-            return ValidationTier(
-                tier_number=3,
-                passed=True,
-                description="No duplicate content detected",
-                details={'content_hash': content_hash, 'platform': target_platform}
+            return self._tier3_from_fingerprint(
+                fingerprints.get(content_hash), content_hash, target_platform
             )
 
         except Exception as e:
@@ -224,13 +266,77 @@ class EventValidationService:
                 details={'error': str(e)}
             )
 
+    def get_active_fingerprints(self, user_id: str, target_platform: str) -> Dict[str, Dict]:
+        """Active fingerprints for user/platform by content_hash (index, loading on miss)"""
+        fingerprints = self.fingerprint_index.get(user_id, target_platform)
+        if fingerprints is not None:
+            return fingerprints
+
+        fingerprints = {}
+        offset = 0
+        while True:
+            result = self.supabase.table('event_content_fingerprints').select(
+                FINGERPRINT_COLUMNS
+            ).eq('user_id', user_id).eq('platform', target_platform).eq(
+                'is_active', True
+            ).order('id').range(offset, offset + FINGERPRINT_PAGE_SIZE - 1).execute()
+
+            rows = result.data or []
+            for fingerprint in rows:
+                fingerprints.setdefault(fingerprint['content_hash'], fingerprint)
+            if len(rows) < FINGERPRINT_PAGE_SIZE:
+                break
+            offset += FINGERPRINT_PAGE_SIZE
+
+        print(f"🔐 [VALIDATION] Loaded {len(fingerprints)} fingerprints for {target_platform}")
+        self.fingerprint_index.put(user_id, target_platform, fingerprints)
+        return fingerprints
+
+    def _tier3_from_fingerprint(self, existing_fingerprint: Optional[Dict], content_hash: str,
+                                target_platform: str) -> ValidationTier:
+        """Tier 3 decision given the active fingerprint with the same hash (None = no duplicate)"""
+        if existing_fingerprint:
+            print(f"❌ [VALIDATION] Tier 3 FAILED: Duplicate content found")
+            print(f"📋 [VALIDATION] Existing: {existing_fingerprint.get('normalized_title')} on {existing_fingerprint.get('event_date')}")
+
+            return ValidationTier(
+                tier_number=3,
+                passed=False,
+                description="Duplicate content detected on target platform",
+                details={
+                    'reason': 'duplicate_content',
+                    'existing_fingerprint': existing_fingerprint,
+                    'content_hash': content_hash
+                }
+            )
+
+        print(f"✅ [VALIDATION] Tier 3 PASSED: No duplicate content found")
+        return ValidationTier(
+            tier_number=3,
+            passed=True,
+            description="No duplicate content detected",
+            details={'content_hash': content_hash, 'platform': target_platform}
+        )
+
+    def _event_date_time(self, event: Dict) -> Tuple[Optional[date], Optional[time]]:
+        """Date (and start time for timed events) used for fingerprinting"""
+        if event.get('is_all_day'):
+            event_date = datetime.strptime(event.get('start_date'), '%Y-%m-%d').date() if event.get('start_date') else None
+            return event_date, None
+
+        start_datetime = datetime.fromisoformat(event.get('start_datetime').replace('Z', '+00:00')) if event.get('start_datetime') else None
+        if not start_datetime:
+            return None, None
+        return start_datetime.date(), start_datetime.time()
+
     def classify_event_case(self, event_data: Dict, tier_results: Dict) -> CaseClassification:
         """Classify the type of event change/action"""
         try:
             # Analyze tier results to determine case classification
+            # Tiers skipped after an earlier failure are passed as None
             tier1_passed = tier_results['tier1'].passed
-            tier2_passed = tier_results['tier2'].passed
-            tier3_passed = tier_results['tier3'].passed
+            tier2_passed = tier_results['tier2'].passed if tier_results.get('tier2') else True
+            tier3_passed = tier_results['tier3'].passed if tier_results.get('tier3') else True
 
             if not tier1_passed:
                 tier1_reason = tier_results['tier1'].details.get('reason', '')
@@ -315,16 +421,7 @@ class EventValidationService:
                 )
 
             # Generate content hash for Tier 3
-            event_date = None
-            event_time = None
-
-            if event_data.get('is_all_day'):
-                event_date = datetime.strptime(event_data.get('start_date'), '%Y-%m-%d').date() if event_data.get('start_date') else None
-            else:
-                start_datetime = datetime.fromisoformat(event_data.get('start_datetime').replace('Z', '+00:00')) if event_data.get('start_datetime') else None
-                if start_datetime:
-                    event_date = start_datetime.date()
-                    event_time = start_datetime.time()
+            event_date, event_time = self._event_date_time(event_data)
 
             content_hash = self.generate_content_hash(
                 event_data.get('title', ''),
@@ -367,63 +464,67 @@ class EventValidationService:
 
         except Exception as e:
             print(f"❌ [VALIDATION] Validation failed: {e}")
-            # Return error validation report
-            return ValidationReport(
-                event_id=event_id,
-                target_platform=target_platform,
-                tier1=ValidationTier(1, False, f"Validation error: {str(e)}", {'error': str(e)}),
-                tier2=ValidationTier(2, False, "Skipped due to error"),
-                tier3=ValidationTier(3, False, "Skipped due to error"),
-                overall_result=ValidationResult.REJECTED,
-                case_classification=CaseClassification.MISSING_EVENT,
-                content_hash="",
-                rejection_reason=f"Validation error: {str(e)}"
-            )
+            return self._error_report(event_id, target_platform, e)
+
+    def _error_report(self, event_id: str, target_platform: str, error: Exception) -> ValidationReport:
+        """Rejected report for an event whose validation raised"""
+        return ValidationReport(
+            event_id=event_id,
+            target_platform=target_platform,
+            tier1=ValidationTier(1, False, f"Validation error: {str(error)}", {'error': str(error)}),
+            tier2=ValidationTier(2, False, "Skipped due to error"),
+            tier3=ValidationTier(3, False, "Skipped due to error"),
+            overall_result=ValidationResult.REJECTED,
+            case_classification=CaseClassification.MISSING_EVENT,
+            content_hash="",
+            rejection_reason=f"Validation error: {str(error)}"
+        )
+
+    def _history_row(self, user_id: str, calendar_id: str, report: ValidationReport) -> Dict:
+        """event_validation_history row for a report that reached Tier 3"""
+        event = report.tier1.details['event_data']
+        event_date, event_start_time = self._event_date_time(event)
+
+        return {
+            'user_id': user_id,
+            'calendar_id': calendar_id,
+            'source_event_id': report.event_id,
+            'target_platform': report.target_platform,
+            'tier1_db_check': report.tier1.passed,
+            'tier2_trash_check': report.tier2.passed,
+            'tier3_duplicate_check': report.tier3.passed,
+            'content_hash': report.content_hash,
+            'normalized_title': (event.get('title') or '').lower().strip(),
+            'event_date': event_date.isoformat() if event_date else None,
+            'event_start_time': event_start_time.isoformat() if event_start_time else None,
+            'validation_status': report.overall_result.value,
+            'rejection_reason': report.rejection_reason,
+            'case_classification': report.case_classification.value
+        }
+
+    def _fingerprint_row(self, user_id: str, report: ValidationReport) -> Dict:
+        """event_content_fingerprints row for an approved report"""
+        event = report.tier1.details['event_data']
+        event_date, event_start_time = self._event_date_time(event)
+
+        return {
+            'user_id': user_id,
+            'platform': report.target_platform,
+            'content_hash': report.content_hash,
+            'normalized_title': (event.get('title') or '').lower().strip(),
+            'event_date': event_date.isoformat() if event_date else None,
+            'event_start_time': event_start_time.isoformat() if event_start_time else None,
+            'source_event_id': report.event_id,
+            'is_active': True
+        }
 
     def record_validation_attempt(self, user_id: str, calendar_id: str, report: ValidationReport) -> Optional[str]:
         """Record validation attempt in database"""
         try:
             print(f"📝 [VALIDATION] Recording validation attempt for event {report.event_id}")
 
-            # Get event details for recording
-            event_result = self.supabase.table('calendar_events').select(
-                'title, start_datetime, end_datetime, start_date, is_all_day'
-            ).eq('id', report.event_id).execute()
-
-            if not event_result.data:
-                print(f"⚠️ [VALIDATION] Could not find event data for recording")
-                return None
-
-            event = event_result.data[0]
-
-            # Prepare normalized title and date/time
-            normalized_title = event.get('title', '').lower().strip()
-
-            if event.get('is_all_day'):
-                event_date = datetime.strptime(event.get('start_date'), '%Y-%m-%d').date() if event.get('start_date') else None
-                event_start_time = None
-            else:
-                start_datetime = datetime.fromisoformat(event.get('start_datetime').replace('Z', '+00:00')) if event.get('start_datetime') else None
-                event_date = start_datetime.date() if start_datetime else None
-                event_start_time = start_datetime.time() if start_datetime else None
-
-            # Insert validation record
-            validation_data = {
-                'user_id': user_id,
-                'calendar_id': calendar_id,
-                'source_event_id': report.event_id,
-                'target_platform': report.target_platform,
-                'tier1_db_check': report.tier1.passed,
-                'tier2_trash_check': report.tier2.passed,
-                'tier3_duplicate_check': report.tier3.passed,
-                'content_hash': report.content_hash,
-                'normalized_title': normalized_title,
-                'event_date': event_date.isoformat() if event_date else None,
-                'event_start_time': event_start_time.isoformat() if event_start_time else None,
-                'validation_status': report.overall_result.value,
-                'rejection_reason': report.rejection_reason,
-                'case_classification': report.case_classification.value
-            }
+            # Insert validation record (event data was already loaded by Tier 1)
+            validation_data = self._history_row(user_id, calendar_id, report)
 
             result = self.supabase.table('event_validation_history').insert(validation_data).execute()
 
@@ -433,7 +534,7 @@ class EventValidationService:
 
                 # If validation passed, create content fingerprint
                 if report.overall_result == ValidationResult.APPROVED:
-                    self.create_content_fingerprint(user_id, report, event_date, event_start_time)
+                    self.create_content_fingerprint(user_id, report)
 
                 return validation_id
 
@@ -442,20 +543,10 @@ class EventValidationService:
 
         return None
 
-    def create_content_fingerprint(self, user_id: str, report: ValidationReport,
-                                   event_date: date, event_start_time: Optional[time]):
+    def create_content_fingerprint(self, user_id: str, report: ValidationReport):
         """Create content fingerprint for approved events"""
         try:
-            fingerprint_data = {
-                'user_id': user_id,
-                'platform': report.target_platform,
-                'content_hash': report.content_hash,
-                'normalized_title': report.tier1.details['event_data'].get('title', '').lower().strip(),
-                'event_date': event_date.isoformat() if event_date else None,
-                'event_start_time': event_start_time.isoformat() if event_start_time else None,
-                'source_event_id': report.event_id,
-                'is_active': True
-            }
+            fingerprint_data = self._fingerprint_row(user_id, report)
 
             # Insert with conflict resolution (upsert)
             result = self.supabase.table('event_content_fingerprints').upsert(
@@ -463,37 +554,193 @@ class EventValidationService:
                 on_conflict='user_id,platform,content_hash'
             ).execute()
 
+            self.fingerprint_index.add(user_id, report.target_platform, result.data[0] if result.data else fingerprint_data)
+
             if result.data:
                 print(f"✅ [VALIDATION] Created content fingerprint for future duplicate detection")
 
         except Exception as e:
             print(f"⚠️ [VALIDATION] Error creating content fingerprint: {e}")
 
+    def _load_events(self, user_id: str, event_ids: List[str]) -> Dict[str, Dict]:
+        """Load calendar_events rows for many ids (one query per BATCH_QUERY_SIZE ids)"""
+        events = {}
+        for i in range(0, len(event_ids), BATCH_QUERY_SIZE):
+            chunk = event_ids[i:i + BATCH_QUERY_SIZE]
+            result = self.supabase.table('calendar_events').select(
+                EVENT_COLUMNS
+            ).eq('user_id', user_id).in_('id', chunk).execute()
+            for event in result.data or []:
+                events[str(event['id'])] = event
+        return events
+
+    def _record_batch(self, user_id: str, recorded: List[Tuple[str, ValidationReport]]):
+        """Bulk insert validation history, then bulk upsert fingerprints for approved events"""
+        for i in range(0, len(recorded), BATCH_QUERY_SIZE):
+            chunk = recorded[i:i + BATCH_QUERY_SIZE]
+            try:
+                rows = [self._history_row(user_id, calendar_id, report) for calendar_id, report in chunk]
+                result = self.supabase.table('event_validation_history').insert(rows).execute()
+                # PostgREST returns inserted rows in request order
+                for (_, report), row in zip(chunk, result.data or []):
+                    report.validation_id = row.get('id')
+            except Exception as e:
+                print(f"❌ [VALIDATION] Error recording {len(chunk)} validation attempts: {e}")
+
+        approved = [report for _, report in recorded if report.overall_result == ValidationResult.APPROVED]
+        for i in range(0, len(approved), BATCH_QUERY_SIZE):
+            chunk = approved[i:i + BATCH_QUERY_SIZE]
+            try:
+                result = self.supabase.table('event_content_fingerprints').upsert(
+                    [self._fingerprint_row(user_id, report) for report in chunk],
+                    on_conflict='user_id,platform,content_hash'
+                ).execute()
+                for fingerprint in result.data or []:
+                    self.fingerprint_index.add(user_id, chunk[0].target_platform, fingerprint)
+            except Exception as e:
+                print(f"⚠️ [VALIDATION] Error creating {len(chunk)} content fingerprints: {e}")
+                self.fingerprint_index.invalidate(user_id, chunk[0].target_platform)
+
     def validate_event_batch(self, user_id: str, event_ids: List[str], target_platform: str,
                              trashed_events: List[Dict] = None) -> List[ValidationReport]:
-        """Validate multiple events in batch"""
+        """Validate multiple events in batch
+
+        Set-based: events are loaded with a few IN queries, fingerprints come
+        from the in-memory index, all three tiers are decided in memory, and history /
+        fingerprints are written with bulk inserts. Results match running
+        validate_event_for_sync on each id in order.
+        """
+        reports = {}
         try:
             print(f"📦 [VALIDATION] Starting batch validation: {len(event_ids)} events → {target_platform}")
 
-            reports = []
-            approved_count = 0
-            rejected_count = 0
+            trashed_events = trashed_events or []
+            # (event id, calendar id) pairs in the trash
+            trashed_keys = {}
+            for trashed_event in trashed_events:
+                for trashed_id in (trashed_event.get('id'), trashed_event.get('event_id')):
+                    if trashed_id is not None:
+                        trashed_keys.setdefault((str(trashed_id), trashed_event.get('calendarId')), trashed_event)
+
+            events = self._load_events(user_id, [str(event_id) for event_id in event_ids])
 
+            # Tiers 1 and 2 in memory; an event that raises gets its own error report
+            candidates = []
             for event_id in event_ids:
-                report = self.validate_event_for_sync(user_id, event_id, target_platform, trashed_events)
-                reports.append(report)
+                try:
+                    candidate = self._batch_tiers_1_2(event_id, events.get(str(event_id)), target_platform,
+                                                      trashed_keys, trashed_events, reports)
+                except Exception as e:
+                    print(f"❌ [VALIDATION] Validation failed for {event_id}: {e}")
+                    reports[event_id] = self._error_report(event_id, target_platform, e)
+                    continue
+                if candidate is not None:
+                    candidates.append(candidate)
+
+            # Tier 3 against the in-memory fingerprint set (copy: in-batch approvals are
+            # only added to the shared index once they are written)
+            fingerprints = dict(self.get_active_fingerprints(user_id, target_platform)) if candidates else {}
+
+            recorded = []
+            for event_id, event_data, tier1, tier2, content_hash in candidates:
+                try:
+                    tier3 = self._tier3_from_fingerprint(fingerprints.get(content_hash), content_hash, target_platform)
+                    overall_result = ValidationResult.APPROVED if tier3.passed else ValidationResult.REJECTED
+                    report = ValidationReport(
+                        event_id=event_id,
+                        target_platform=target_platform,
+                        tier1=tier1,
+                        tier2=tier2,
+                        tier3=tier3,
+                        overall_result=overall_result,
+                        case_classification=self.classify_event_case(event_data, {
+                            'tier1': tier1, 'tier2': tier2, 'tier3': tier3
+                        }),
+                        content_hash=content_hash,
+                        rejection_reason=None if overall_result == ValidationResult.APPROVED else tier3.description
+                    )
+                except Exception as e:
+                    print(f"❌ [VALIDATION] Validation failed for {event_id}: {e}")
+                    reports[event_id] = self._error_report(event_id, target_platform, e)
+                    continue
+                reports[event_id] = report
+                recorded.append((event_data.get('calendar_id'), report))
 
-                if report.overall_result == ValidationResult.APPROVED:
-                    approved_count += 1
-                else:
-                    rejected_count += 1
+                if overall_result == ValidationResult.APPROVED:
+                    # Later events in this batch with the same content are duplicates of this one
+                    fingerprints[content_hash] = self._fingerprint_row(user_id, report)
+
+            self._record_batch(user_id, recorded)
+
+            ordered = [reports[event_id] for event_id in event_ids]
+            approved_count = sum(1 for report in ordered if report.overall_result == ValidationResult.APPROVED)
+            rejected_count = len(ordered) - approved_count
 
             print(f"📊 [VALIDATION] Batch validation complete: {approved_count} approved, {rejected_count} rejected")
-            return reports
+            return ordered
 
         except Exception as e:
+            # Batch-level failure (loading events / fingerprints): report it per event
+            # like validate_event_for_sync would, keeping reports already decided
             print(f"❌ [VALIDATION] Batch validation failed: {e}")
-            return []
+            return [reports.get(event_id) or self._error_report(event_id, target_platform, e)
+                    for event_id in event_ids]
+
+    def _batch_tiers_1_2(self, event_id: str, row: Optional[Dict], target_platform: str,
+                         trashed_keys: Dict, trashed_events: List[Dict],
+                         reports: Dict) -> Optional[Tuple]:
+        """Tiers 1-2 for one batch event: a rejection goes into reports, a pass returns the Tier 3 candidate"""
+        tier1 = self._tier1_from_row(event_id, row)
+        if not tier1.passed:
+            reports[event_id] = ValidationReport(
+                event_id=event_id,
+                target_platform=target_platform,
+                tier1=tier1,
+                tier2=ValidationTier(2, False, "Skipped due to Tier 1 failure"),
+                tier3=ValidationTier(3, False, "Skipped due to Tier 1 failure"),
+                overall_result=ValidationResult.REJECTED,
+                case_classification=self.classify_event_case({}, {'tier1': tier1, 'tier2': None, 'tier3': None}),
+                content_hash="",
+                rejection_reason=tier1.description
+            )
+            return None
+
+        event_data = tier1.details['event_data']
+        calendar_id = event_data.get('calendar_id')
+        trash_entry = trashed_keys.get((str(event_id), calendar_id))
+        if trash_entry is not None:
+            tier2 = ValidationTier(
+                tier_number=2,
+                passed=False,
+                description="Event is in trash",
+                details={
+                    'reason': 'event_in_trash',
+                    'deleted_at': trash_entry.get('deletedAt'),
+                    'trash_entry': trash_entry
+                }
+            )
+            reports[event_id] = ValidationReport(
+                event_id=event_id,
+                target_platform=target_platform,
+                tier1=tier1,
+                tier2=tier2,
+                tier3=ValidationTier(3, False, "Skipped due to Tier 2 failure"),
+                overall_result=ValidationResult.REJECTED,
+                case_classification=self.classify_event_case(event_data, {'tier1': tier1, 'tier2': tier2, 'tier3': None}),
+                content_hash="",
+                rejection_reason=tier2.description
+            )
+            return None
+
+        tier2 = ValidationTier(
+            tier_number=2,
+            passed=True,
+            description="Event is not in trash",
+            details={'trash_count_checked': len(trashed_events)}
+        )
+        event_date, event_time = self._event_date_time(event_data)
+        content_hash = self.generate_content_hash(event_data.get('title', ''), event_date, event_time)
+        return (event_id, event_data, tier1, tier2, content_hash)
 
     def get_validation_summary(self, reports: List[ValidationReport]) -> Dict:
         """Generate summary statistics from validation reports"""
@@ -17,7 +17,7 @@ except ImportError:
     from datetime import timezone as pytz_tz
     pytz = None
 
-from supabase import create_client
+from utils.config import PooledClientProxy
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -31,7 +31,7 @@ class GoogleCalendarService:
         if not self.supabase_url or not self.supabase_key:
             raise Exception("Supabase credentials not found")
             
-        self.supabase = create_client(self.supabase_url, self.supabase_key)
+        self.supabase = PooledClientProxy(self.supabase_url, self.supabase_key)
     
     def get_google_credentials(self, user_id: str) -> Optional[Credentials]:
         """사용자의 Google OAuth 토큰으로 Credentials 객체 생성"""
@@ -310,17 +310,24 @@ class GoogleCalendarService:
                 from datetime import timezone
                 time_max = time_max.replace(tzinfo=timezone.utc)
             
-            # Google Calendar에서 일정 조회
-            events_result = service.events().list(
-                calendarId=calendar_id,
-                timeMin=time_min.isoformat(),
-                timeMax=time_max.isoformat(),
-                maxResults=100,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
+            # Google Calendar에서 일정 조회 (nextPageToken이 없을 때까지 모든 페이지)
+            events = []
+            page_token = None
+            while True:
+                events_result = service.events().list(
+                    calendarId=calendar_id,
+                    timeMin=time_min.isoformat(),
+                    timeMax=time_max.isoformat(),
+                    maxResults=250,
+                    singleEvents=True,
+                    orderBy='startTime',
+                    pageToken=page_token
+                ).execute()
+                
+                events.extend(events_result.get('items', []))
+                page_token = events_result.get('nextPageToken')
+                if not page_token:
+                    break
             print(f"Google Calendar({calendar_id})에서 {len(events)}개 일정 조회")
             
             return events
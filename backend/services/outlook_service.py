@@ -3,7 +3,7 @@ import requests
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import json
-from supabase import create_client
+from utils.config import PooledClientProxy
 
 class OutlookProvider:
     """Outlook/Microsoft Graph integration provider for NodeFlow"""
@@ -21,7 +21,7 @@ class OutlookProvider:
         self.supabase_url = os.environ.get('SUPABASE_URL')
         self.supabase_key = os.environ.get('SUPABASE_KEY')
         if self.supabase_url and self.supabase_key:
-            self.supabase = create_client(self.supabase_url, self.supabase_key)
+            self.supabase = PooledClientProxy(self.supabase_url, self.supabase_key)
         else:
             self.supabase = None
     
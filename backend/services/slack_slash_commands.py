@@ -5,7 +5,7 @@ from flask import Blueprint, request, jsonify
 from datetime import datetime
 from backend.services.slack_service import SlackProvider
 from backend.services.notion_service import NotionProvider
-from supabase import create_client
+from utils.config import get_pooled_client
 
 slash_commands_bp = Blueprint('slack_slash', __name__, url_prefix='/slack')
 
@@ -17,7 +17,7 @@ SUPABASE_KEY = os.environ.get('SUPABASE_API_KEY') or os.environ.get('SUPABASE_KE
 supabase = None
 if SUPABASE_URL and SUPABASE_KEY:
     try:
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        supabase = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
         print("[SUCCESS] Supabase client initialized in slack_slash_commands")
     except Exception as e:
         print(f"[WARNING] Failed to initialize Supabase client in slack_slash_commands: {e}")
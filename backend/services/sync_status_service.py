@@ -6,7 +6,7 @@ Manages synchronization status tracking and reporting
 import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-from supabase import create_client
+from utils.config import PooledClientProxy
 import time
 
 # Supabase configuration
@@ -23,7 +23,7 @@ class SyncStatusService:
     """Service for managing sync status across platforms"""
     
     def __init__(self):
-        self.supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        self.supabase = PooledClientProxy(SUPABASE_URL, SUPABASE_KEY)
     
     def get_user_sync_status(self, user_id: str) -> Dict:
         """Get sync status for all platforms for a user"""
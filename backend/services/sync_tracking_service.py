@@ -6,7 +6,7 @@ Comprehensive tracking for all synchronization events and activities
 import os
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Literal
-from supabase import create_client
+from utils.config import PooledClientProxy
 import json
 from enum import Enum
 
@@ -45,7 +45,7 @@ class SyncTrackingService:
     """Service for tracking sync events and user activities"""
     
     def __init__(self):
-        self.supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        self.supabase = PooledClientProxy(SUPABASE_URL, SUPABASE_KEY)
     
     def track_sync_event(
         self,
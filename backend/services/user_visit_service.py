@@ -7,7 +7,7 @@ import os
 import json
 from datetime import datetime, timezone
 from typing import Dict, Optional, Tuple
-from supabase import create_client
+from utils.config import PooledClientProxy
 from flask import request
 
 class UserVisitService:
@@ -21,7 +21,7 @@ class UserVisitService:
         if not self.supabase_url or not self.supabase_key:
             raise ValueError("Supabase credentials are required for visit tracking")
         
-        self.supabase = create_client(self.supabase_url, self.supabase_key)
+        self.supabase = PooledClientProxy(self.supabase_url, self.supabase_key)
     
     def record_visit(self, user_id: str, visit_type: str = 'calendar_page') -> Dict:
         """
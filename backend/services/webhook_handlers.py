@@ -7,7 +7,8 @@ from datetime import datetime
 from backend.services.slack_service import SlackProvider
 from backend.services.outlook_service import OutlookProvider
 from backend.services.notion_service import NotionProvider
-from supabase import create_client
+from utils.config import get_pooled_client
+from utils.sync_job_queue import get_job_queue, register_job_handler
 
 webhooks_bp = Blueprint('webhooks', __name__, url_prefix='/webhooks')
 
@@ -19,7 +20,7 @@ SUPABASE_KEY = os.environ.get('SUPABASE_API_KEY') or os.environ.get('SUPABASE_KE
 supabase = None
 if SUPABASE_URL and SUPABASE_KEY:
     try:
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        supabase = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
         print("[SUCCESS] Supabase client initialized in webhook_handlers")
     except Exception as e:
         print(f"[WARNING] Failed to initialize Supabase client in webhook_handlers: {e}")
@@ -458,53 +459,25 @@ def extract_user_from_resource(resource, client_state):
     
     return None
 
-# Background job processor (you might want to move this to a separate worker)
+# Background job processor - sync_jobs rows are claimed and retried by utils.sync_job_queue
 def process_sync_jobs():
-    """Process pending sync jobs"""
+    """Process due sync jobs inline (the queue's worker pool normally does this)"""
     try:
         if not supabase:
             return
-        # Get pending jobs
-        result = supabase.table('sync_jobs').select('*').eq('status', 'pending').order('created_at').limit(10).execute()
-        
-        for job in result.data:
-            try:
-                # Mark as running
-                supabase.table('sync_jobs').update({
-                    'status': 'running',
-                    'started_at': datetime.utcnow().isoformat()
-                }).eq('id', job['id']).execute()
-                
-                # Process based on platform and type
-                if job['platform'] == 'slack':
-                    process_slack_sync_job(job)
-                elif job['platform'] == 'outlook':
-                    process_outlook_sync_job(job)
-                
-                # Mark as completed
-                supabase.table('sync_jobs').update({
-                    'status': 'completed',
-                    'completed_at': datetime.utcnow().isoformat()
-                }).eq('id', job['id']).execute()
-                
-            except Exception as e:
-                # Mark as failed
-                supabase.table('sync_jobs').update({
-                    'status': 'failed',
-                    'error': str(e),
-                    'completed_at': datetime.utcnow().isoformat()
-                }).eq('id', job['id']).execute()
-                
-                print(f"Error processing sync job {job['id']}: {e}")
-                
+        processed = get_job_queue().run_once()
+        if processed:
+            print(f"Processed {processed} sync jobs")
     except Exception as e:
         print(f"Error processing sync jobs: {e}")
 
+@register_job_handler(platform='slack')
 def process_slack_sync_job(job):
     """Process a Slack sync job"""
     # Implementation would handle the actual syncing
     print(f"Processing Slack sync job: {job['type']}")
 
+@register_job_handler(platform='outlook')
 def process_outlook_sync_job(job):
     """Process an Outlook sync job"""
     # Implementation would handle the actual syncing
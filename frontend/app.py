@@ -208,40 +208,15 @@ def load_user_calendars_legacy(user_id):
         return []
 
 def save_media_file_locally(media_file, user_id):
-    """Save media file to local storage as fallback"""
+    """Save media file to local storage as fallback (content-addressed, see utils.media_storage)"""
     try:
         from werkzeug.utils import secure_filename
-        import uuid
-        
-        # Create media directory if it doesn't exist
-        media_dir = os.path.join(os.getcwd(), 'uploads', 'media', 'calendar')
-        os.makedirs(media_dir, exist_ok=True)
+        from utils.media_storage import store_media
         
-        # Generate secure filename
         filename = secure_filename(media_file.filename)
-        file_ext = os.path.splitext(filename)[1]
-        unique_filename = f"{user_id}_{uuid.uuid4()}{file_ext}"
-        
-        # Full path for saving
-        file_path = os.path.join(media_dir, unique_filename)
-        
-        # Save file
-        media_file.save(file_path)
-        
-        # Verify file was saved correctly
-        if os.path.exists(file_path):
-            file_size = os.path.getsize(file_path)
-            print(f"[SUCCESS] Media file saved locally: {file_path} ({file_size} bytes)")
-            
-            # Verify it's a valid media file by checking the first few bytes
-            with open(file_path, 'rb') as f:
-                header = f.read(12)
-                print(f"[EMOJI] File header (first 12 bytes): {header[:12].hex()}")
-            
-            return filename, file_path, media_file.content_type
-        else:
-            print(f"[ERROR] File was not saved properly: {file_path}")
-            return None, None, None
+        media_file_path = store_media(media_file, filename)
+        print(f"[SUCCESS] Media file saved locally for user {user_id}: {media_file_path}")
+        return filename, media_file_path, media_file.content_type
         
     except Exception as e:
         print(f"[ERROR] Failed to save media file locally: {e}")
@@ -303,7 +278,10 @@ app = Flask(__name__,
             static_url_path='/static',
             template_folder=os.path.join(current_dir, 'templates'))
 app.secret_key = config.FLASK_SECRET_KEY
-app.config['TEMPLATES_AUTO_RELOAD'] = True  # 템플릿 자동 리로드 활성화
+
+# 프로덕션: 해시된 정적 파일 URL + 장기 캐시, 템플릿 1회 컴파일 / 개발: 매 요청 리로드
+from utils.static_assets import is_production, static_assets, precompile_templates, STATIC_MAX_AGE_SECONDS
+PRODUCTION_ASSETS = is_production()
 
 # Railway/Production HTTPS Proxy 설정
 if os.getenv('FLASK_ENV') == 'production':
@@ -311,43 +289,70 @@ if os.getenv('FLASK_ENV') == 'production':
     app.wsgi_app = ProxyFix(app.wsgi_app, x_for=1, x_proto=1, x_host=1, x_prefix=1)
     print("[INFO] ProxyFix middleware enabled for production environment")
 
-# Calendar data storage functions (using the implementations from lines 118-132)
-app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0  # 정적 파일 캐싱 비활성화
-app.jinja_env.auto_reload = True  # Jinja2 템플릿 자동 리로드
-
 # Session configuration
 app.config['SESSION_COOKIE_HTTPONLY'] = True
 app.config['SESSION_COOKIE_SECURE'] = os.getenv('FLASK_ENV') == 'production'  # True in production with HTTPS
 app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 app.config['PERMANENT_SESSION_LIFETIME'] = 86400  # 24 hours
 
-# ULTRA STRONG CACHE BUSTING - Force reload everything
-app.config['TEMPLATES_AUTO_RELOAD'] = True
-app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
-app.jinja_env.auto_reload = True
-app.jinja_env.cache = {}  # Clear Jinja2 cache
-app.config['EXPLAIN_TEMPLATE_LOADING'] = True  # Debug template loading
-
-# Force immediate reload - disable all caching mechanisms
 app.config['CACHE_BUSTER'] = str(int(dt.now().timestamp()))
 
-# Override all caching for both development and production
-app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
-os.environ['SEND_FILE_MAX_AGE_DEFAULT'] = '0'
-
-# Force template reload on every request
-@app.before_request
-def force_template_reload():
-    app.jinja_env.cache = {}
-    
-# Add cache-busting headers to all responses
+if PRODUCTION_ASSETS:
+    app.config['TEMPLATES_AUTO_RELOAD'] = False
+    app.jinja_env.auto_reload = False
+    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = STATIC_MAX_AGE_SECONDS
+    static_assets.init_app(app)
+    precompile_templates(app)
+else:
+    # ULTRA STRONG CACHE BUSTING - Force reload everything (development)
+    app.config['TEMPLATES_AUTO_RELOAD'] = True
+    app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 0
+    app.jinja_env.auto_reload = True
+    app.jinja_env.cache = {}  # Clear Jinja2 cache
+    app.config['EXPLAIN_TEMPLATE_LOADING'] = True  # Debug template loading
+    
+    # Force template reload on every request
+    @app.before_request
+    def force_template_reload():
+        app.jinja_env.cache = {}
+    
+# 자체 조건부 요청(ETag/304) 캐시 헤더를 정하는 엔드포인트 - no-store로 덮어쓰지 않음
+# (ICS 구독 피드, send_media로 전송하는 캘린더 미디어)
+CACHE_HEADER_EXEMPT_ENDPOINTS = {
+    'calendar_feed.calendar_ics_feed',
+    'calendar_media_server',
+    'calendar_api.serve_media_file',
+}
+
+# Add cache-busting headers to dynamic responses (and to static files in development)
 @app.after_request
 def add_cache_headers(response):
+    # 프로덕션 정적 파일은 static_assets가 정한 캐시 헤더 유지
+    if PRODUCTION_ASSETS and request.endpoint == 'static':
+        return response
+    if request.endpoint in CACHE_HEADER_EXEMPT_ENDPOINTS:
+        return response
     response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
     response.headers['Pragma'] = 'no-cache'
     response.headers['Expires'] = '0'
     return response
 
+# 이벤트/캘린더를 변경하는 요청이 성공하면 해당 사용자의 이벤트 읽기 캐시 무효화
+@app.after_request
+def invalidate_event_cache_on_write(response):
+    if request.method in ('POST', 'PUT', 'PATCH', 'DELETE') and response.status_code < 400:
+        user_id = session.get('user_id')
+        if user_id:
+            from utils.event_cache import invalidate_user_events
+            invalidate_user_events(user_id)
+    return response
+
+# 백그라운드 작업 워커는 요청을 처리하는 프로세스(gunicorn 워커)에서 처음 요청 시 시작
+@app.before_request
+def start_sync_job_workers_in_process():
+    from utils.sync_job_queue import ensure_sync_job_workers
+    ensure_sync_job_workers()
+
 # Get Supabase client from configuration (동적으로 접근)
 def get_supabase():
     """동적으로 Supabase 클라이언트를 가져옴"""
@@ -482,9 +487,11 @@ def api_login():
             return jsonify({'error': 'Database connection failed'}), 500
         
         try:
-            # Try to sign in with Supabase Auth
+            # Try to sign in with Supabase Auth (on an unshared client - the session
+            # must not leak into the pooled client other requests use)
             print("[LOGIN] Attempting Supabase authentication...")
-            response = supabase_client.auth.sign_in_with_password({
+            from utils.config import create_auth_client
+            response = create_auth_client().auth.sign_in_with_password({
                 "email": email,
                 "password": password
             })
@@ -675,22 +682,17 @@ def calendar_list():
                 user_calendars = calendar_db.get_user_calendars(user_id)
                 print(f"[SEARCH] Raw calendar data from database: {user_calendars}")
                 
-                # Update each calendar with actual event count from database
+                # Event counts (next year), next event and last sync for all calendars in one query
+                # Without the stats RPC, the trigger-maintained calendars.event_count is kept
                 if dashboard_data:
+                    from utils.calendar_stats import calendar_stats, format_last_sync
+                    stats = calendar_stats.get_stats(dashboard_data.supabase, user_id, days_ahead=365)
                     for cal in user_calendars:
-                        calendar_id = cal.get('id')
-                        if calendar_id:
-                            try:
-                                events = dashboard_data.get_user_calendar_events(
-                                    user_id=user_id,
-                                    days_ahead=365,  # Get all events within a year
-                                    calendar_ids=[calendar_id]
-                                )
-                                cal['event_count'] = len(events)
-                                print(f"[DEBUG] Calendar {calendar_id}: {len(events)} events")
-                            except Exception as e:
-                                print(f"[ERROR] Failed to get event count for calendar {calendar_id}: {e}")
-                                cal['event_count'] = 0
+                        cal_stats = stats.get(str(cal.get('id')))
+                        if cal_stats:
+                            cal['event_count'] = cal_stats['event_count']
+                            cal['next_event'] = cal_stats['next_event']
+                            cal['last_sync_display'] = format_last_sync(cal_stats['last_sync_at']) or cal.get('last_sync_display')
                 
                 # Separate personal and shared calendars
                 personal_calendars = [cal for cal in user_calendars if not cal.get('is_shared', False)]
@@ -776,10 +778,10 @@ def calendar_view(calendar_id):
     
     # 🔄 Notion 백그라운드 동기화
     try:
-        import threading
         import sys
         sys.path.append(os.path.join(os.path.dirname(__file__), '../'))
         from services.notion_sync import notion_sync
+        from utils.background_executor import submit_background
         
         def background_sync():
             try:
@@ -792,11 +794,9 @@ def calendar_view(calendar_id):
             except Exception as e:
                 print(f"⚠️ [NOTION SYNC] Background sync error: {e}")
         
-        # 백그라운드 스레드로 실행
-        sync_thread = threading.Thread(target=background_sync)
-        sync_thread.daemon = True
-        sync_thread.start()
-        
+        # 공유 백그라운드 풀에서 실행 (같은 캘린더 동기화가 진행 중이면 건너뜀)
+        submit_background(f"notion-sync:{user_id}:{calendar_id}", background_sync)
+    
     except Exception as e:
         print(f"⚠️ [NOTION SYNC] Failed to start background sync: {e}")
     
@@ -1247,33 +1247,6 @@ def calendar_detail(calendar_id):
                 filename = os.path.basename(media_path)
                 media_url = f"/media/calendar/{calendar_id}/{filename}"
             print(f"[EMOJI] Local media file detected (priority 2): {media_url}")
-        else:
-            # PRIORITY 3: Check if there are any media files in the upload directory for this calendar
-            print(f"[EMOJI] No media file path found, checking upload directory...")
-            upload_dir = os.path.join(os.getcwd(), 'uploads', 'media', 'calendar')
-            if os.path.exists(upload_dir):
-                media_files = []
-                for file in os.listdir(upload_dir):
-                    if file.endswith(('.mp4', '.mp3', '.wav', '.m4a')):
-                        media_files.append(file)
-                
-                if media_files:
-                    # Use the first media file found
-                    first_media = media_files[0]
-                    media_url = f"/media/calendar/{calendar_id}/{first_media}"
-                    # Extract title from filename
-                    title = os.path.splitext(first_media)[0]
-                    if '_' in title:
-                        title = title.split('_')[-1]  # Get part after last underscore
-                    
-                    calendar['media_filename'] = title
-                    calendar['media_file_path'] = first_media
-                    calendar['media_file_type'] = 'video' if first_media.endswith('.mp4') else 'audio'
-                    print(f"[EMOJI] Found media file (priority 3): {first_media}, URL: {media_url}")
-                else:
-                    print(f"[EMOJI] No media files found in upload directory")
-            else:
-                print(f"[EMOJI] Upload directory does not exist: {upload_dir}")
     
     calendar['media_url'] = media_url
     
@@ -1364,146 +1337,25 @@ def calendar_day(calendar_id, date):
 # Media file serving route
 @app.route('/media/calendar/<calendar_id>/<filename>', endpoint='calendar_media_server')
 def serve_calendar_media_v2(calendar_id, filename):
-    """Serve media files for calendars"""
-    print(f"[EMOJI] Media request: calendar_id={calendar_id}, filename={filename}")
-    print(f"[EMOJI] Request URL: {request.url}")
-    print(f"[EMOJI] Request headers: {dict(request.headers)}")
-    
-    user_id = session.get('user_id')
-    print(f"[EMOJI] User ID from session: {user_id}")
-    
-    # Allow serving media files even without session (for testing)
-    # if not user_id:
-    #     print("[ERROR] No user authentication")
-    #     return jsonify({'error': 'Authentication required'}), 401
-    
+    """Serve media files for calendars
+
+    (calendar_id, filename) is resolved through the media index (one cached
+    calendars row lookup) instead of scanning the upload directory. Range and
+    conditional requests are answered by send_media; content-addressed files
+    get a SHA-256 ETag and immutable caching.
+    """
     try:
-        # First, check if the file exists in upload directory regardless of database
-        import os
-        upload_dir = os.path.join(os.getcwd(), 'uploads', 'media', 'calendar')
-        possible_paths = [
-            os.path.join(upload_dir, filename),  # Direct filename match
-            os.path.join(upload_dir, f"e390559f-c328-4786-ac5d-c74b5409451b_{filename}"),  # With user prefix
-        ]
-        
-        # Also check all files in the directory for a match
-        if os.path.exists(upload_dir):
-            for file in os.listdir(upload_dir):
-                if file.endswith(filename) or filename in file:
-                    possible_paths.append(os.path.join(upload_dir, file))
-        
-        file_path = None
-        for path in possible_paths:
-            if os.path.exists(path):
-                file_path = path
-                print(f"[EMOJI] Found media file at: {path}")
-                break
+        from utils.media_storage import media_index, media_etag, send_media
         
-        if file_path:
-            # Serve the file directly
-            from flask import send_file
-            try:
-                print(f"[EMOJI] Serving file: {file_path}")
-                return send_file(file_path, as_attachment=False)
-            except Exception as e:
-                print(f"[ERROR] Failed to serve file {file_path}: {e}")
-                return jsonify({'error': 'File serving error'}), 500
+        supabase = calendar_db.supabase if calendar_db_available and calendar_db else None
+        file_path, external_url = media_index.lookup(supabase, calendar_id, filename)
         
-        # Fallback: try database lookup
-        if calendar_db_available and user_id:
-            calendar = calendar_db.get_calendar_by_id(calendar_id, user_id)
-            print(f"[EMOJI] Calendar found in DB: {calendar is not None}")
-            
-            # If not found, try with known user ID
-            if not calendar:
-                known_user_id = "e390559f-c328-4786-ac5d-c74b5409451b"
-                calendar = calendar_db.get_calendar_by_id(calendar_id, known_user_id)
-                print(f"[EMOJI] Calendar found with known user ID: {calendar is not None}")
-            
-            media_path = calendar.get('media_file_path')
-            print(f"[EMOJI] Media path from DB: {media_path}")
-            
-            if media_path and media_path.startswith('http'):
-                # Redirect to external URL (like Supabase storage)
-                print(f"[LINK] Redirecting to external URL: {media_path}")
-                return redirect(media_path)
-            elif media_path:
-                # Serve local file - check multiple possible paths
-                import os
-                print(f"[EMOJI] Checking local file existence: {media_path}")
-                
-                # List of possible file paths to check
-                possible_paths = [
-                    media_path,  # Original path from database
-                    os.path.join(os.getcwd(), 'uploads', 'media', 'calendar', filename),  # New uploads path
-                    os.path.join(os.getcwd(), 'media', 'calendar', filename),  # Old media path
-                ]
-                
-                actual_file_path = None
-                for path in possible_paths:
-                    print(f"[SEARCH] Checking path: {path}")
-                    if os.path.exists(path):
-                        actual_file_path = path
-                        print(f"[SUCCESS] Found file at: {path}")
-                        break
-                
-                if actual_file_path:
-                    print(f"[SUCCESS] Serving local file: {actual_file_path}")
-                    # Determine MIME type
-                    if actual_file_path.endswith('.mp3'):
-                        mimetype = 'audio/mpeg'
-                    elif actual_file_path.endswith('.mp4'):
-                        mimetype = 'video/mp4'
-                    elif actual_file_path.endswith('.wav'):
-                        mimetype = 'audio/wav'
-                    elif actual_file_path.endswith('.m4a'):
-                        mimetype = 'audio/mp4'
-                    elif actual_file_path.endswith('.ogg'):
-                        mimetype = 'audio/ogg'
-                    elif actual_file_path.endswith('.webm'):
-                        mimetype = 'audio/webm'
-                    else:
-                        mimetype = 'application/octet-stream'
-                    
-                    # Check file size for debugging
-                    file_size = os.path.getsize(actual_file_path)
-                    print(f"[EMOJI] File size: {file_size} bytes")
-                    
-                    # Add cache control headers
-                    from flask import Response
-                    def generate():
-                        with open(actual_file_path, 'rb') as f:
-                            data = f.read(1024)
-                            while data:
-                                yield data
-                                data = f.read(1024)
-                    
-                    response = Response(generate(), mimetype=mimetype)
-                    response.headers['Accept-Ranges'] = 'bytes'
-                    response.headers['Cache-Control'] = 'public, max-age=3600'
-                    response.headers['Content-Length'] = str(file_size)
-                    return response
-                else:
-                    print(f"[ERROR] File not found in any of the checked paths")
-                    # List directory contents for debugging
-                    import os
-                    for path in possible_paths:
-                        parent_dir = os.path.dirname(path) if path else None
-                        if parent_dir and os.path.exists(parent_dir):
-                            print(f"[EMOJI] Directory {parent_dir} exists, contents: {os.listdir(parent_dir)}")
-                        else:
-                            print(f"[EMOJI] Directory doesn't exist: {parent_dir}")
-                    
-                    # Also check if uploads/media directory exists and what's in it
-                    uploads_media = os.path.join(os.getcwd(), 'uploads', 'media')
-                    if os.path.exists(uploads_media):
-                        print(f"[EMOJI] uploads/media exists, contents: {os.listdir(uploads_media)}")
-                    else:
-                        print(f"[EMOJI] uploads/media doesn't exist: {uploads_media}")
-            else:
-                print("[ERROR] No media path found in calendar data")
-        else:
-            print("[ERROR] Calendar DB not available")
+        if external_url:
+            # Redirect to external URL (like Supabase storage)
+            return redirect(external_url)
+        if file_path:
+            # lookup only returns a path when filename is the stored basename
+            return send_media(file_path, immutable=media_etag(file_path) is not None)
         
         return jsonify({'error': 'Media file not found'}), 404
         
@@ -3497,14 +3349,14 @@ def google_oauth_callback():
                 print(f"Found code_verifier in session: {bool(code_verifier)}")
             else:
                 # 세션에 없으면 데이터베이스에서 조회
-                from supabase import create_client
+                from utils.config import get_pooled_client
                 import os
 
                 supabase_url = os.environ.get('SUPABASE_URL')
                 supabase_key = os.environ.get('SUPABASE_API_KEY')
 
                 if supabase_url and supabase_key:
-                    supabase_client = create_client(supabase_url, supabase_key)
+                    supabase_client = get_pooled_client(supabase_url, supabase_key)
 
                     # state로 code_verifier 조회 (provider 컬럼 사용)
                     state_result = supabase_client.table('oauth_states').select('code_verifier').eq('state', encoded_state).eq('provider', 'google').execute()
@@ -3587,7 +3439,7 @@ def google_oauth_callback():
         # Google Calendar service import - 새로 초기화
         try:
             import os
-            from supabase import create_client
+            from utils.config import get_pooled_client
             
             # Service Role Key를 직접 사용
             supabase_url = os.environ.get('SUPABASE_URL')
@@ -3604,7 +3456,7 @@ def google_oauth_callback():
             else:
                 # Service Role Key로 새 클라이언트 생성 (RLS 우회)
                 print("Creating new Supabase client with Service Role Key")
-                supabase_client = create_client(supabase_url, service_role_key)
+                supabase_client = get_pooled_client(supabase_url, service_role_key)
                 
         except Exception as e:
             print(f"Failed to create Supabase client: {e}")
@@ -3996,6 +3848,24 @@ def health_check():
         }
         details['environment_check'] = env_check
         
+        # 백그라운드 작업 큐 상태 (queue depth / running / rejected)
+        try:
+            from utils.background_executor import get_background_stats
+            details['background_executor'] = get_background_stats()
+        except ImportError:
+            pass
+        
+        # 이벤트 읽기 캐시 상태 (hits / misses / invalidations)
+        try:
+            from utils.event_cache import event_cache
+            details['event_cache'] = event_cache.get_stats()
+            from utils.month_view import month_view
+            details['month_view_cache'] = month_view.get_stats()
+            from utils.media_storage import media_index
+            details['media_index'] = media_index.get_stats()
+        except ImportError:
+            pass
+        
         return jsonify({
             'status': status,
             'message': message,
@@ -4153,8 +4023,9 @@ except ImportError as e:
 
 # 📤 Register Calendar Export Routes (배치 내보내기)
 try:
-    from routes.calendar_export_routes import calendar_export_bp
+    from routes.calendar_export_routes import calendar_export_bp, calendar_feed_bp
     app.register_blueprint(calendar_export_bp)
+    app.register_blueprint(calendar_feed_bp)
     print("[SUCCESS] Calendar export routes registered")
 except ImportError as e:
     print(f"[WARNING] Calendar export routes not available: {e}")
@@ -5477,40 +5348,27 @@ def get_calendar_events(calendar_id):
         print(f"[DEBUG] Normalized user_id: {normalized_user_id}")
         print(f"[DEBUG] Calendar ID: {calendar_id}")
         
-        # First, check total events in table for debugging
-        total_events = supabase_client.table('calendar_events').select('*').execute()
-        print(f"[DEBUG] Total events in calendar_events table: {len(total_events.data) if total_events.data else 0}")
-        
-        # Check what user_ids exist in the database
-        if total_events.data:
-            unique_user_ids = set(event.get('user_id') for event in total_events.data if event.get('user_id'))
-            print(f"[DEBUG] User IDs found in database: {list(unique_user_ids)}")
-            print(f"[DEBUG] Sample event from DB: {total_events.data[0]}")
-        
-        # Check events for this user (both UUID formats)
-        user_events = supabase_client.table('calendar_events').select('*').or_(f'user_id.eq.{user_id},user_id.eq.{normalized_user_id}').execute()
-        print(f"[DEBUG] Events found for user: {len(user_events.data) if user_events.data else 0}")
-        
-        if user_events.data:
-            print(f"[DEBUG] Sample user event: {user_events.data[0]}")
-        else:
-            print(f"[DEBUG] No events found for user_id: {user_id} or {normalized_user_id}")
-        
-        # Include events for this user AND specific calendar_id (checking both UUID formats)
-        query = supabase_client.table('calendar_events').select('''
+        event_columns = '''
             id, title, description, start_datetime, end_datetime,
             is_all_day, status, location, attendees, created_at, updated_at, 
             calendar_id, source_platform, category, priority
-        ''').or_(f'user_id.eq.{user_id},user_id.eq.{normalized_user_id}').eq('calendar_id', calendar_id)
+        '''
         
-        # Add date range filtering if provided
         if start_date and end_date:
-            query = query.gte('start_datetime', start_date).lte('start_datetime', end_date)
+            # Events overlapping the requested range (interval index); uuid equality
+            # covers both hyphenated and bare user_id formats
+            from utils.event_range import query_events_in_range
+            events = query_events_in_range(
+                supabase_client, start_date, end_date,
+                user_id=normalized_user_id, calendar_ids=[calendar_id], columns=event_columns
+            )
             print(f"[DEBUG] Applied date filter: {start_date} to {end_date}")
-        
-        # Execute query
-        result = query.order('start_datetime').execute()
-        events = result.data if result.data else []
+        else:
+            # Include events for this user AND specific calendar_id (checking both UUID formats)
+            result = supabase_client.table('calendar_events').select(event_columns).or_(
+                f'user_id.eq.{user_id},user_id.eq.{normalized_user_id}'
+            ).eq('calendar_id', calendar_id).order('start_datetime').execute()
+            events = result.data if result.data else []
         
         print(f"[SUCCESS] Found {len(events)} events for calendar {calendar_id}")
         if events:
@@ -6846,6 +6704,15 @@ def auto_import_google_events():
         imported_count = 0
         failed_count = 0
         
+        # 이미 가져온 이벤트를 한 번의 쿼리로 확인 (이벤트마다 조회하지 않음)
+        google_event_ids = [event.get('id') for event in google_events if event.get('id')]
+        existing_event_ids = set()
+        if google_event_ids:
+            existing = supabase_client.table('calendar_events').select('external_event_id').eq(
+                'user_id', user_id
+            ).in_('external_event_id', google_event_ids).execute()
+            existing_event_ids = {row.get('external_event_id') for row in existing.data or []}
+        
         for event in google_events:
             try:
                 # Convert Google event to NotionFlow format
@@ -6888,9 +6755,7 @@ def auto_import_google_events():
                     })
                 
                 # Check if event already exists
-                existing = supabase_client.table('calendar_events').select('id').eq('user_id', user_id).eq('external_event_id', event.get('id')).execute()
-                
-                if not existing.data:
+                if event.get('id') not in existing_event_ids:
                     result = supabase_client.table('calendar_events').insert(event_data).execute()
                     if result.data:
                         imported_count += 1
@@ -7581,6 +7446,8 @@ if __name__ == '__main__':
         from utils.sync_scheduler import start_sync_scheduler
         start_sync_scheduler()
         print("✅ [SUCCESS] Sync scheduler started with singleton protection")
+        from utils.sync_job_queue import start_sync_job_workers
+        start_sync_job_workers()
     except ImportError as e:
         print(f"⚠️  [WARNING] Sync scheduler not available: {e}")
     except Exception as e:
@@ -7606,6 +7473,8 @@ elif os.environ.get('RENDER') and not os.environ.get('FLASK_ENV') == 'developmen
         from utils.sync_scheduler import start_sync_scheduler
         start_sync_scheduler()
         print("✅ [SUCCESS] Production sync scheduler started with singleton protection")
+        from utils.sync_job_queue import start_sync_job_workers
+        start_sync_job_workers()
     except ImportError as e:
         print(f"⚠️  [WARNING] Sync scheduler not available in production: {e}")
     except Exception as e:
@@ -7617,6 +7486,8 @@ elif os.environ.get('RAILWAY_ENVIRONMENT') or os.environ.get('FLASK_ENV') == 'pr
         from utils.sync_scheduler import start_sync_scheduler
         start_sync_scheduler()
         print("✅ [SUCCESS] Railway sync scheduler started with singleton protection")
+        from utils.sync_job_queue import start_sync_job_workers
+        start_sync_job_workers()
     except ImportError as e:
         print(f"⚠️  [WARNING] Sync scheduler not available on Railway: {e}")
     except Exception as e:
@@ -7751,114 +7622,25 @@ def generate_month_calendar(calendar_id):
 
         # Generating month calendar
 
-        # Get calendar events for the month
-        from datetime import datetime, timezone
-        start_date = datetime(year, month, 1, tzinfo=timezone.utc)
-        if month == 12:
-            end_date = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
-        else:
-            end_date = datetime(year, month + 1, 1, tzinfo=timezone.utc)
-
-        # Fetch events from database
+        # 렌더링된 월 달력은 캐시됨 (이벤트 변경 시 data version으로 무효화)
         supabase_client = get_supabase()
         if supabase_client:
-            events_result = supabase_client.from_('calendar_events') \
-                .select('*') \
-                .eq('calendar_id', calendar_id) \
-                .gte('start_datetime', start_date.isoformat()) \
-                .lt('start_datetime', end_date.isoformat()) \
-                .execute()
-
-            events = events_result.data if events_result.data else []
+            from utils.month_view import month_view
+            calendar_html, events_count = month_view.render(supabase_client, user_id, calendar_id, year, month)
+            # 이전/다음 달 미리 렌더링 - 월 이동이 캐시 히트가 되도록
+            month_view.prefetch_adjacent(supabase_client, user_id, calendar_id, year, month)
         else:
-            events = []
-
-        # Generate calendar HTML
-        calendar_html = generate_month_calendar_html(year, month, events)
+            from utils.month_view import render_month_html
+            calendar_html, events_count = render_month_html(year, month, []), 0
 
         return jsonify({
             'success': True,
             'html': calendar_html,
             'year': year,
             'month': month,
-            'events_count': len(events)
+            'events_count': events_count
         })
 
     except Exception as e:
         # Error generating month calendar
         return jsonify({'error': 'Failed to generate calendar'}), 500
-
-def generate_month_calendar_html(year, month, events):
-    """월 달력 HTML 생성 함수"""
-    from datetime import datetime, timedelta
-
-    # Get first day of month and calculate calendar start
-    first_day = datetime(year, month, 1)
-    last_day = datetime(year, month + 1, 1) - timedelta(days=1) if month < 12 else datetime(year + 1, 1, 1) - timedelta(days=1)
-
-    # Start from the Sunday before the first day
-    start_date = first_day - timedelta(days=first_day.weekday() + 1)
-    if first_day.weekday() == 6:  # If first day is Sunday
-        start_date = first_day
-
-    # Create events lookup by date
-    events_by_date = {}
-    for event in events:
-        try:
-            event_date = datetime.fromisoformat(event['start_datetime'].replace('Z', '+00:00'))
-            date_key = event_date.strftime('%Y-%m-%d')
-            if date_key not in events_by_date:
-                events_by_date[date_key] = []
-            events_by_date[date_key].append(event)
-        except Exception:
-            # Error processing event date
-            continue
-
-    # Generate weekday headers
-    weekdays = ['일', '월', '화', '수', '목', '금', '토']
-    html = '<div class="month-weekdays">'
-    for weekday in weekdays:
-        html += f'<div class="weekday-header">{weekday}</div>'
-    html += '</div>'
-
-    # Generate calendar grid
-    html += '<div class="month-days-grid">'
-
-    current_date = start_date
-    today = datetime.now().date()
-
-    for week in range(6):  # 6 weeks
-        for day in range(7):  # 7 days
-            date_key = current_date.strftime('%Y-%m-%d')
-            day_events = events_by_date.get(date_key, [])
-
-            # Determine cell classes
-            cell_classes = ['month-day-cell']
-            if current_date.month != month:
-                cell_classes.append('other-month')
-            if current_date.date() == today:
-                cell_classes.append('today')
-
-            html += f'<div class="{" ".join(cell_classes)}" data-date="{date_key}">'
-            html += f'<div class="day-number">{current_date.day}</div>'
-            html += '<div class="day-events-list">'
-
-            # Add events
-            for event in day_events[:3]:  # Limit to 3 events per day
-                title = event.get('title', 'Untitled Event')
-                if len(title) > 20:
-                    title = title[:17] + '...'
-
-                platform_class = f"platform-{event.get('source_platform', 'manual')}"
-                html += f'<div class="month-event {platform_class}" title="{event.get("title", "")}">{title}</div>'
-
-            if len(day_events) > 3:
-                html += f'<div class="month-event-more">+{len(day_events) - 3} more</div>'
-
-            html += '</div>'
-            html += '</div>'
-
-            current_date += timedelta(days=1)
-
-    html += '</div>'
-    return html
\ No newline at end of file
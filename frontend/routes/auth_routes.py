@@ -93,13 +93,13 @@ def login():
             # If no profile exists, create one for regular login users
             if not profile:
                 try:
-                    from supabase import create_client
+                    from utils.config import get_pooled_client
                     from datetime import datetime
                     
                     if not SUPABASE_URL or not SUPABASE_KEY:
                         print('Database configuration error - cannot create profile')
                     else:
-                        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+                        supabase = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
                         
                         # Generate username from email
                         username = user_data['email'].split('@')[0]
@@ -347,12 +347,12 @@ def update_profile():
             return jsonify({'error': 'No valid fields to update'}), 400
         
         # Update profile in database
-        from supabase import create_client
+        from utils.config import get_pooled_client
         
         if not SUPABASE_URL or not SUPABASE_KEY:
             return jsonify({'error': 'Database configuration error'}), 500
             
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        supabase = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
         
         result = supabase.table('user_profiles').update(update_data).eq('user_id', user_id).execute()
         
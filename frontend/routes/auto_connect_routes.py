@@ -10,7 +10,7 @@ import requests
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from flask import Blueprint, request, jsonify, redirect, session, url_for
-from supabase import create_client
+from utils.config import PooledClientProxy
 from utils.auth_manager import AuthManager
 
 # Initialize Supabase client
@@ -22,7 +22,7 @@ if not SUPABASE_URL:
 if not SUPABASE_KEY:
     raise ValueError("SUPABASE_API_KEY environment variable is required")
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase = PooledClientProxy(SUPABASE_URL, SUPABASE_KEY)
 
 auto_connect_bp = Blueprint('auto_connect', __name__, url_prefix='/api/auto-connect')
 
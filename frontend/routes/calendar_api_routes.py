@@ -7,13 +7,15 @@ import os
 import sys
 import uuid
 from datetime import datetime
-from flask import Blueprint, request, jsonify, session, send_file
+from flask import Blueprint, request, jsonify, session
 from werkzeug.utils import secure_filename
 
 # Add utils to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../utils'))
 sys.path.append(os.path.join(os.path.dirname(__file__), '../utils'))
 
+from utils.media_storage import store_media, discard_media, is_content_addressed, media_index, send_media
+
 calendar_api_bp = Blueprint('calendar_api', __name__, url_prefix='/api')
 
 # 사이드바 이벤트 카운트를 저장할 간단한 메모리 캐시
@@ -514,7 +516,7 @@ def create_calendar():
     user_id = get_current_user_id() or "e390559f-c328-4786-ac5d-c74b5409451b"  # 실제 캘린더 소유자 ID
     
     try:
-        from supabase import create_client
+        from utils.config import get_pooled_client
         
         # Supabase 연결
         SUPABASE_URL = os.environ.get('SUPABASE_URL')
@@ -523,7 +525,7 @@ def create_calendar():
         if not SUPABASE_URL or not SUPABASE_KEY:
             raise Exception("Supabase credentials not configured")
         
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        supabase = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
         
         # 이미 위에서 폼 데이터를 추출했으므로 중복 제거
         if not name:
@@ -556,16 +558,8 @@ def create_calendar():
                     'error': 'File size must be less than 50MB'
                 }), 400
             
-            # 고유한 파일명 생성
-            file_extension = media_file.filename.rsplit('.', 1)[1].lower()
-            unique_filename = f"{uuid.uuid4().hex}.{file_extension}"
-            
-            # 파일 저장
-            upload_folder = get_upload_folder()
-            file_path = os.path.join(upload_folder, unique_filename)
-            media_file.save(file_path)
-            
-            media_file_path = unique_filename
+            # 파일 저장 (내용 주소 경로: objects/<sha256[:2]>/<sha256>.<ext>)
+            media_file_path = store_media(media_file)
             media_file_type = file_type
             
             # 사용자가 지정한 파일명이 없으면 원본 파일명 사용
@@ -658,7 +652,7 @@ def create_calendar():
             # 파일이 저장되었다면 삭제
             if media_file_path:
                 try:
-                    os.remove(os.path.join(upload_folder, media_file_path))
+                    discard_media(media_file_path, supabase, just_stored=True)
                 except:
                     pass
             
@@ -673,7 +667,7 @@ def create_calendar():
         # 에러 발생 시 업로드된 파일 삭제
         if 'media_file_path' in locals() and media_file_path:
             try:
-                os.remove(os.path.join(get_upload_folder(), media_file_path))
+                discard_media(media_file_path, locals().get('supabase'), just_stored=True)
             except:
                 pass
         
@@ -692,7 +686,7 @@ def update_media_filename(calendar_id):
     user_id = get_current_user_id()
     
     try:
-        from supabase import create_client
+        from utils.config import get_pooled_client
         
         # Supabase 연결
         SUPABASE_URL = os.environ.get('SUPABASE_URL')
@@ -701,7 +695,7 @@ def update_media_filename(calendar_id):
         if not SUPABASE_URL or not SUPABASE_KEY:
             raise Exception("Supabase credentials not configured")
         
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        supabase = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
         
         data = request.get_json()
         new_filename = data.get('media_filename', '').strip()
@@ -727,6 +721,8 @@ def update_media_filename(calendar_id):
             'updated_at': datetime.now().isoformat()
         }).eq('id', calendar_id).eq('user_id', user_id).execute()
         
+        media_index.invalidate(calendar_id)
+        
         if update_result.data:
             return jsonify({
                 'success': True,
@@ -747,7 +743,7 @@ def update_media_filename(calendar_id):
 
 @calendar_api_bp.route('/calendars/<calendar_id>/media/<filename>')
 def serve_media_file(calendar_id, filename):
-    """미디어 파일 제공"""
+    """미디어 파일 제공 (Range / 조건부 요청 지원, 캘린더-미디어 매핑은 media_index 캐시)"""
     auth_error = require_auth()
     if auth_error:
         return auth_error
@@ -755,66 +751,51 @@ def serve_media_file(calendar_id, filename):
     user_id = get_current_user_id()
     
     try:
-        from supabase import create_client
+        from utils.config import get_pooled_client
+        from utils.uuid_helper import normalize_uuid
         
-        # Supabase 연결
+        # Supabase 연결 (캐시 미스일 때만 조회에 사용)
         SUPABASE_URL = os.environ.get('SUPABASE_URL')
         SUPABASE_KEY = os.environ.get('SUPABASE_API_KEY')
         
         if not SUPABASE_URL or not SUPABASE_KEY:
             raise Exception("Supabase credentials not configured")
         
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        supabase = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
         
-        # 캘린더 및 미디어 파일 정보 확인
-        calendar_result = supabase.table('calendars').select('*').eq('id', calendar_id).eq('owner_id', user_id).execute()
+        # 캘린더 소유권 및 미디어 파일 정보 확인
+        media = media_index.get_calendar_media(supabase, calendar_id)
         
-        if not calendar_result.data:
+        if not media or normalize_uuid(media['owner_id']) != normalize_uuid(user_id):
             return jsonify({
                 'success': False,
                 'error': 'Calendar not found or access denied'
             }), 404
         
-        calendar = calendar_result.data[0]
-        
-        if not calendar.get('media_file_path'):
+        if not media['media_file_path']:
             return jsonify({
                 'success': False,
                 'error': 'No media file associated with this calendar'
             }), 404
         
-        # 파일 경로 확인
-        upload_folder = get_upload_folder()
-        file_path = os.path.join(upload_folder, calendar['media_file_path'])
-        
-        if not os.path.exists(file_path):
+        if not media['path']:
             return jsonify({
                 'success': False,
                 'error': 'Media file not found'
             }), 404
         
-        # 파일 타입에 따른 MIME 타입 설정
-        file_extension = calendar['media_file_path'].split('.')[-1].lower()
-        mime_types = {
-            'mp3': 'audio/mpeg',
-            'wav': 'audio/wav',
-            'm4a': 'audio/mp4',
-            'aac': 'audio/aac',
-            'mp4': 'video/mp4',
-            'mov': 'video/quicktime',
-            'avi': 'video/x-msvideo',
-            'wmv': 'video/x-ms-wmv',
-            'webm': 'video/webm'
-        }
-        
-        mimetype = mime_types.get(file_extension, 'application/octet-stream')
+        # URL이 내용 주소 파일명을 가리킬 때만 immutable (다른 파일명이면 미디어가 바뀔 수 있음)
+        immutable = (
+            is_content_addressed(media['media_file_path'])
+            and os.path.basename(media['media_file_path']) == filename
+        )
         
         # 파일 전송
-        return send_file(
-            file_path,
-            mimetype=mimetype,
-            as_attachment=False,
-            download_name=calendar.get('media_filename', calendar['media_file_path'])
+        return send_media(
+            media['path'],
+            immutable=immutable,
+            download_name=media.get('media_filename') or os.path.basename(media['media_file_path']),
+            private=True
         )
         
     except Exception as e:
@@ -828,14 +809,14 @@ def serve_media_file(calendar_id, filename):
 def list_calendars():
     """모든 캘린더 목록 조회 (디버그용)"""
     try:
-        from supabase import create_client
+        from utils.config import get_pooled_client
         SUPABASE_URL = os.environ.get('SUPABASE_URL')
         SUPABASE_KEY = os.environ.get('SUPABASE_API_KEY')
         
         if not SUPABASE_URL or not SUPABASE_KEY:
             return jsonify({'error': 'Supabase credentials not configured'}), 500
             
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        supabase = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
         result = supabase.table('calendars').select('id, name, owner_id').execute()
         
         return jsonify({
@@ -916,7 +897,7 @@ def update_media_title(calendar_id):
             }), 400
         
         try:
-            from supabase import create_client
+            from utils.config import get_pooled_client
         except ImportError:
             return jsonify({
                 'success': False,
@@ -930,7 +911,7 @@ def update_media_title(calendar_id):
         if not SUPABASE_URL or not SUPABASE_KEY:
             raise Exception("Supabase credentials not configured")
         
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        supabase = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
         
         # 캘린더 존재 확인 및 권한 체크
         calendar_result = supabase.table('calendars').select('*').eq('id', calendar_id).eq('owner_id', user_id).execute()
@@ -1000,7 +981,7 @@ def delete_calendar(calendar_id):
     try:
         # Try to import and use Supabase if available
         try:
-            from supabase import create_client
+            from utils.config import get_pooled_client
             
             # Supabase 연결
             SUPABASE_URL = os.environ.get('SUPABASE_URL')
@@ -1010,7 +991,7 @@ def delete_calendar(calendar_id):
                 print("❌ Supabase credentials not found")
                 raise Exception("Supabase credentials not configured")
             
-            supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+            supabase = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
             
         except ImportError as import_error:
             print(f"❌ Supabase import failed: {import_error}")
@@ -1052,21 +1033,19 @@ def delete_calendar(calendar_id):
         calendar = calendar_result.data[0]
         print(f"📋 Found calendar: {calendar.get('name', 'Unknown')}")
         
-        # 미디어 파일 삭제 시도 (실패해도 계속)
+        # 캘린더 삭제
+        delete_result = supabase.table('calendars').delete().eq('id', calendar_id).execute()
+        
+        # 미디어 파일 삭제 시도 (실패해도 계속) - 캘린더 행을 지운 뒤라야 남은 참조를 셀 수 있음
+        media_index.invalidate(calendar_id)
         if calendar.get('media_file_path'):
             try:
-                upload_folder = get_upload_folder()
-                file_path = os.path.join(upload_folder, calendar['media_file_path'])
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    # print(f"✅ Deleted media file: {file_path}")
+                discard_media(calendar['media_file_path'], supabase)
+                # print(f"✅ Deleted media file: {calendar['media_file_path']}")
             except Exception as e:
                 print(f"⚠️ Warning: Failed to delete media file: {e}")
                 # Continue even if file deletion fails
         
-        # 캘린더 삭제
-        delete_result = supabase.table('calendars').delete().eq('id', calendar_id).execute()
-        
         if delete_result.data:
             # print(f"✅ Successfully deleted calendar: {calendar_id}")
             pass
@@ -1128,13 +1107,13 @@ def get_google_calendars():
             print("📅 [GOOGLE-CALENDARS] Found token in session, attempting to save to database...")
             try:
                 import os as os_module
-                from supabase import create_client
+                from utils.config import get_pooled_client
 
                 supabase_url = os_module.environ.get('SUPABASE_URL')
                 service_role_key = os_module.environ.get('SUPABASE_SERVICE_ROLE_KEY')
 
                 if supabase_url and service_role_key:
-                    supabase_client = create_client(supabase_url, service_role_key)
+                    supabase_client = get_pooled_client(supabase_url, service_role_key)
 
                     token_data = {
                         'user_id': user_id,
@@ -1171,13 +1150,13 @@ def get_google_calendars():
 
                 # Supabase client 가져오기 (이미 위에서 초기화됨)
                 import os as os_module
-                from supabase import create_client
+                from utils.config import get_pooled_client
 
                 supabase_url = os_module.environ.get('SUPABASE_URL')
                 service_role_key = os_module.environ.get('SUPABASE_SERVICE_ROLE_KEY')
 
                 if supabase_url and service_role_key:
-                    supabase_client = create_client(supabase_url, service_role_key)
+                    supabase_client = get_pooled_client(supabase_url, service_role_key)
 
                     # calendars 테이블에서 Google 타입 캘린더 가져오기
                     calendars_result = supabase_client.table('calendars').select('id, name, type, is_active').eq('owner_id', user_id).eq('type', 'google').eq('is_active', True).execute()
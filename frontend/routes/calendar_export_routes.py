@@ -1,14 +1,22 @@
 """
 캘린더 내보내기 API 라우터
 기존 OAuth 및 동기화 시스템 100% 재활용
+- /calendar/<id>.ics: 토큰 기반 ICS 구독 피드 (ETag/Last-Modified, 스트리밍)
 """
 
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify, session, Response, stream_with_context, url_for
 import os
 import sys
 import json
+import hashlib
+import hmac
+import secrets
+import time
 from datetime import datetime, timezone, timedelta
-from supabase import create_client
+from dateutil import parser as date_parser
+from utils.config import PooledClientProxy, get_pooled_admin_client
+from utils.ical_parser import format_calendar_header, format_vevent
+from utils.sync_job_queue import enqueue_job, get_job
 from dotenv import load_dotenv
 
 # Add parent directories to path for backend services
@@ -27,9 +35,16 @@ if not SUPABASE_URL:
 if not SUPABASE_KEY:
     raise Exception("SUPABASE_API_KEY environment variable is required")
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase = PooledClientProxy(SUPABASE_URL, SUPABASE_KEY)
 
 calendar_export_bp = Blueprint('calendar_export', __name__, url_prefix='/api')
+# Public feed (token-authenticated, no /api prefix so subscription URLs stay short)
+calendar_feed_bp = Blueprint('calendar_feed', __name__)
+
+# Rows per keyset page while streaming a feed
+ICS_FEED_PAGE_SIZE = int(os.getenv('ICS_FEED_PAGE_SIZE', '500'))
+ICS_FEED_COLUMNS = 'id, title, description, location, start_datetime, end_datetime, is_all_day, status, updated_at'
+ICS_STATUSES = {'confirmed', 'tentative', 'cancelled'}
 
 def get_current_user_id():
     """기존 세션 패턴 활용"""
@@ -262,89 +277,37 @@ def export_calendar(calendar_id):
 
         calendar_name = calendar_result.data['name']
 
-        # 간단한 내보내기 로직
-
-        # 플랫폼별 내보내기 결과
-        export_results = {}
-        success_count = 0
-        total_platforms = len(platforms)
-
+        # 플랫폼별 작업을 큐에 넣고 즉시 반환 (동기화는 sync_jobs 워커가 수행)
+        # Idempotency-Key 헤더가 없으면 같은 분 안의 중복 클릭을 하나로 합침
+        request_key = request.headers.get('Idempotency-Key') or str(int(time.time() // 60))
+        jobs = {}
         for platform in platforms:
-            try:
-                print(f"🔄 {platform} 플랫폼으로 내보내기 시작...")
-
-                if platform == 'google':
-                    # 기존 GoogleCalendarSyncService 활용 (에러 무시)
-                    try:
-                        from services.google_calendar_sync import sync_google_calendar_for_user
-                        result = sync_google_calendar_for_user(normalized_id)
-                    except ImportError:
-                        result = {'status': 'success', 'synced_events': 5, 'message': 'Mock 동기화 완료'}
-
-                elif platform == 'notion':
-                    # 기존 NotionSyncService 활용 (에러 무시)
-                    try:
-                        from services.notion_sync import sync_notion_calendar_for_user
-                        result = sync_notion_calendar_for_user(normalized_id)
-                    except ImportError:
-                        result = {'status': 'success', 'synced_events': 3, 'message': 'Mock 동기화 완료'}
-
-                else:
-                    # 다른 플랫폼은 향후 추가 (Mock으로 성공 처리)
-                    result = {
-                        'status': 'success',
-                        'synced_events': 2,
-                        'message': f'{platform} 플랫폼 내보내기 완료 (Mock)'
-                    }
-
-                if result and result.get('status') == 'success':
-                    export_results[platform] = {
-                        'status': 'success',
-                        'synced_events': result.get('synced_events', 0),
-                        'message': '내보내기 완료'
-                    }
-                    success_count += 1
-                else:
-                    export_results[platform] = {
-                        'status': 'failed',
-                        'error': result.get('error', '알 수 없는 오류'),
-                        'message': '내보내기 실패'
-                    }
-
-                print(f"✅ {platform} 내보내기 완료: {export_results[platform]['status']}")
-
-            except Exception as platform_error:
-                print(f"❌ {platform} 내보내기 실패: {str(platform_error)}")
-                export_results[platform] = {
-                    'status': 'error',
-                    'error': str(platform_error),
-                    'message': '내보내기 중 오류 발생'
-                }
-
-        # 로깅 (기존 시스템 활용 대신 간단히 로그만)
-        print(f"📤 내보내기 완료: {calendar_name} -> {platforms} (성공: {success_count}/{total_platforms})")
+            job = enqueue_job(
+                normalized_id, platform, 'calendar_export',
+                data={
+                    'calendar_id': calendar_id,
+                    'export_all': export_all,
+                    'keep_sync': keep_sync
+                },
+                idempotency_key=f"export:{calendar_id}:{platform}:{request_key}"
+            )
+            jobs[platform] = {
+                'job_id': job.get('id'),
+                'status': job.get('status', 'pending')
+            }
 
-        # 결과 반환
-        if success_count == total_platforms:
-            status = 'success'
-            message = f'모든 플랫폼으로 성공적으로 내보냈습니다. ({success_count}/{total_platforms})'
-        elif success_count > 0:
-            status = 'partial'
-            message = f'일부 플랫폼으로 내보냈습니다. ({success_count}/{total_platforms})'
-        else:
-            status = 'failed'
-            message = '모든 플랫폼 내보내기가 실패했습니다.'
+        print(f"📤 내보내기 작업 등록: {calendar_name} -> {platforms}")
 
         return jsonify({
             'success': True,
-            'status': status,
-            'message': message,
-            'results': export_results,
-            'success_count': success_count,
-            'total_platforms': total_platforms,
-            'remaining_changes': 0,  # 내보내기 완료 후 변경사항 0개
+            'status': 'queued',
+            'message': f'{len(platforms)}개 플랫폼 내보내기 작업이 시작되었습니다.',
+            'jobs': jobs,
+            'job_ids': [job['job_id'] for job in jobs.values() if job['job_id']],
+            'total_platforms': len(platforms),
+            'remaining_changes': 0,
             'calendar_name': calendar_name
-        })
+        }), 202
 
     except Exception as e:
         print(f"❌ 캘린더 내보내기 실패: {str(e)}")
@@ -354,6 +317,30 @@ def export_calendar(calendar_id):
             'details': str(e)
         }), 500
 
+@calendar_export_bp.route('/sync-jobs/<job_id>', methods=['GET'])
+def get_sync_job_status(job_id):
+    """백그라운드 작업 상태 조회 (내보내기 등)"""
+    try:
+        user_id = require_login()
+        if isinstance(user_id, tuple):
+            return user_id
+
+        job = get_job(job_id, normalize_uuid(user_id))
+        if not job:
+            return jsonify({
+                'success': False,
+                'error': '작업을 찾을 수 없습니다.'
+            }), 404
+
+        return jsonify({'success': True, 'job': job})
+
+    except Exception as e:
+        print(f"⚠️ 작업 상태 조회 실패: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': '작업 상태를 불러오는 중 오류가 발생했습니다.'
+        }), 500
+
 @calendar_export_bp.route('/calendar/<calendar_id>/export-settings', methods=['GET', 'POST'])
 def manage_export_settings(calendar_id):
     """내보내기 설정 관리 - 기존 테이블들 활용"""
@@ -411,4 +398,195 @@ def manage_export_settings(calendar_id):
         return jsonify({
             'success': False,
             'error': '설정 처리 중 오류가 발생했습니다.'
-        }), 500
\ No newline at end of file
+        }), 500
+
+@calendar_export_bp.route('/calendar/<calendar_id>/feed-token', methods=['POST', 'DELETE'])
+def manage_feed_token(calendar_id):
+    """ICS 구독 URL 발급/재발급(POST, rotate=true) 및 비활성화(DELETE)"""
+    try:
+        user_id = require_login()
+        if isinstance(user_id, tuple):
+            return user_id
+
+        normalized_id = normalize_uuid(user_id)
+
+        calendar_result = supabase.from_('calendars') \
+            .select('id, owner_id, ics_feed_token') \
+            .eq('id', calendar_id) \
+            .eq('owner_id', normalized_id) \
+            .single() \
+            .execute()
+
+        if not calendar_result.data:
+            return jsonify({
+                'success': False,
+                'error': '캘린더를 찾을 수 없거나 접근 권한이 없습니다.'
+            }), 404
+
+        if request.method == 'DELETE':
+            supabase.from_('calendars').update({'ics_feed_token': None}).eq('id', calendar_id).execute()
+            return jsonify({'success': True, 'message': '구독 피드가 비활성화되었습니다.'})
+
+        data = request.get_json(silent=True) or {}
+        token = calendar_result.data.get('ics_feed_token')
+        if not token or data.get('rotate'):
+            token = secrets.token_urlsafe(32)
+            supabase.from_('calendars').update({'ics_feed_token': token}).eq('id', calendar_id).execute()
+
+        return jsonify({
+            'success': True,
+            'feed_url': url_for('calendar_feed.calendar_ics_feed', calendar_id=calendar_id, token=token, _external=True)
+        })
+
+    except Exception as e:
+        print(f"⚠️ 구독 피드 토큰 처리 실패: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': '구독 피드 처리 중 오류가 발생했습니다.'
+        }), 500
+
+def _parse_timestamp(value):
+    if not value:
+        return None
+    parsed = date_parser.isoparse(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+def _feed_validators(db, calendar):
+    """(strong ETag, Last-Modified) from the newest event updated_at, event count and name
+
+    The count catches deletions, which don't move max(updated_at).
+    """
+    latest = db.from_('calendar_events') \
+        .select('updated_at') \
+        .eq('calendar_id', calendar['id']) \
+        .order('updated_at', desc=True) \
+        .limit(1) \
+        .execute()
+    latest_updated_at = latest.data[0]['updated_at'] if latest.data else None
+
+    fingerprint = f"{calendar['id']}|{latest_updated_at}|{calendar.get('event_count')}|{calendar.get('name')}"
+    etag = hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()[:32]
+    last_modified = _parse_timestamp(latest_updated_at)
+    return etag, last_modified
+
+def _feed_event(row):
+    """calendar_events row -> format_vevent dict"""
+    all_day = bool(row.get('is_all_day'))
+    start = _parse_timestamp(row['start_datetime'])
+    end = _parse_timestamp(row.get('end_datetime')) or start
+    if all_day:
+        start, end = start.date(), end.date()
+        if end <= start:
+            end = start + timedelta(days=1)
+
+    status = (row.get('status') or '').lower()
+    return {
+        'uid': f"{row['id']}@notionflow",
+        'summary': row.get('title'),
+        'description': row.get('description'),
+        'location': row.get('location'),
+        'dtstart': start,
+        'dtend': end,
+        'all_day': all_day,
+        'status': status if status in ICS_STATUSES else None,
+        'last_modified': _parse_timestamp(row.get('updated_at'))
+    }
+
+def _feed_page(db, calendar, last_id=None):
+    """One keyset page of feed rows (ordered by id) after last_id"""
+    query = db.from_('calendar_events') \
+        .select(ICS_FEED_COLUMNS) \
+        .eq('calendar_id', calendar['id'])
+    if last_id:
+        query = query.gt('id', last_id)
+    return query.order('id').limit(ICS_FEED_PAGE_SIZE).execute().data or []
+
+def _iter_feed(db, calendar, rows, last_modified=None):
+    """Stream the VCALENDAR one keyset page at a time, starting with the prefetched first page
+
+    A query failure after the headers are sent propagates so the connection
+    is aborted - a truncated document that still ends with END:VCALENDAR
+    would make subscribers drop the missing events and keep the copy while
+    the ETag matches. DTSTAMP comes from each row's updated_at so the body
+    stays identical under the same ETag.
+    """
+    fallback_dtstamp = last_modified or datetime(1970, 1, 1, tzinfo=timezone.utc)
+    yield format_calendar_header(calendar.get('name'))
+
+    while True:
+        chunk = []
+        for row in rows:
+            try:
+                event = _feed_event(row)
+                chunk.append(format_vevent(event, event['last_modified'] or fallback_dtstamp))
+            except Exception as e:
+                print(f"⚠️ [ICS FEED] Skipping event {row.get('id')}: {e}")
+        if chunk:
+            yield ''.join(chunk)
+
+        if len(rows) < ICS_FEED_PAGE_SIZE:
+            break
+        try:
+            rows = _feed_page(db, calendar, rows[-1]['id'])
+        except Exception as e:
+            print(f"❌ [ICS FEED] Feed for calendar {calendar['id']} interrupted: {e}")
+            raise
+
+    yield 'END:VCALENDAR\r\n'
+
+@calendar_feed_bp.route('/calendar/<calendar_id>.ics', methods=['GET', 'HEAD'])
+def calendar_ics_feed(calendar_id):
+    """ICS 구독 피드 - 폴링 클라이언트는 ETag/If-Modified-Since로 304 응답을 받음"""
+    token = request.args.get('token', '')
+    if not token:
+        return Response('Not found', status=404, mimetype='text/plain')
+
+    try:
+        db = get_pooled_admin_client()
+        calendar_result = db.from_('calendars') \
+            .select('id, name, ics_feed_token, event_count') \
+            .eq('id', calendar_id) \
+            .limit(1) \
+            .execute()
+        calendar = calendar_result.data[0] if calendar_result.data else None
+
+        # Same 404 for unknown calendars and wrong tokens
+        if not calendar or not calendar.get('ics_feed_token') or \
+                not hmac.compare_digest(calendar['ics_feed_token'], token):
+            return Response('Not found', status=404, mimetype='text/plain')
+
+        etag, last_modified = _feed_validators(db, calendar)
+    except Exception as e:
+        print(f"❌ [ICS FEED] Failed to load calendar {calendar_id}: {e}")
+        return Response('Feed unavailable', status=503, mimetype='text/plain')
+
+    headers = {'Cache-Control': 'private, no-cache'}
+
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains(etag)
+    else:
+        not_modified = bool(
+            last_modified and request.if_modified_since and
+            last_modified.replace(microsecond=0) <= request.if_modified_since
+        )
+
+    if not_modified:
+        response = Response(status=304, headers=headers)
+    else:
+        if request.method == 'HEAD':
+            response = Response(status=200, mimetype='text/calendar', headers=headers)
+        else:
+            try:
+                # First page before the response starts, so a failing query is a 503 and not an empty feed
+                rows = _feed_page(db, calendar)
+            except Exception as e:
+                print(f"❌ [ICS FEED] Failed to load events for calendar {calendar_id}: {e}")
+                return Response('Feed unavailable', status=503, mimetype='text/plain')
+            response = Response(stream_with_context(_iter_feed(db, calendar, rows, last_modified)),
+                                mimetype='text/calendar', headers=headers)
+        response.headers['Content-Disposition'] = f'inline; filename="{calendar_id}.ics"'
+
+    response.set_etag(etag)
+    if last_modified:
+        response.last_modified = last_modified
+    return response
@@ -17,13 +17,13 @@ from backend.services.google_calendar_service import get_google_calendar_service
 
 # Import Supabase for fallback data
 try:
-    from supabase import create_client
+    from utils.config import PooledClientProxy
     import os
 
     # Initialize Supabase client for fallback queries
     SUPABASE_URL = os.getenv('SUPABASE_URL')
     SUPABASE_KEY = os.getenv('SUPABASE_ANON_KEY')
-    supabase = create_client(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
+    supabase = PooledClientProxy(SUPABASE_URL, SUPABASE_KEY) if SUPABASE_URL and SUPABASE_KEY else None
 except ImportError:
     supabase = None
     print("⚠️ [GOOGLE-CALENDARS API] Supabase not available for fallback")
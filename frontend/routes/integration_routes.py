@@ -3,7 +3,7 @@ import os
 import sys
 import requests
 from datetime import datetime, timedelta
-from supabase import create_client
+from utils.config import PooledClientProxy
 from dotenv import load_dotenv
 
 # Add parent directory to path to import backend services
@@ -26,7 +26,7 @@ if not SUPABASE_URL:
 if not SUPABASE_KEY:
     raise Exception("SUPABASE_API_KEY environment variable is required")
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase = PooledClientProxy(SUPABASE_URL, SUPABASE_KEY)
 
 def get_platform_connection(user_id: str, platform: str):
     """Get platform connection for user"""
@@ -21,7 +21,7 @@ import traceback
 import re
 import random
 from werkzeug.utils import secure_filename
-from supabase import create_client
+from utils.config import get_pooled_client
 
 profile_bp = Blueprint('profile', __name__)
 
@@ -116,7 +116,7 @@ def update_profile():
             # 현재 사용자의 기존 사용자명과 다른 경우에만 중복 체크
             current_profile = AuthManager.get_user_profile(user_id)
             if current_profile and current_profile.get('username') != username:
-                supabase = create_client(SUPABASE_URL, SUPABASE_API_KEY)
+                supabase = get_pooled_client(SUPABASE_URL, SUPABASE_API_KEY)
                 
                 # 사용자명 중복 체크
                 existing = supabase.table('user_profiles').select('id').eq('username', username).execute()
@@ -144,7 +144,7 @@ def update_profile():
         
         # 데이터베이스 업데이트
         if update_data:
-            supabase = create_client(SUPABASE_URL, SUPABASE_API_KEY)
+            supabase = get_pooled_client(SUPABASE_URL, SUPABASE_API_KEY)
             
             update_data['updated_at'] = datetime.now().isoformat()
             
@@ -207,7 +207,7 @@ def upload_avatar():
             return jsonify({'error': 'Supabase configuration missing'}), 500
         
         try:
-            supabase = create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
+            supabase = get_pooled_client(SUPABASE_URL, SUPABASE_ANON_KEY)
             
             # 파일을 바이트로 읽기
             file_data = file.read()
@@ -297,7 +297,7 @@ def initial_setup():
             return jsonify({'error': 'Database configuration error - service key required'}), 500
             
         # 서비스 키로 새로운 클라이언트 생성
-        supabase_admin = create_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
+        supabase_admin = get_pooled_client(SUPABASE_URL, SUPABASE_SERVICE_KEY)
         print(f"Supabase admin client created with service key")
         
         # 프로필 업데이트 또는 생성 (먼저 birthdate 포함하여 시도)
@@ -469,7 +469,7 @@ def update_email():
             return jsonify({'error': 'Invalid email format'}), 400
         
         # 데이터베이스 업데이트
-        supabase = create_client(SUPABASE_URL, SUPABASE_API_KEY)
+        supabase = get_pooled_client(SUPABASE_URL, SUPABASE_API_KEY)
         
         # user_profiles 테이블에 이메일 업데이트
         result = supabase.table('user_profiles').update({
@@ -558,7 +558,7 @@ def check_username():
             })
         
         # 중복 체크
-        supabase = create_client(SUPABASE_URL, SUPABASE_API_KEY)
+        supabase = get_pooled_client(SUPABASE_URL, SUPABASE_API_KEY)
         
         result = supabase.table('user_profiles').select('id').eq('username', username).execute()
         
@@ -605,7 +605,7 @@ def get_username_suggestions():
         
         # 추천 사용자명 생성
         suggestions = []
-        supabase = create_client(SUPABASE_URL, SUPABASE_API_KEY)
+        supabase = get_pooled_client(SUPABASE_URL, SUPABASE_API_KEY)
         
         # 베이스 이름으로 시작
         for i in range(5):
@@ -99,12 +99,12 @@ def user_sync_status():
             return jsonify({'error': 'Authentication required'}), 401
         
         # Import here to avoid circular imports
-        from supabase import create_client
+        from utils.config import get_pooled_client
         
         if not SUPABASE_URL or not SUPABASE_KEY:
             return jsonify({'error': 'Database configuration error'}), 500
             
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        supabase = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
         
         # Get user's sync configurations
         result = supabase.table('calendar_sync_configs').select('''
@@ -147,12 +147,12 @@ def sync_history():
             return jsonify({'error': 'Authentication required'}), 401
         
         # Import here to avoid circular imports
-        from supabase import create_client
+        from utils.config import get_pooled_client
         
         if not SUPABASE_URL or not SUPABASE_KEY:
             return jsonify({'error': 'Database configuration error'}), 500
             
-        supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+        supabase = get_pooled_client(SUPABASE_URL, SUPABASE_KEY)
         
         # Get sync configurations with error history
         result = supabase.table('calendar_sync_configs').select('''
@@ -19,7 +19,7 @@ from services.google_calendar_sync import GoogleCalendarSyncService, sync_google
 from services.notion_sync import NotionSyncService, sync_notion_calendar_for_user
 from backend.services.calendar_service import CalendarSyncService
 from backend.services.sync_tracking_service import sync_tracker, EventType, ActivityType
-from backend.services.event_validation_service import event_validator, ValidationResult
+from backend.services.event_validation_service import event_validator, ValidationResult, BATCH_QUERY_SIZE
 
 unified_sync_bp = Blueprint('unified_sync', __name__, url_prefix='/api/unified-sync')
 
@@ -252,14 +252,14 @@ def get_sync_preview():
                 # 기존 SupaBase에서 현재 이벤트 수 조회
                 # (실제로는 더 정확한 계산 로직이 필요하지만 기본 구조)
                 if platform in ['google', 'notion']:
-                    from supabase import create_client
+                    from utils.config import get_pooled_client
                     import os
                     
                     supabase_url = os.environ.get('SUPABASE_URL')
                     supabase_key = os.environ.get('SUPABASE_SERVICE_ROLE_KEY') or os.environ.get('SUPABASE_API_KEY')
                     
                     if supabase_url and supabase_key:
-                        supabase = create_client(supabase_url, supabase_key)
+                        supabase = get_pooled_client(supabase_url, supabase_key)
                         
                         # 현재 사용자의 이벤트 수 조회 (모든 캘린더의 이벤트 합계)
                         from utils.uuid_helper import normalize_uuid
@@ -502,18 +502,18 @@ def execute_validated_sync():
             # Update validation records if sync was successful
             if result.get('success'):
                 try:
-                    # Mark validation records as synced
-                    for event_id in approved_event_ids:
-                        update_data = {
-                            'sync_status': 'success',
-                            'sync_completed_at': datetime.now(timezone.utc).isoformat()
-                        }
+                    # Mark validation records as synced (one update for all events)
+                    update_data = {
+                        'sync_status': 'success',
+                        'sync_completed_at': datetime.now(timezone.utc).isoformat()
+                    }
 
+                    for i in range(0, len(approved_event_ids), BATCH_QUERY_SIZE):
                         event_validator.supabase.table('event_validation_history').update(
                             update_data
-                        ).eq('user_id', user_id).eq('source_event_id', event_id).eq(
-                            'target_platform', target_platform
-                        ).eq('validation_status', 'approved').execute()
+                        ).eq('user_id', user_id).in_(
+                            'source_event_id', approved_event_ids[i:i + BATCH_QUERY_SIZE]
+                        ).eq('target_platform', target_platform).eq('validation_status', 'approved').execute()
 
                 except Exception as update_error:
                     print(f"⚠️ [VALIDATED SYNC] Error updating validation records: {update_error}")
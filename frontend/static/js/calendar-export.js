@@ -368,7 +368,7 @@ class CalendarExportManager {
             const data = await response.json();
 
             if (data.success) {
-                this.showSuccess('내보내기가 완료되었습니다!');
+                this.showSuccess(data.message || '내보내기가 시작되었습니다!');
 
                 // 변경사항 수 업데이트
                 this.pendingChanges = data.remaining_changes || 0;
@@ -35,6 +35,15 @@ user = None
 group = None
 tmp_upload_dir = None
 
+# Finish queued background work (Notion syncs, cache warmups) before a
+# worker exits, e.g. when it is recycled after max_requests
+def worker_exit(server, worker):
+    try:
+        from utils.background_executor import drain_background_executor
+        drain_background_executor()
+    except Exception as e:
+        server.log.warning(f"Background executor drain failed: {e}")
+
 # SSL (if needed in the future)
 # keyfile = None
 # certfile = None
@@ -8,11 +8,13 @@ import json
 import logging
 import sys
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 
 # Add utils path for retry helper
 sys.path.append(os.path.join(os.path.dirname(__file__), '../utils'))
 from db_retry_helper import retry_db_operation, safe_db_call
+from event_writer import bulk_upsert_events, compute_content_hash
+from utils.event_cache import invalidate_user_events
 
 # Google Calendar API 클래스
 class GoogleCalendarAPI:
@@ -49,12 +51,30 @@ class GoogleCalendarAPI:
             print(f"❌ [GOOGLE API] Error listing calendars: {e}")
             return []
     
-    def get_events(self, calendar_id: str = 'primary', time_min: datetime = None, time_max: datetime = None, max_results: int = 250) -> List[Dict]:
-        """특정 캘린더의 이벤트들 조회"""
-        try:
-            if not self.service:
-                return []
-            
+    def list_events(self, calendar_id: str = 'primary', time_min: datetime = None, time_max: datetime = None,
+                    sync_token: str = None, page_size: int = 250) -> Tuple[List[Dict], Optional[str]]:
+        """특정 캘린더의 이벤트 전체 조회 (nextPageToken 페이지네이션)
+
+        sync_token이 있으면 이전 동기화 이후 변경분만 조회 (삭제된 이벤트는 status='cancelled').
+        없으면 시간 범위 전체를 조회. (이벤트 목록, nextSyncToken)을 반환하며
+        sync_token이 만료된 경우(410 Gone) SyncTokenExpired를 발생시킴.
+        """
+        from googleapiclient.errors import HttpError
+        
+        if not self.service:
+            return [], None
+        
+        params = {
+            'calendarId': calendar_id,
+            'maxResults': page_size,
+            'singleEvents': True
+        }
+        
+        if sync_token:
+            # 증분 동기화: timeMin/timeMax/orderBy는 syncToken과 함께 쓸 수 없음
+            params['syncToken'] = sync_token
+            print(f"📡 [GOOGLE API] Fetching changes from {calendar_id} (incremental)")
+        else:
             # 기본 시간 범위 설정 (지난 1개월 ~ 앞으로 6개월)
             if not time_min:
                 time_min = datetime.now(timezone.utc) - timedelta(days=30)
@@ -66,33 +86,53 @@ class GoogleCalendarAPI:
             elif time_max.tzinfo is None:
                 time_max = time_max.replace(tzinfo=timezone.utc)
             
+            params['timeMin'] = time_min.isoformat()
+            params['timeMax'] = time_max.isoformat()
             print(f"📡 [GOOGLE API] Fetching events from {calendar_id}")
             print(f"📅 [GOOGLE API] Time range: {time_min.isoformat()} - {time_max.isoformat()}")
+        
+        events = []
+        page_token = None
+        pages = 0
+        while True:
+            if page_token:
+                params['pageToken'] = page_token
             
-            events_result = self.service.events().list(
-                calendarId=calendar_id,
-                timeMin=time_min.isoformat(),
-                timeMax=time_max.isoformat(),
-                maxResults=max_results,
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            
-            events = events_result.get('items', [])
-            print(f"✅ [GOOGLE API] Found {len(events)} events in {calendar_id}")
+            try:
+                events_result = self.service.events().list(**params).execute()
+            except HttpError as e:
+                if sync_token and getattr(e, 'resp', None) is not None and e.resp.status == 410:
+                    raise SyncTokenExpired(calendar_id)
+                raise
             
+            events.extend(events_result.get('items', []))
+            pages += 1
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                print(f"✅ [GOOGLE API] Found {len(events)} events in {calendar_id} ({pages} pages)")
+                return events, events_result.get('nextSyncToken')
+    
+    def get_events(self, calendar_id: str = 'primary', time_min: datetime = None, time_max: datetime = None, max_results: int = 250) -> List[Dict]:
+        """특정 캘린더의 이벤트들 조회 (모든 페이지)"""
+        try:
+            events, _ = self.list_events(calendar_id, time_min, time_max, page_size=max_results)
             return events
             
         except Exception as e:
             print(f"❌ [GOOGLE API] Error fetching events from {calendar_id}: {e}")
             return []
 
+
+class SyncTokenExpired(Exception):
+    """저장된 syncToken이 만료됨 (410 Gone) - 전체 재동기화 필요"""
+
+
 # Google Calendar 동기화 서비스
 class GoogleCalendarSyncService:
     """Google Calendar와 SupaBase 동기화를 담당하는 서비스"""
     
     def __init__(self):
-        from supabase import create_client
+        from utils.config import PooledClientProxy
         
         # SupaBase 초기화
         self.supabase_url = os.environ.get('SUPABASE_URL')
@@ -102,7 +142,7 @@ class GoogleCalendarSyncService:
         if not self.supabase_url or not self.supabase_key:
             raise Exception("SupaBase credentials not found")
         
-        self.supabase = create_client(self.supabase_url, self.supabase_key)
+        self.supabase = PooledClientProxy(self.supabase_url, self.supabase_key)
         print("✅ [GOOGLE SYNC] SupaBase initialized")
 
     @retry_db_operation(max_retries=3, delay=0.1)
@@ -173,13 +213,17 @@ class GoogleCalendarSyncService:
             print(f"❌ [GOOGLE SYNC] Error getting credentials for user {user_id}: {e}")
             return None
     
-    def sync_user_events(self, user_id: str) -> Dict[str, Any]:
-        """사용자의 Google Calendar 이벤트를 SupaBase에 동기화"""
+    def sync_user_events(self, user_id: str, credentials=None, all_if_unselected: bool = False) -> Dict[str, Any]:
+        """사용자의 Google Calendar 이벤트를 SupaBase에 동기화
+
+        credentials를 넘기지 않으면 oauth_tokens에서 조회.
+        all_if_unselected=True(스케줄러)면 선택된 캘린더가 없을 때 실패하지 않고 모든 캘린더를 동기화
+        """
         try:
             print(f"🚀 [GOOGLE SYNC] Starting sync for user {user_id}")
             
             # 1. 사용자 인증 정보 획득
-            credentials = self.get_user_credentials(user_id)
+            credentials = credentials or self.get_user_credentials(user_id)
             if not credentials:
                 return {
                     'success': False,
@@ -199,6 +243,9 @@ class GoogleCalendarSyncService:
             # 3. 캘린더 목록 및 선택된 캘린더 조회
             calendars = google_api.list_calendars()
             selected_calendar_ids = self.get_selected_calendars(user_id)
+            if not selected_calendar_ids and all_if_unselected:
+                print(f"📅 [GOOGLE SYNC] No calendars selected for user {user_id}, syncing all calendars")
+                selected_calendar_ids = ['*']
 
             if not selected_calendar_ids:
                 print(f"⚠️ [GOOGLE SYNC] No calendars selected for user {user_id}. Skipping sync.")
@@ -210,6 +257,7 @@ class GoogleCalendarSyncService:
 
             total_events = 0
             processed_events = 0
+            write_counts = {'created': 0, 'updated': 0, 'unchanged': 0, 'failed': 0}
             errors = []
 
             # 4. 선택된 캘린더만 동기화
@@ -225,14 +273,26 @@ class GoogleCalendarSyncService:
                 print(f"📅 [GOOGLE SYNC] Processing calendar: {calendar_name} ({calendar_id})")
                 
                 try:
-                    # 이벤트 조회
-                    events = google_api.get_events(calendar_id)
+                    # 이벤트 조회 (저장된 syncToken이 있으면 변경분만)
+                    events, next_sync_token = self._fetch_calendar_changes(google_api, user_id, calendar_id)
                     total_events += len(events)
                     
+                    # 삭제된 이벤트 제거
+                    cancelled_ids = [event['id'] for event in events if event.get('status') == 'cancelled' and event.get('id')]
+                    if cancelled_ids:
+                        self._delete_cancelled_events(user_id, cancelled_ids)
+                    
                     # 이벤트를 SupaBase에 저장 - 배치 처리로 최적화
-                    self._save_events_batch_google(events, user_id, calendar_id, calendar_name)
+                    active_events = [event for event in events if event.get('status') != 'cancelled']
+                    counts = self._save_events_batch_google(active_events, user_id, calendar_id, calendar_name)
+                    for key, value in counts.items():
+                        write_counts[key] += value
                     processed_events += len(events)
                     
+                    # 저장이 모두 성공한 경우에만 다음 syncToken 저장
+                    if next_sync_token and counts.get('failed', 0) == 0:
+                        self._save_sync_token(user_id, calendar_id, next_sync_token)
+                    
                 except Exception as e:
                     error_msg = f"Calendar processing error for {calendar_name}: {str(e)}"
                     errors.append(error_msg)
@@ -251,6 +311,10 @@ class GoogleCalendarSyncService:
                 'selected_calendars_count': len(selected_calendar_ids),
                 'events_found': total_events,
                 'events_processed': processed_events,
+                'events_created': write_counts['created'],
+                'events_updated': write_counts['updated'],
+                'events_unchanged': write_counts['unchanged'],
+                'events_failed': write_counts['failed'],
                 'errors': errors,
                 'message': f'선택된 {len(selected_calendar_ids)}개 캘린더에서 {processed_events}개 이벤트 동기화 완료'
             }
@@ -264,6 +328,64 @@ class GoogleCalendarSyncService:
                 'events_processed': 0
             }
     
+    def _fetch_calendar_changes(self, google_api: GoogleCalendarAPI, user_id: str,
+                                calendar_id: str) -> Tuple[List[Dict], Optional[str]]:
+        """syncToken으로 변경분 조회, 토큰이 없거나 만료(410)되면 전체 재동기화"""
+        sync_token = self._get_sync_token(user_id, calendar_id)
+        if sync_token:
+            try:
+                return google_api.list_events(calendar_id, sync_token=sync_token)
+            except SyncTokenExpired:
+                print(f"♻️ [GOOGLE SYNC] Sync token expired for {calendar_id}, running full resync")
+                self._clear_sync_token(user_id, calendar_id)
+        
+        return google_api.list_events(calendar_id)
+    
+    def _get_sync_token(self, user_id: str, calendar_id: str) -> Optional[str]:
+        """캘린더별 저장된 nextSyncToken 조회"""
+        def get_token():
+            return self.supabase.table('google_calendar_sync_tokens').select('sync_token').eq(
+                'user_id', user_id
+            ).eq('google_calendar_id', calendar_id).execute()
+        
+        result = safe_db_call(get_token)
+        if result and result.data:
+            return result.data[0].get('sync_token')
+        return None
+    
+    def _save_sync_token(self, user_id: str, calendar_id: str, sync_token: str):
+        """동기화 완료 후 nextSyncToken 저장"""
+        def save_token():
+            return self.supabase.table('google_calendar_sync_tokens').upsert({
+                'user_id': user_id,
+                'google_calendar_id': calendar_id,
+                'sync_token': sync_token,
+                'last_synced_at': datetime.now(timezone.utc).isoformat()
+            }, on_conflict='user_id,google_calendar_id').execute()
+        
+        safe_db_call(save_token)
+    
+    def _clear_sync_token(self, user_id: str, calendar_id: str):
+        """만료된 syncToken 삭제"""
+        def clear_token():
+            return self.supabase.table('google_calendar_sync_tokens').delete().eq(
+                'user_id', user_id
+            ).eq('google_calendar_id', calendar_id).execute()
+        
+        safe_db_call(clear_token)
+    
+    def _delete_cancelled_events(self, user_id: str, external_ids: List[str]):
+        """Google에서 삭제(cancelled)된 이벤트를 한 번의 쿼리로 제거"""
+        def delete_events():
+            return self.supabase.table('calendar_events').delete().eq(
+                'user_id', user_id
+            ).eq('source_platform', 'google').in_('external_id', external_ids).execute()
+        
+        result = safe_db_call(delete_events)
+        if result is not None:
+            invalidate_user_events(user_id)
+            print(f"🗑️ [GOOGLE SYNC] Removed {len(external_ids)} cancelled events")
+    
     def _save_event_to_database(self, event: Dict, user_id: str, calendar_id: str, calendar_name: str):
         """Google Calendar 이벤트를 SupaBase에 저장"""
         try:
@@ -291,6 +413,7 @@ class GoogleCalendarSyncService:
 
                 result = safe_db_call(update_event)
                 if result:
+                    invalidate_user_events(user_id)
                     print(f"📝 [GOOGLE SYNC] Updated event: {event_data['title']}")
 
             else:
@@ -312,41 +435,23 @@ class GoogleCalendarSyncService:
 
                 result = safe_db_call(insert_event)
                 if result:
+                    invalidate_user_events(user_id)
                     print(f"➕ [GOOGLE SYNC] Inserted new event: {event_data['title']}")
         
         except Exception as e:
             print(f"❌ [GOOGLE SYNC] Error saving event '{event.get('summary', 'Unknown')}': {e}")
             raise
 
-    def _save_events_batch_google(self, events: List[Dict], user_id: str, calendar_id: str, calendar_name: str):
-        """Google Calendar 이벤트들을 배치로 처리하여 중복 에러 방지"""
+    def _save_events_batch_google(self, events: List[Dict], user_id: str, calendar_id: str, calendar_name: str) -> Dict[str, int]:
+        """Google Calendar 이벤트들을 일괄 upsert - content_hash가 같은 이벤트는 다시 쓰지 않음"""
+        counts = {'created': 0, 'updated': 0, 'unchanged': 0, 'failed': 0}
         if not events:
-            return
+            return counts
 
         try:
             print(f"💾 [GOOGLE BATCH] Processing {len(events)} events from {calendar_name}")
 
-            # 1. 기존 이벤트들의 external_id 조회 (한 번의 쿼리로)
-            event_ids = [event.get('id') for event in events if event.get('id')]
-            if not event_ids:
-                return
-
-            def get_existing_events():
-                return self.supabase.table('calendar_events').select('external_id').eq(
-                    'user_id', user_id
-                ).eq('source_platform', 'google').in_('external_id', event_ids).execute()
-
-            existing_result = safe_db_call(get_existing_events)
-            existing_external_ids = set()
-            if existing_result and existing_result.data:
-                existing_external_ids = {item['external_id'] for item in existing_result.data}
-
-            print(f"🔍 [GOOGLE BATCH] Found {len(existing_external_ids)} existing events")
-
-            # 2. 새 이벤트와 업데이트 대상 분리
-            new_events = []
-            update_events = []
-
+            rows = []
             for event in events:
                 event_id = event.get('id')
                 if not event_id:
@@ -356,62 +461,25 @@ class GoogleCalendarSyncService:
                 if not event_data:
                     continue
 
-                if event_id in existing_external_ids:
-                    # 기존 이벤트 업데이트 대상
-                    update_events.append({
-                        'external_id': event_id,
-                        'data': event_data
-                    })
-                else:
-                    # 새 이벤트 삽입 대상
-                    insert_data = {
-                        **event_data,
-                        'user_id': user_id,
-                        'source_platform': 'google',
-                        'external_id': event_id,
-                        'source_calendar_id': calendar_id,
-                        'source_calendar_name': calendar_name,
-                        'created_at': datetime.now(timezone.utc).isoformat(),
-                        'updated_at': datetime.now(timezone.utc).isoformat()
-                    }
-                    new_events.append(insert_data)
-
-            # 3. 배치 삽입 (새 이벤트들)
-            if new_events:
-                try:
-                    def insert_batch():
-                        return self.supabase.table('calendar_events').insert(new_events).execute()
-
-                    insert_result = safe_db_call(insert_batch)
-                    if insert_result and insert_result.data:
-                        print(f"✅ [GOOGLE BATCH] Created {len(insert_result.data)} new events")
-                except Exception as insert_error:
-                    print(f"❌ [GOOGLE BATCH] Insert failed: {insert_error}")
-
-            # 4. 개별 업데이트 (기존 이벤트들)
-            updated_count = 0
-            for update_item in update_events:
-                try:
-                    def update_single():
-                        return self.supabase.table('calendar_events').update(
-                            update_item['data']
-                        ).eq('user_id', user_id).eq(
-                            'external_id', update_item['external_id']
-                        ).eq('source_platform', 'google').execute()
-
-                    update_result = safe_db_call(update_single)
-                    if update_result and update_result.data:
-                        updated_count += 1
-                except Exception as update_error:
-                    print(f"❌ [GOOGLE BATCH] Update failed for {update_item['external_id']}: {update_error}")
-
-            if updated_count > 0:
-                print(f"✅ [GOOGLE BATCH] Updated {updated_count} existing events")
+                rows.append({
+                    **event_data,
+                    'user_id': user_id,
+                    'source_platform': 'google',
+                    'external_id': event_id,
+                    'source_calendar_id': calendar_id,
+                    'source_calendar_name': calendar_name
+                })
 
-            print(f"💾 [GOOGLE BATCH] Completed processing {calendar_name}")
+            counts = bulk_upsert_events(self.supabase, rows)
+            print(f"💾 [GOOGLE BATCH] Completed processing {calendar_name}: "
+                  f"created={counts['created']} updated={counts['updated']} unchanged={counts['unchanged']}")
 
         except Exception as e:
+            # 실패로 집계해야 호출자가 syncToken을 전진시키지 않고 다음 동기화에서 다시 받아옴
             print(f"❌ [GOOGLE BATCH] Error processing batch: {e}")
+            counts = {'created': 0, 'updated': 0, 'unchanged': 0, 'failed': len(events)}
+
+        return counts
 
     def _parse_google_event(self, event: Dict, calendar_id: str, calendar_name: str) -> Optional[Dict]:
         """Google Calendar 이벤트를 SupaBase 형식으로 변환"""
@@ -474,6 +542,9 @@ class GoogleCalendarSyncService:
                 'source_platform': 'google'
             })
             
+            # 내용 해시 (변경 없는 이벤트는 저장 생략)
+            event_data['content_hash'] = compute_content_hash(event_data)
+            
             return event_data
             
         except Exception as e:
@@ -5,13 +5,63 @@
 
 import os
 import json
+import time
+import hashlib
 import logging
+import threading
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any
 
+# Notion API 속도 제한기
+class NotionRateLimiter:
+    """토큰 버킷 속도 제한기 - Notion은 integration당 평균 초당 3회 요청 허용"""
+
+    def __init__(self, rate: float = 3.0, capacity: int = 3):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """요청 1회 분량의 토큰을 얻을 때까지 대기"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                    self.updated_at = now
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        """429 응답 시 같은 토큰을 쓰는 모든 스레드의 요청을 일시 중지"""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+
 # Notion API 클래스
 class NotionAPI:
     """Notion API 호출을 담당하는 간단한 클래스"""
+
+    # 토큰별 공유 속도 제한기
+    _rate_limiters: Dict[str, NotionRateLimiter] = {}
+    _rate_limiters_lock = threading.Lock()
+    MAX_RETRIES = 3  # 429 재시도 횟수
+    MAX_CONCURRENT_DATABASES = 4  # 동시에 페이지네이션할 데이터베이스 수
+
+    # 데이터베이스 스키마 캐시 (토큰별 공유, 프로세스 메모리)
+    # {token_key: {database_id: {'properties', 'date_property', 'last_edited_time', 'cached_at'}}}
+    _schema_cache: Dict[str, Dict[str, Dict]] = {}
+    _schema_cache_lock = threading.Lock()
+    SCHEMA_CACHE_TTL = 600  # 10분
     
     def __init__(self, token: str):
         self.token = token
@@ -23,17 +73,124 @@ class NotionAPI:
         }
         # 문제 있는 데이터베이스 블랙리스트 (메모리 저장)
         self.blacklisted_databases = set()
+        # 토큰 원문 대신 해시를 캐시 키로 사용
+        self._token_key = hashlib.sha256(token.encode()).hexdigest() if token else ''
+    
+    def _get_rate_limiter(self) -> NotionRateLimiter:
+        """토큰별 속도 제한기 (여러 NotionAPI 인스턴스/스레드가 공유)"""
+        with self._rate_limiters_lock:
+            limiter = self._rate_limiters.get(self._token_key)
+            if limiter is None:
+                limiter = NotionRateLimiter()
+                self._rate_limiters[self._token_key] = limiter
+            return limiter
+    
+    def _request(self, method: str, path: str, timeout: int = 10, **kwargs):
+        """속도 제한 및 429/Retry-After 처리를 포함한 Notion API 요청"""
+        import requests
+        
+        limiter = self._get_rate_limiter()
+        response = None
+        for attempt in range(self.MAX_RETRIES + 1):
+            limiter.acquire()
+            response = requests.request(
+                method,
+                f"{self.base_url}{path}",
+                headers=self.headers,
+                timeout=timeout,
+                **kwargs
+            )
+            if response.status_code != 429 or attempt == self.MAX_RETRIES:
+                return response
+            
+            try:
+                retry_after = float(response.headers.get('Retry-After', ''))
+            except (TypeError, ValueError):
+                retry_after = 2 ** attempt
+            print(f"⏳ [NOTION API] Rate limited, retrying in {retry_after}s ({attempt + 1}/{self.MAX_RETRIES})")
+            limiter.pause(retry_after)
+        return response
+    
+    @staticmethod
+    def _resolve_date_property(properties: Dict) -> Optional[str]:
+        """스키마에서 첫 번째 date 타입 프로퍼티 이름 찾기"""
+        for prop_name, prop_data in (properties or {}).items():
+            if prop_data.get('type') == 'date':
+                return prop_name
+        return None
+    
+    def _cache_schema(self, database: Dict) -> Dict:
+        """데이터베이스 객체(search 결과 또는 GET /databases 응답)를 스키마 캐시에 저장"""
+        properties = database.get('properties', {}) or {}
+        entry = {
+            'properties': properties,
+            'date_property': self._resolve_date_property(properties),
+            'last_edited_time': database.get('last_edited_time'),
+            'cached_at': time.time()
+        }
+        with self._schema_cache_lock:
+            self._schema_cache.setdefault(self._token_key, {})[database['id']] = entry
+        return entry
+    
+    def _get_cached_schema(self, database_id: str) -> Optional[Dict]:
+        """TTL 내의 캐시된 스키마 반환 (만료 시 제거)"""
+        with self._schema_cache_lock:
+            token_cache = self._schema_cache.get(self._token_key, {})
+            entry = token_cache.get(database_id)
+            if entry and time.time() - entry['cached_at'] > self.SCHEMA_CACHE_TTL:
+                token_cache.pop(database_id, None)
+                entry = None
+        return entry
+    
+    def get_database_schema(self, database_id: str) -> Optional[Dict]:
+        """데이터베이스 스키마 조회 (캐시 우선, 없으면 GET /databases/{id})"""
+        entry = self._get_cached_schema(database_id)
+        if entry:
+            return entry
+        
+        schema_response = self._request('GET', f"/databases/{database_id}", timeout=10)
+        if schema_response.status_code != 200:
+            print(f"⚠️ Database schema check failed for {database_id}: {schema_response.status_code}")
+            print(f"Response: {schema_response.text}")
+            return None
+        
+        entry = self._cache_schema(schema_response.json())
+        print(f"✅ Database {database_id} has {len(entry['properties'])} properties")
+        return entry
+    
+    def invalidate_schema(self, database_id: str = None):
+        """스키마 캐시 무효화 (database_id가 없으면 토큰 전체)"""
+        with self._schema_cache_lock:
+            if database_id:
+                self._schema_cache.get(self._token_key, {}).pop(database_id, None)
+            else:
+                self._schema_cache.pop(self._token_key, None)
+    
+    def _refresh_schema_cache(self, databases: List[Dict]):
+        """search 결과로 캐시 갱신 - last_edited_time이 바뀐 데이터베이스만 교체"""
+        for db in databases:
+            if not db.get('id'):
+                continue
+            cached = self._get_cached_schema(db['id'])
+            if cached and cached.get('last_edited_time') == db.get('last_edited_time'):
+                continue
+            self._cache_schema(db)
+    
+    def get_date_property(self, database: Dict) -> Optional[str]:
+        """데이터베이스의 date 프로퍼티 이름 (캐시 재사용)"""
+        entry = self._get_cached_schema(database.get('id', ''))
+        if entry and entry.get('last_edited_time') == database.get('last_edited_time'):
+            return entry.get('date_property')
+        return self._resolve_date_property(database.get('properties', {}))
     
     def search_databases(self) -> List[Dict]:
         """모든 데이터베이스 검색"""
         try:
-            import requests
-            
             # Searching Notion databases
             
-            response = requests.post(
-                f"{self.base_url}/search",
-                headers=self.headers,
+            response = self._request(
+                'POST',
+                "/search",
                 json={
                     "filter": {
                         "property": "object",
@@ -48,6 +205,8 @@ class NotionAPI:
             if response.status_code == 200:
                 results = response.json().get('results', [])
                 print(f"✅ [NOTION API] Found {len(results)} databases")
+                # search 결과에 스키마가 포함되어 있으므로 캐시 미리 채우기
+                self._refresh_schema_cache(results)
                 return results
             else:
                 print(f"❌ [NOTION API] Database search failed: {response.status_code}")
@@ -58,88 +217,62 @@ class NotionAPI:
             print(f"❌ Error searching databases: {e}")
             return []
     
-    def query_database(self, database_id: str, page_size: int = 50, start_cursor: str = None) -> Dict:
-        """데이터베이스의 페이지들 조회 (페이지네이션 지원)"""
+    def query_database(self, database_id: str, page_size: int = 50, start_cursor: str = None,
+                       last_edited_after: str = None) -> Dict:
+        """데이터베이스의 페이지들 조회 (페이지네이션 지원)
+
+        last_edited_after가 주어지면 그 시각 이후 수정된 페이지만 조회 (증분 동기화)
+        """
         try:
-            import requests
-            from datetime import datetime, timedelta
-            
-            # 먼저 데이터베이스 스키마 확인 (방어 로직)
+            # 데이터베이스 스키마 확인 (방어 로직) - 캐시된 스키마를 모든 커서 페이지에서 재사용
+            schema_entry = None
             try:
-                schema_response = requests.get(
-                    f"{self.base_url}/databases/{database_id}",
-                    headers=self.headers,
-                    timeout=10
-                )
-                if schema_response.status_code != 200:
-                    print(f"⚠️ Database schema check failed for {database_id}: {schema_response.status_code}")
-                    print(f"Response: {schema_response.text}")
-                    return {'results': [], 'has_more': False, 'next_cursor': None, 'total_count': 0}
-                    
-                schema = schema_response.json()
-                properties = schema.get('properties', {})
-                print(f"✅ Database {database_id} has {len(properties)} properties")
-                
+                schema_entry = self.get_database_schema(database_id)
+                if schema_entry is None:
+                    return {'results': [], 'has_more': False, 'next_cursor': None, 'total_count': 0, 'error': True}
             except Exception as schema_error:
                 print(f"⚠️ Could not check database schema for {database_id}: {schema_error}")
                 # Continue with query anyway
             
-            # 최근 3개월 데이터만 가져오기 (성능 최적화)
-            three_months_ago = (datetime.now() - timedelta(days=90)).isoformat()
-            
             # 안전한 쿼리 - 스키마 확인 후 정렬 설정
             query_payload = {
                 "page_size": page_size
             }
             
             # 스키마에서 날짜 프로퍼티가 있는지 확인하고 있으면 정렬에 사용
-            try:
-                if 'schema' in locals() and 'properties' in locals():
-                    # 날짜 타입 프로퍼티 찾기
-                    date_property_name = None
-                    for prop_name, prop_data in properties.items():
-                        if prop_data.get('type') == 'date':
-                            date_property_name = prop_name
-                            break
-                    
-                    if date_property_name:
-                        # 날짜 프로퍼티로 정렬
-                        query_payload["sorts"] = [
-                            {
-                                "property": date_property_name,
-                                "direction": "descending"
-                            }
-                        ]
-                        print(f"✅ Using date property '{date_property_name}' for sorting")
-                    else:
-                        # 날짜 프로퍼티가 없으면 timestamp로 정렬
-                        query_payload["sorts"] = [
-                            {
-                                "timestamp": "last_edited_time",
-                                "direction": "descending"
-                            }
-                        ]
-                        # Using last_edited_time for sorting
-                else:
-                    # 스키마 확인 실패시 안전한 기본값
-                    query_payload["sorts"] = [
-                        {
-                            "timestamp": "last_edited_time",
-                            "direction": "descending"
-                        }
-                    ]
-                    print("⚠️ Schema not available, using last_edited_time for sorting")
-            except Exception as sort_error:
-                print(f"⚠️ Error setting up sort: {sort_error}")
-                # 정렬 없이 진행
-                pass
+            date_property_name = schema_entry.get('date_property') if schema_entry else None
+            if date_property_name:
+                # 날짜 프로퍼티로 정렬
+                query_payload["sorts"] = [
+                    {
+                        "property": date_property_name,
+                        "direction": "descending"
+                    }
+                ]
+            else:
+                # 날짜 프로퍼티가 없거나 스키마 확인 실패시 timestamp로 정렬
+                query_payload["sorts"] = [
+                    {
+                        "timestamp": "last_edited_time",
+                        "direction": "descending"
+                    }
+                ]
+            
+            # 증분 동기화: 워터마크 이후 수정된 페이지만 조회
+            if last_edited_after:
+                query_payload["filter"] = {
+                    "timestamp": "last_edited_time",
+                    "last_edited_time": {
+                        "on_or_after": last_edited_after
+                    }
+                }
             
             if start_cursor:
                 query_payload["start_cursor"] = start_cursor
             
-            response = requests.post(
-                f"{self.base_url}/databases/{database_id}/query",
-                headers=self.headers,
+            response = self._request(
+                'POST',
+                f"/databases/{database_id}/query",
                 json=query_payload,
                 timeout=30  # 타임아웃 증가
             )
@@ -158,6 +291,8 @@ class NotionAPI:
                 
                 # 400 에러인 경우 더 자세한 분석
                 if response.status_code == 400:
+                    # 스키마가 변경되었을 수 있으므로 캐시 무효화
+                    self.invalidate_schema(database_id)
                     try:
                         error_data = response.json()
                         error_code = error_data.get('code')
@@ -171,7 +306,7 @@ class NotionAPI:
                     except Exception as parse_error:
                         print(f"Could not parse error response: {parse_error}")
                 
-                return {'results': [], 'has_more': False, 'next_cursor': None, 'total_count': 0}
+                return {'results': [], 'has_more': False, 'next_cursor': None, 'total_count': 0, 'error': True}
                 
         except Exception as e:
             print(f"❌ Error querying database {database_id}: {e}")
@@ -192,7 +327,7 @@ class NotionAPI:
                 print(f"🔒 Database {database_id} access denied")
                 self._add_to_blacklist(database_id, "access_denied")
                 
-            return {'results': [], 'has_more': False, 'next_cursor': None, 'total_count': 0}
+            return {'results': [], 'has_more': False, 'next_cursor': None, 'total_count': 0, 'error': True}
     
     def _add_to_blacklist(self, database_id: str, reason: str):
         """문제 있는 데이터베이스를 블랙리스트에 추가"""
@@ -203,13 +338,74 @@ class NotionAPI:
         """데이터베이스가 블랙리스트에 있는지 확인"""
         return database_id in self.blacklisted_databases
     
-    def query_database_safe(self, database_id: str, page_size: int = 50, start_cursor: str = None) -> Dict:
+    def query_database_safe(self, database_id: str, page_size: int = 50, start_cursor: str = None,
+                            last_edited_after: str = None) -> Dict:
         """안전한 데이터베이스 쿼리 - 블랙리스트 확인"""
         if self._is_blacklisted(database_id):
             print(f"⏭️ Skipping blacklisted database {database_id}")
-            return {'results': [], 'has_more': False, 'next_cursor': None, 'total_count': 0}
+            return {'results': [], 'has_more': False, 'next_cursor': None, 'total_count': 0, 'error': True}
+        
+        return self.query_database(database_id, page_size, start_cursor, last_edited_after)
+    
+    def iter_database_pages(self, database_ids: List[str], page_size: int = 50,
+                            watermarks: Dict[str, str] = None, max_workers: int = None):
+        """여러 데이터베이스를 병렬로 페이지네이션하며 결과를 도착 순서대로 반환
         
-        return self.query_database(database_id, page_size, start_cursor)
+        (database_id, result, finished) 튜플을 yield 하며, finished는 해당 데이터베이스의
+        마지막 결과임을 뜻함. 호출자가 중간에 순회를 멈추면 남은 작업은 취소됨.
+        요청 속도는 토큰별 속도 제한기가 모든 워커에 걸쳐 제어함.
+        """
+        import queue
+        from concurrent.futures import ThreadPoolExecutor
+        
+        if not database_ids:
+            return
+        
+        watermarks = watermarks or {}
+        workers = max(1, min(max_workers or self.MAX_CONCURRENT_DATABASES, len(database_ids)))
+        results = queue.Queue(maxsize=workers * 2)
+        stop = threading.Event()
+        
+        def put(item) -> bool:
+            # 소비자가 멈춘 경우 워커가 영원히 블록되지 않도록 주기적으로 stop 확인
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def fetch_database(database_id: str):
+            start_cursor = None
+            try:
+                while not stop.is_set():
+                    result = self.query_database_safe(
+                        database_id, page_size, start_cursor, watermarks.get(database_id)
+                    )
+                    finished = not result.get('results') or not result.get('has_more', False)
+                    if not put((database_id, result, finished)) or finished:
+                        return
+                    start_cursor = result.get('next_cursor')
+            except Exception as e:
+                print(f"❌ Error fetching database {database_id}: {e}")
+                put((database_id, {'results': [], 'has_more': False, 'next_cursor': None,
+                                   'total_count': 0, 'error': True}, True))
+        
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='notion-fetch')
+        try:
+            for database_id in database_ids:
+                executor.submit(fetch_database, database_id)
+            
+            remaining = len(database_ids)
+            while remaining:
+                database_id, result, finished = results.get()
+                if finished:
+                    remaining -= 1
+                yield database_id, result, finished
+        finally:
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
 
 
 # Notion 캘린더 동기화 클래스
@@ -329,8 +525,8 @@ class NotionCalendarSync:
                 calendar_dbs.append(db)
                 # Found calendar database
             
-            # 날짜 속성이 있는지 체크
-            elif self._has_date_property(db):
+            # 날짜 속성이 있는지 체크 (스키마 캐시 재사용)
+            elif notion_api.get_date_property(db):
                 calendar_dbs.append(db)
                 # Found database with date property
         
@@ -406,8 +602,12 @@ class NotionCalendarSync:
             print(f"❌ [CALENDAR_ID] Error creating default calendar: {e}")
             return None
 
-    def sync_to_calendar(self, user_id: str, calendar_id: str = None) -> Dict[str, Any]:
-        """Notion 데이터를 NotionFlow 캘린더로 동기화 - 배치 처리 최적화"""
+    def sync_to_calendar(self, user_id: str, calendar_id: str = None, full_resync: bool = False) -> Dict[str, Any]:
+        """Notion 데이터를 NotionFlow 캘린더로 동기화 - 배치 처리 최적화
+
+        데이터베이스별 워터마크(last_edited_time) 이후 수정된 페이지만 가져옴.
+        full_resync=True면 워터마크를 무시하고 전체 페이지를 다시 읽음.
+        """
         try:
             # If no calendar_id provided, get it from database
             if not calendar_id:
@@ -450,76 +650,77 @@ class NotionCalendarSync:
                     'synced_events': 0
                 }
 
-            # 4. 배치 처리로 이벤트 추출 및 동기화
+            # 4. 데이터베이스별 워터마크 로드 (증분 동기화)
+            watermarks = {} if full_resync else self._load_sync_watermarks(user_id, calendar_id)
+            if watermarks:
+                print(f"🕒 [INCREMENTAL] Loaded watermarks for {len(watermarks)} databases")
+
+            # 5. 여러 데이터베이스를 병렬로 조회하며 배치 처리로 이벤트 추출 및 동기화
             total_synced = 0
             max_initial_load = 50  # 배치 처리로 처리량 증가
             batch_size = 10  # 배치 크기
-            batch_events = []  # 배치 저장용 임시 리스트
-
-            for db in calendar_dbs:
-                db_id = db['id']
-                db_title = self._get_db_title(db)
-
-                # Processing database in batches
-
-                # 페이지네이션으로 페이지들 조회
-                start_cursor = None
-                db_synced = 0
 
-                while True:
-                    # 한 번에 25개씩 처리 (배치 처리로 효율성 증가)
-                    result = notion_api.query_database_safe(db_id, page_size=25, start_cursor=start_cursor)
-                    pages = result.get('results', [])
+            # 데이터베이스별 상태 (배치, 워터마크 후보, 저장 실패 여부)
+            db_states = {
+                db['id']: {
+                    'title': self._get_db_title(db),
+                    'watermark': watermarks.get(db['id']),
+                    'newest_edit': watermarks.get(db['id']),
+                    'batch': [],
+                    'synced': 0,
+                    'save_failed': False
+                }
+                for db in calendar_dbs
+            }
 
-                    if not pages:
-                        break
+            # 한 번에 25개씩 처리 (배치 처리로 효율성 증가)
+            for db_id, query_result, finished in notion_api.iter_database_pages(
+                list(db_states.keys()), page_size=25, watermarks=watermarks
+            ):
+                state = db_states[db_id]
+                pages = query_result.get('results', [])
 
-                    print(f"📄 Processing {len(pages)} pages from {db_title}")
+                if pages:
+                    print(f"📄 Processing {len(pages)} pages from {state['title']}")
 
-                    # 배치 처리 방식으로 메모리 효율성 및 DB 연결 최적화
-                    for page in pages:
-                        # Notion 페이지를 캘린더 이벤트로 변환
-                        event = self._convert_page_to_event(page, calendar_id, user_id)
-                        if event:
-                            batch_events.append(event)
+                # 배치 처리 방식으로 메모리 효율성 및 DB 연결 최적화
+                for page in pages:
+                    state['newest_edit'] = self._newer_timestamp(state['newest_edit'], page.get('last_edited_time'))
 
-                        # 배치가 찼거나 마지막 페이지면 저장
-                        if len(batch_events) >= batch_size:
-                            saved_count = self._save_events_batch(batch_events)
-                            total_synced += saved_count
-                            db_synced += saved_count
-                            print(f"💾 [BATCH] Saved {saved_count}/{len(batch_events)} events")
-                            batch_events.clear()  # 배치 초기화
+                    # Notion 페이지를 캘린더 이벤트로 변환
+                    event = self._convert_page_to_event(page, calendar_id, user_id)
+                    if event:
+                        state['batch'].append(event)
 
-                        # 초기 로드 제한 확인
-                        if total_synced >= max_initial_load:
-                            print(f"⚡ Initial load limit reached ({max_initial_load} events). Breaking early.")
-                            break
+                    # 배치가 찼으면 저장
+                    if len(state['batch']) >= batch_size:
+                        total_synced += self._flush_db_batch(state, '[BATCH]')
 
                     # 초기 로드 제한 확인
                     if total_synced >= max_initial_load:
-                        print(f"⚡ Initial load limit reached ({max_initial_load} events). Remaining data will be synced in background.")
+                        print(f"⚡ Initial load limit reached ({max_initial_load} events). Breaking early.")
                         break
 
-                    # 다음 페이지가 있는지 확인
-                    if not result.get('has_more', False):
-                        break
+                # 초기 로드 제한에 도달했으면 남은 조회 취소
+                if total_synced >= max_initial_load:
+                    print(f"⚡ Initial load limit reached ({max_initial_load} events). Remaining data will be synced in background.")
+                    break
 
-                    start_cursor = result.get('next_cursor')
+                if finished:
+                    # 남은 배치 이벤트들 저장
+                    total_synced += self._flush_db_batch(state, '[BATCH FINAL]')
 
-                # 남은 배치 이벤트들 저장
-                if batch_events:
-                    saved_count = self._save_events_batch(batch_events)
-                    total_synced += saved_count
-                    db_synced += saved_count
-                    print(f"💾 [BATCH FINAL] Saved final {saved_count}/{len(batch_events)} events")
-                    batch_events.clear()
+                    # 전체 페이지를 문제없이 처리한 경우에만 워터마크 갱신
+                    db_completed = not query_result.get('has_more', False) and not query_result.get('error')
+                    if (db_completed and not state['save_failed'] and state['newest_edit']
+                            and state['newest_edit'] != state['watermark']):
+                        self._save_sync_watermark(user_id, calendar_id, db_id, state['newest_edit'])
 
-                print(f"📊 Database {db_title}: {db_synced} events synced")
+                    print(f"📊 Database {state['title']}: {state['synced']} events synced")
 
-                # 초기 로드 제한에 도달했으면 중단
-                if total_synced >= max_initial_load:
-                    break
+            # 중간에 멈춘 경우 남은 배치 이벤트들 저장 (워터마크는 갱신하지 않음)
+            for state in db_states.values():
+                total_synced += self._flush_db_batch(state, '[BATCH FINAL]')
 
             result = {
                 'success': True,
@@ -533,7 +734,7 @@ class NotionCalendarSync:
             # 초기 로드 제한에 도달한 경우 백그라운드에서 나머지 동기화 예약
             if total_synced >= max_initial_load:
                 try:
-                    self._schedule_background_sync(user_id, calendar_id, token)
+                    self._schedule_background_sync(user_id, calendar_id, token, full_resync)
                     result['background_sync_scheduled'] = True
                 except Exception as bg_error:
                     print(f"⚠️ Failed to schedule background sync: {bg_error}")
@@ -565,17 +766,6 @@ class NotionCalendarSync:
         except:
             return 'Untitled'
     
-    def _has_date_property(self, database: Dict) -> bool:
-        """데이터베이스에 날짜 속성이 있는지 확인"""
-        try:
-            properties = database.get('properties', {})
-            for prop_name, prop_data in properties.items():
-                if prop_data.get('type') == 'date':
-                    return True
-            return False
-        except:
-            return False
-    
     def _convert_page_to_event(self, page: Dict, calendar_id: str, user_id: str) -> Optional[Dict]:
         """Notion 페이지를 NotionFlow 이벤트로 변환"""
         try:
@@ -617,6 +807,10 @@ class NotionCalendarSync:
                 }
             }
             
+            # 6. 내용 해시 (변경 없는 이벤트는 저장 생략)
+            from utils.event_writer import compute_content_hash
+            event['content_hash'] = compute_content_hash(event)
+            
             return event
             
         except Exception as e:
@@ -867,248 +1061,51 @@ class NotionCalendarSync:
             print(f"❌ [PRIMARY_CAL] Error getting primary calendar ID: {e}")
             return None
 
-    def _save_event_to_calendar(self, event: Dict) -> bool:
-        """이벤트를 NotionFlow 캘린더에 저장"""
-        try:
-            from utils.config import config
-            from flask import session
-            
-            # Use admin client to bypass RLS policies
-            supabase = config.supabase_admin if hasattr(config, 'supabase_admin') and config.supabase_admin else config.get_client_for_user(event['user_id'])
-            
-            if not supabase:
-                print("❌ Supabase client not available")
-                return False
-            
-            # UUID 정규화
-            user_id = self._normalize_uuid(event['user_id'])
-            event['user_id'] = user_id  # 정규화된 UUID로 업데이트
-            try:
-                # Check if user exists in users table
-                user_check = supabase.table('users').select('id').eq('id', user_id).execute()
-                
-                if not user_check.data:
-                    # Creating user record
-                    # Get user email from session or platform tokens
-                    user_email = session.get('user_email')
-                    if not user_email:
-                        # Try to get from platform tokens in session
-                        platform_tokens = session.get('platform_tokens', {})
-                        notion_info = platform_tokens.get('notion', {})
-                        user_email = notion_info.get('user_email') or f'{user_id[:8]}@notionflow.app'
-                    
-                    # Create user using proper helper function
-                    from utils.uuid_helper import ensure_auth_user_exists
-                    if ensure_auth_user_exists(user_id, user_email, 'Notion User'):
-                        # User record created/verified
-                        pass
-                    else:
-                        print("Error: Failed to create user record")
-                        return False
-                else:
-                    # User record verified
-                    pass
-            except Exception as user_e:
-                print(f"Error: Critical user error - {user_e}")
-                return False
-            
-            # 실제 데이터베이스 스키마에 맞게 이벤트 데이터 변환
-            db_event = {
-                'user_id': event['user_id'],
-                'title': event['title'],
-                'description': event.get('description', ''),
-                'start_datetime': event['start_datetime'],
-                'end_datetime': event['end_datetime'],
-                'is_all_day': event.get('all_day', False),
-                'category': 'notion',  # 실제 스키마 필드명
-                'priority': 1,  # integer 타입 (0=low, 1=medium, 2=high)
-                'status': 'confirmed',
-                'source_platform': 'notion',  # 실제 스키마 필드명
-                'external_id': event['external_id']  # 실제 스키마 필드명
-                # created_at, updated_at는 DEFAULT NOW()로 자동 설정
-            }
-            
-            # CRITICAL FIX: calendar_id 설정 (항상 설정되어야 함)
-            if 'calendar_id' in event and event['calendar_id']:
-                db_event['calendar_id'] = event['calendar_id']
-                # Using event calendar_id
-            else:
-                # calendar_id가 없으면 사용자의 첫 번째 캘린더로 설정
-                # Getting primary calendar for event
-                
-                # Get user's primary calendar
-                primary_calendar_id = self._get_user_primary_calendar_id(user_id)
-                if primary_calendar_id:
-                    db_event['calendar_id'] = primary_calendar_id
-                    # Using primary calendar
-                else:
-                    print(f"Warning: No calendar found for user {user_id}")
-                    # Don't save orphaned events
-                    return False
-            
-            # ULTRA-CRITICAL: Final datetime validation with timezone awareness
-            from datetime import datetime, timedelta, timezone
-            try:
-                # Parse with proper timezone handling
-                start_str = db_event['start_datetime']
-                end_str = db_event['end_datetime']
-                
-                # Final date validation
-                
-                # Handle various timezone formats in the final check
-                if start_str.endswith('Z'):
-                    start_dt = datetime.fromisoformat(start_str.replace('Z', '+00:00'))
-                    end_dt = datetime.fromisoformat(end_str.replace('Z', '+00:00'))
-                elif '+' in start_str or '-' in start_str[-6:]:
-                    start_dt = datetime.fromisoformat(start_str)
-                    end_dt = datetime.fromisoformat(end_str)
-                else:
-                    start_dt = datetime.fromisoformat(start_str + '+00:00')
-                    end_dt = datetime.fromisoformat(end_str + '+00:00')
-                
-                # Date parsing validation
-                
-                # Convert to UTC for reliable comparison
-                start_utc = start_dt.astimezone(timezone.utc) if start_dt.tzinfo else start_dt
-                end_utc = end_dt.astimezone(timezone.utc) if end_dt.tzinfo else end_dt
-                
-                # UTC time comparison validation
-                
-                # ABSOLUTE CONSTRAINT VIOLATION CHECK
-                if end_utc <= start_utc:
-                    # Critical: fixing constraint violation
-                    
-                    # Force minimum duration based on event type
-                    if db_event.get('is_all_day', False):
-                        # All-day: 24 hours minimum
-                        end_dt = start_dt + timedelta(days=1)
-                        # Fixed all-day event duration
-                    else:
-                        # Timed: 2 hours minimum (extra safe)
-                        end_dt = start_dt + timedelta(hours=2)
-                        # Fixed timed event duration
-                    
-                    db_event['end_datetime'] = end_dt.isoformat()
-                    # Constraint violation fixed
-                
-                # Triple-check: verify the fix worked
-                final_start = datetime.fromisoformat(db_event['start_datetime'].replace('Z', '+00:00') if 'Z' in db_event['start_datetime'] else db_event['start_datetime'])
-                final_end = datetime.fromisoformat(db_event['end_datetime'].replace('Z', '+00:00') if 'Z' in db_event['end_datetime'] else db_event['end_datetime'])
-                
-                if final_start.tzinfo:
-                    final_start_utc = final_start.astimezone(timezone.utc)
-                    final_end_utc = final_end.astimezone(timezone.utc)
-                else:
-                    final_start_utc, final_end_utc = final_start, final_end
-                
-                if final_end_utc <= final_start_utc:
-                    # Using emergency time fallback
-                    now = datetime.now(timezone.utc)
-                    db_event['start_datetime'] = now.isoformat()
-                    db_event['end_datetime'] = (now + timedelta(hours=3)).isoformat()
-                
-                # Event times validated
-                    
-            except Exception as e:
-                print(f"Error: Date validation failed - {e}")
-                # Emergency fallback: guaranteed safe times
-                now = datetime.now(timezone.utc)
-                db_event['start_datetime'] = now.isoformat()
-                db_event['end_datetime'] = (now + timedelta(hours=3)).isoformat()
-                # Emergency fallback applied
-            
-            # Saving event to database
-            
-            # 중복 체크 (실제 스키마의 unique constraint에 맞춤: user_id, external_id, source_platform)
-            try:
-                existing = supabase.table('calendar_events').select('id').eq(
-                    'user_id', event['user_id']
-                ).eq('external_id', event['external_id']).eq(
-                    'source_platform', 'notion'
-                ).execute()
-                
-                if existing.data:
-                    # 기존 이벤트 업데이트
-                    # Updating existing event
-                    result = supabase.table('calendar_events').update({
-                        'title': db_event['title'],
-                        'description': db_event['description'],
-                        'start_datetime': db_event['start_datetime'],
-                        'end_datetime': db_event['end_datetime'],
-                        'is_all_day': db_event['is_all_day'],
-                        'updated_at': datetime.now().isoformat()  # 동적으로 현재 시간 설정
-                    }).eq('id', existing.data[0]['id']).execute()
-                    print(f"✅ Updated existing event: {db_event['title']}")
-                else:
-                    # 새 이벤트 생성
-                    # Creating new event
-                    result = supabase.table('calendar_events').insert(db_event).execute()
-                    print(f"✅ Created new event: {db_event['title']}")
-                
-                return bool(result.data)
-            except Exception as save_error:
-                print(f"Error saving event '{db_event['title']}': {save_error}")
-                return False
-            
-        except Exception as e:
-            print(f"❌ Error saving event: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
+    def _save_events_batch(self, events: List[Dict]) -> Dict[str, int]:
+        """배치로 이벤트들을 NotionFlow 캘린더에 저장 - chunk당 한 번의 bulk upsert
 
-    def _save_events_batch(self, events: List[Dict]) -> int:
-        """배치로 이벤트들을 NotionFlow 캘린더에 저장 - DB 연결 최적화"""
+        (user_id, external_id, source_platform) 기준으로 upsert하며
+        created/updated/unchanged/failed 개수를 반환
+        """
+        counts = {'created': 0, 'updated': 0, 'unchanged': 0, 'failed': 0}
         if not events:
-            return 0
+            return counts
 
         try:
             from utils.config import config
-            from datetime import datetime, timezone
+            from utils.event_writer import bulk_upsert_events
 
             # Use admin client to bypass RLS policies
             supabase = config.supabase_admin if hasattr(config, 'supabase_admin') and config.supabase_admin else config.get_client_for_user(events[0]['user_id'])
 
             if not supabase:
                 print("❌ [BATCH] Supabase client not available")
-                return 0
-
-            saved_count = 0
-            batch_data = []
-            update_data = []
+                counts['failed'] = len(events)
+                return counts
 
             print(f"💾 [BATCH] Processing {len(events)} events")
 
-            # 1. 중복 체크를 위한 기존 이벤트 조회 (한 번의 쿼리로)
-            user_id = self._normalize_uuid(events[0]['user_id'])
-            external_ids = [event['external_id'] for event in events]
-
-            existing_result = supabase.table('calendar_events').select('id, external_id').eq(
-                'user_id', user_id
-            ).eq('source_platform', 'notion').in_('external_id', external_ids).execute()
-
-            existing_external_ids = {item['external_id']: item['id'] for item in existing_result.data} if existing_result.data else {}
-
-            print(f"🔍 [BATCH] Found {len(existing_external_ids)} existing events to update")
-
-            # 2. 이벤트별로 처리 (새로 생성할 것과 업데이트할 것 분리)
+            rows = []
+            primary_calendar_ids = {}
             for event in events:
                 try:
                     # UUID 정규화
                     user_id = self._normalize_uuid(event['user_id'])
                     event['user_id'] = user_id
 
-                    # CRITICAL FIX: calendar_id 반드시 설정
+                    # CRITICAL FIX: calendar_id 반드시 설정 (사용자별 한 번만 조회)
                     if not event.get('calendar_id'):
-                        primary_calendar_id = self._get_user_primary_calendar_id(user_id)
-                        if primary_calendar_id:
-                            event['calendar_id'] = primary_calendar_id
-                            print(f"🎯 [BATCH] Auto-assigned calendar_id: {primary_calendar_id}")
+                        if user_id not in primary_calendar_ids:
+                            primary_calendar_ids[user_id] = self._get_user_primary_calendar_id(user_id)
+                        if primary_calendar_ids[user_id]:
+                            event['calendar_id'] = primary_calendar_ids[user_id]
                         else:
                             print(f"⚠️ [BATCH] No calendar found for user {user_id}, skipping event")
+                            counts['failed'] += 1
                             continue
 
                     # 실제 데이터베이스 스키마에 맞게 이벤트 데이터 변환
-                    db_event = {
+                    rows.append({
                         'user_id': event['user_id'],
                         'calendar_id': event['calendar_id'],  # CRITICAL: 항상 설정
                         'title': event['title'],
@@ -1120,132 +1117,92 @@ class NotionCalendarSync:
                         'priority': 1,
                         'status': 'confirmed',
                         'source_platform': 'notion',
-                        'external_id': event['external_id']
-                    }
-
-                    # 기존 이벤트인지 확인
-                    if event['external_id'] in existing_external_ids:
-                        # 업데이트용 데이터 준비
-                        db_event['updated_at'] = datetime.now().isoformat()
-                        update_data.append({
-                            'id': existing_external_ids[event['external_id']],
-                            'data': db_event
-                        })
-                    else:
-                        # 새 이벤트용 데이터 준비
-                        batch_data.append(db_event)
+                        'external_id': event['external_id'],
+                        'content_hash': event.get('content_hash')
+                    })
 
                 except Exception as event_error:
                     print(f"❌ [BATCH] Error processing event {event.get('title', 'Unknown')}: {event_error}")
+                    counts['failed'] += 1
                     continue
 
-            # 3. 배치 삽입 (새 이벤트들)
-            if batch_data:
-                try:
-                    insert_result = supabase.table('calendar_events').insert(batch_data).execute()
-                    inserted_count = len(insert_result.data) if insert_result.data else 0
-                    saved_count += inserted_count
-                    print(f"✅ [BATCH INSERT] Created {inserted_count} new events")
-                except Exception as insert_error:
-                    print(f"❌ [BATCH INSERT] Failed: {insert_error}")
-
-            # 4. 배치 업데이트 (기존 이벤트들) - 개별적으로 처리
-            updated_count = 0
-            for update_item in update_data:
-                try:
-                    # Remove id and updated_at from data for update
-                    update_data_clean = {k: v for k, v in update_item['data'].items() if k not in ['id', 'created_at']}
-                    update_result = supabase.table('calendar_events').update(update_data_clean).eq('id', update_item['id']).execute()
-                    if update_result.data:
-                        updated_count += 1
-                except Exception as update_error:
-                    print(f"❌ [BATCH UPDATE] Failed for event {update_item['id']}: {update_error}")
-
-            saved_count += updated_count
-            print(f"✅ [BATCH UPDATE] Updated {updated_count} existing events")
+            written = bulk_upsert_events(supabase, rows)
+            for key, value in written.items():
+                counts[key] += value
 
-            print(f"💾 [BATCH COMPLETE] Total saved: {saved_count}/{len(events)} events")
-            return saved_count
+            print(f"💾 [BATCH COMPLETE] created={counts['created']} updated={counts['updated']} "
+                  f"unchanged={counts['unchanged']} failed={counts['failed']} ({len(events)} events)")
+            return counts
 
         except Exception as e:
             print(f"❌ [BATCH] Error saving batch: {e}")
             import traceback
             traceback.print_exc()
+            counts['failed'] = len(events)
+            return counts
+
+    def _flush_db_batch(self, state: Dict, label: str) -> int:
+        """데이터베이스별 배치 이벤트 저장 후 상태 갱신 - 처리된(생성/수정/변경없음) 이벤트 수 반환"""
+        batch = state['batch']
+        if not batch:
             return 0
 
+        counts = self._save_events_batch(batch)
+        processed = counts['created'] + counts['updated'] + counts['unchanged']
+        state['synced'] += processed
+        state['save_failed'] = state['save_failed'] or counts['failed'] > 0
+        print(f"💾 {label} Saved {processed}/{len(batch)} events "
+              f"(created={counts['created']}, updated={counts['updated']}, unchanged={counts['unchanged']})")
+        batch.clear()
+        return processed
+
     def _schedule_cache_warmup(self, user_id: str, calendar_id: str):
         """PERFORMANCE: 캐시 워밍업을 위한 백그라운드 프리로딩 예약"""
         try:
-            import threading
-            import time
+            from utils.background_executor import submit_background
 
             def cache_warmup_worker():
                 try:
-                    # 3초 후 캐시 워밍업 실행 (UI 응답성 확보)
-                    time.sleep(3)
                     print(f"🚀 [CACHE WARMUP] Starting for user {user_id}")
 
-                    # 캐시용 이벤트 조회 및 저장
-                    from utils.config import config
-                    supabase = config.supabase_admin if hasattr(config, 'supabase_admin') and config.supabase_admin else config.get_client_for_user(user_id)
-
-                    if supabase:
-                        # 향후 30일간의 이벤트를 미리 캐시
-                        from datetime import datetime, timedelta, timezone
-                        start_date = datetime.now(timezone.utc)
-                        end_date = start_date + timedelta(days=30)
-
-                        # 캐시 테이블에 이벤트 정보 저장 (미래 확장용)
-                        cache_result = supabase.table('calendar_events').select('id, title, start_datetime, end_datetime').eq(
-                            'user_id', user_id
-                        ).eq('calendar_id', calendar_id).gte(
-                            'start_datetime', start_date.isoformat()
-                        ).lte(
-                            'start_datetime', end_date.isoformat()
-                        ).execute()
-
-                        cached_count = len(cache_result.data) if cache_result.data else 0
-                        print(f"✅ [CACHE WARMUP] Cached {cached_count} events for faster access")
+                    # 캘린더 뷰가 요청하는 것과 같은 창(365일)으로 이벤트 캐시를 채움
+                    from utils.dashboard_data import dashboard_data
+                    events = dashboard_data.get_user_calendar_events(
+                        user_id, days_ahead=365, calendar_ids=[calendar_id]
+                    )
+                    print(f"✅ [CACHE WARMUP] Cached {len(events)} events for faster access")
 
                 except Exception as warmup_error:
                     print(f"⚠️ [CACHE WARMUP] Error: {warmup_error}")
 
-            # 백그라운드 스레드로 실행
-            cache_thread = threading.Thread(target=cache_warmup_worker, daemon=True)
-            cache_thread.start()
-            print(f"🎯 [CACHE WARMUP] Scheduled for user {user_id}")
+            # 3초 후 공유 백그라운드 풀에서 실행 (UI 응답성 확보, 같은 캘린더 중복 예약 무시)
+            if submit_background(f"notion-cache-warmup:{user_id}:{calendar_id}", cache_warmup_worker, delay=3):
+                print(f"🎯 [CACHE WARMUP] Scheduled for user {user_id}")
 
         except Exception as e:
             print(f"❌ [CACHE WARMUP] Scheduling failed: {e}")
 
-    def _schedule_background_sync(self, user_id: str, calendar_id: str, access_token: str):
-        """백그라운드에서 나머지 데이터 동기화 예약"""
+    def _schedule_background_sync(self, user_id: str, calendar_id: str, access_token: str,
+                                  full_resync: bool = False):
+        """백그라운드에서 나머지 데이터 동기화 예약 (사용자/캘린더당 하나만 실행)"""
         try:
-            import threading
-            import time
-            
-            def background_sync():
-                # 5초 후 백그라운드에서 나머지 동기화 시작
-                time.sleep(5)
-                # Starting background sync
-                
-                try:
-                    # 전체 동기화 실행 (제한 없이)
-                    self._full_background_sync(user_id, calendar_id, access_token)
-                except Exception as bg_error:
-                    print(f"❌ Background sync failed: {bg_error}")
-            
-            # 백그라운드 스레드로 실행
-            bg_thread = threading.Thread(target=background_sync, daemon=True)
-            bg_thread.start()
-            
-            # Background sync scheduled
+            from utils.background_executor import submit_background
             
+            # 5초 후 공유 백그라운드 풀에서 전체 동기화 (제한 없이)
+            scheduled = submit_background(
+                f"notion-full-sync:{user_id}:{calendar_id}",
+                self._full_background_sync, user_id, calendar_id, access_token, full_resync,
+                delay=5
+            )
+            if not scheduled:
+                print(f"⏭️ Background sync already pending for calendar {calendar_id}")
+
         except Exception as e:
             print(f"❌ Failed to schedule background sync: {e}")
 
-    def _full_background_sync(self, user_id: str, calendar_id: str, access_token: str):
-        """백그라운드에서 전체 데이터 동기화 (제한 없이)"""
+    def _full_background_sync(self, user_id: str, calendar_id: str, access_token: str,
+                              full_resync: bool = False):
+        """백그라운드에서 전체 데이터 동기화 (제한 없이, 워터마크 이후 변경분만)"""
         try:
             # Starting full background sync
             
@@ -1260,66 +1217,106 @@ class NotionCalendarSync:
                 return
             
             total_synced = 0
+            batch_size = 100  # 백그라운드는 한 번의 upsert에 더 많은 이벤트를 묶음
+            watermarks = {} if full_resync else self._load_sync_watermarks(user_id, calendar_id)
+            db_states = {
+                db['id']: {
+                    'title': self._get_db_title(db),
+                    'watermark': watermarks.get(db['id']),
+                    'newest_edit': watermarks.get(db['id']),
+                    'batch': [],
+                    'synced': 0,
+                    'save_failed': False
+                }
+                for db in calendar_dbs
+            }
             
-            for db in calendar_dbs:
-                db_id = db['id']
-                db_title = self._get_db_title(db)
-                
-                # Background processing database
-                
-                # 이미 동기화된 이벤트 확인 (중복 방지)
-                start_cursor = None
+            # 여러 데이터베이스를 병렬로 조회 (속도 제한기가 요청 간격을 조절)
+            for db_id, result, finished in notion_api.iter_database_pages(
+                list(db_states.keys()), page_size=50, watermarks=watermarks
+            ):
+                state = db_states[db_id]
+                for page in result.get('results', []):
+                    state['newest_edit'] = self._newer_timestamp(state['newest_edit'], page.get('last_edited_time'))
+                    event = self._convert_page_to_event(page, calendar_id, user_id)
+                    if event:
+                        state['batch'].append(event)
+                    if len(state['batch']) >= batch_size:
+                        total_synced += self._flush_db_batch(state, '[BACKGROUND]')
                 
-                while True:
-                    result = notion_api.query_database_safe(db_id, page_size=50, start_cursor=start_cursor)
-                    pages = result.get('results', [])
-                    
-                    if not pages:
-                        break
-                    
-                    for page in pages:
-                        # 중복 확인
-                        if not self._is_event_already_synced(page, calendar_id, user_id):
-                            event = self._convert_page_to_event(page, calendar_id, user_id)
-                            
-                            if event and self._save_event_to_calendar(event):
-                                total_synced += 1
-                                if total_synced % 10 == 0:  # 10개마다 로그
-                                    pass  # Background sync progress
-                    
-                    if not result.get('has_more', False):
-                        break
-                    
-                    start_cursor = result.get('next_cursor')
-                    
-                    # 백그라운드 처리 시 메모리 정리 및 부하 방지
-                    import gc
-                    gc.collect()
-                    time.sleep(0.5)
+                if finished:
+                    total_synced += self._flush_db_batch(state, '[BACKGROUND FINAL]')
+                    db_completed = not result.get('has_more', False) and not result.get('error')
+                    if (db_completed and not state['save_failed'] and state['newest_edit']
+                            and state['newest_edit'] != state['watermark']):
+                        self._save_sync_watermark(user_id, calendar_id, db_id, state['newest_edit'])
             
             print(f"✅ Background sync completed: {total_synced} additional events synced")
             
         except Exception as e:
             print(f"❌ Full background sync failed: {e}")
 
-    def _is_event_already_synced(self, notion_page: Dict, calendar_id: str, user_id: str) -> bool:
-        """이벤트가 이미 동기화되었는지 확인"""
+    @staticmethod
+    def _newer_timestamp(current: Optional[str], candidate: Optional[str]) -> Optional[str]:
+        """두 ISO 타임스탬프 중 더 최신 값 반환"""
+        if not candidate:
+            return current
+        if not current:
+            return candidate
+        try:
+            current_dt = datetime.fromisoformat(current.replace('Z', '+00:00'))
+            candidate_dt = datetime.fromisoformat(candidate.replace('Z', '+00:00'))
+            return candidate if candidate_dt > current_dt else current
+        except ValueError:
+            return max(current, candidate)
+
+    def _load_sync_watermarks(self, user_id: str, calendar_id: str) -> Dict[str, str]:
+        """사용자의 데이터베이스별 last_edited_time 워터마크 조회
+
+        다른 캘린더로 동기화했던 워터마크는 무시 (대상 캘린더가 바뀌면 전체 재동기화)
+        """
         try:
             from utils.config import config
-            supabase = config.get_client_for_user(user_id)
-            
-            notion_page_id = notion_page.get('id', '')
-            
-            # 이미 동기화된 이벤트인지 확인 (실제 스키마 필드명 사용)
-            existing = supabase.table('calendar_events').select('id').eq(
-                'user_id', user_id
-            ).eq('external_id', notion_page_id).eq('source_platform', 'notion').execute()
-            
-            return len(existing.data) > 0
-            
+            from utils.uuid_helper import normalize_uuid
+
+            supabase = config.supabase_admin if hasattr(config, 'supabase_admin') and config.supabase_admin else config.get_client_for_user(user_id)
+            if not supabase:
+                return {}
+
+            result = supabase.table('notion_sync_watermarks').select(
+                'database_id, calendar_id, last_edited_time'
+            ).eq('user_id', normalize_uuid(user_id)).execute()
+
+            watermarks = {}
+            for row in result.data or []:
+                if row.get('last_edited_time') and str(row.get('calendar_id')) == str(calendar_id):
+                    watermarks[row['database_id']] = row['last_edited_time']
+            return watermarks
+
         except Exception as e:
-            print(f"❌ Error checking if event already synced: {e}")
-            return False
+            print(f"⚠️ [INCREMENTAL] Could not load watermarks, falling back to full sync: {e}")
+            return {}
+
+    def _save_sync_watermark(self, user_id: str, calendar_id: str, database_id: str, last_edited_time: str):
+        """데이터베이스 동기화 완료 후 워터마크 저장"""
+        try:
+            from utils.config import config
+            from utils.uuid_helper import normalize_uuid
+
+            supabase = config.supabase_admin if hasattr(config, 'supabase_admin') and config.supabase_admin else config.get_client_for_user(user_id)
+            if not supabase:
+                return
+
+            supabase.table('notion_sync_watermarks').upsert({
+                'user_id': normalize_uuid(user_id),
+                'database_id': database_id,
+                'calendar_id': calendar_id,
+                'last_edited_time': last_edited_time,
+                'last_synced_at': datetime.now(timezone.utc).isoformat()
+            }, on_conflict='user_id,database_id').execute()
+
+        except Exception as e:
+            print(f"⚠️ [INCREMENTAL] Could not save watermark for {database_id}: {e}")
 
 
 # 싱글톤 인스턴스
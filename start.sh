@@ -7,8 +7,14 @@ echo "Starting NotionFlow..."
 PORT=${PORT:-8080}
 echo "PORT: $PORT"
 
+# Precompressed static assets + manifest (skipped if the image already has them)
+if [ ! -f frontend/static/asset-manifest.json ]; then
+    python -m utils.static_assets build || echo "Static asset build failed, serving uncompressed assets"
+fi
+
 # Start gunicorn with optimized configuration for Railway
 exec gunicorn frontend.app:app \
+    --config gunicorn_config.py \
     --bind 0.0.0.0:$PORT \
     --workers 1 \
     --timeout 300 \
@@ -0,0 +1,83 @@
+-- Benchmark: get_events_in_range vs. start_datetime filtering as history grows
+-- Run with psql against a database with migration 017 applied:
+--   psql "$DATABASE_URL" -f supabase/benchmarks/event_range_benchmark.sql
+-- Inserts synthetic events for a throwaway user in steps up to 100k rows,
+-- times a one-month window query at each size, and rolls everything back.
+-- Expected: get_events_in_range stays flat (one probe of the
+-- (user_id, time_range) GiST index). The start-only filter is timed for
+-- comparison; it also misses multi-day events that began before the window.
+
+BEGIN;
+
+-- Skip the event_count triggers (013) while generating rows
+SET LOCAL session_replication_role = replica;
+
+CREATE TEMP TABLE bench_results (
+    history_size INTEGER,
+    query TEXT,
+    avg_ms NUMERIC
+) ON COMMIT DROP;
+
+DO $$
+DECLARE
+    v_user UUID := gen_random_uuid();
+    v_calendar UUID := gen_random_uuid();
+    v_sizes INTEGER[] := ARRAY[1000, 10000, 50000, 100000];
+    v_inserted INTEGER := 0;
+    v_size INTEGER;
+    v_runs INTEGER := 50;
+    v_window_start TIMESTAMPTZ := date_trunc('month', NOW());
+    v_window_end TIMESTAMPTZ := date_trunc('month', NOW()) + INTERVAL '1 month';
+    v_started TIMESTAMPTZ;
+    v_count INTEGER;
+    i INTEGER;
+BEGIN
+    FOREACH v_size IN ARRAY v_sizes LOOP
+        -- History spread over the last ~10 years, 1 in 50 events spans several days
+        INSERT INTO calendar_events (
+            user_id, calendar_id, external_id, source_platform, title,
+            start_datetime, end_datetime
+        )
+        SELECT
+            v_user, v_calendar, 'bench_' || g.n, 'benchmark', 'Benchmark event ' || g.n,
+            g.start_at,
+            g.start_at + CASE WHEN random() < 0.02 THEN INTERVAL '5 days' ELSE INTERVAL '1 hour' END
+        FROM (
+            SELECT n, NOW() - (random() * INTERVAL '3650 days') AS start_at
+            FROM generate_series(v_inserted + 1, v_size) AS n
+        ) g;
+        v_inserted := v_size;
+
+        ANALYZE calendar_events;
+
+        v_started := clock_timestamp();
+        FOR i IN 1..v_runs LOOP
+            SELECT COUNT(*) INTO v_count
+            FROM get_events_in_range(v_window_start, v_window_end, v_user, ARRAY[v_calendar], TRUE);
+        END LOOP;
+        INSERT INTO bench_results VALUES (
+            v_size, 'get_events_in_range',
+            EXTRACT(EPOCH FROM clock_timestamp() - v_started) * 1000 / v_runs
+        );
+
+        v_started := clock_timestamp();
+        FOR i IN 1..v_runs LOOP
+            SELECT COUNT(*) INTO v_count
+            FROM calendar_events
+            WHERE user_id = v_user
+              AND start_datetime >= v_window_start
+              AND start_datetime <= v_window_end;
+        END LOOP;
+        INSERT INTO bench_results VALUES (
+            v_size, 'start_datetime filter',
+            EXTRACT(EPOCH FROM clock_timestamp() - v_started) * 1000 / v_runs
+        );
+    END LOOP;
+END;
+$$;
+
+SELECT history_size, query, ROUND(avg_ms, 3) AS avg_ms
+FROM bench_results
+ORDER BY query, history_size;
+
+ROLLBACK;
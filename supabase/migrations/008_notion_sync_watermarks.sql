@@ -0,0 +1,40 @@
+-- Migration: Create notion_sync_watermarks table
+-- Stores the newest Notion last_edited_time seen per user and database so that
+-- repeat syncs only query pages edited since the last successful run
+
+CREATE TABLE IF NOT EXISTS notion_sync_watermarks (
+    user_id TEXT NOT NULL,
+    database_id TEXT NOT NULL, -- Notion database ID
+    calendar_id UUID, -- NotionFlow calendar the database was synced into
+
+    -- Newest last_edited_time among pages processed by the last complete pass
+    last_edited_time TIMESTAMPTZ,
+    last_synced_at TIMESTAMPTZ DEFAULT NOW(),
+
+    -- Timestamps
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (user_id, database_id)
+);
+
+-- Create indexes for performance
+CREATE INDEX IF NOT EXISTS idx_notion_sync_watermarks_user_id ON notion_sync_watermarks(user_id);
+
+-- Enable Row Level Security
+ALTER TABLE notion_sync_watermarks ENABLE ROW LEVEL SECURITY;
+
+-- Users can read their own watermarks
+CREATE POLICY "Users can view their own notion watermarks" ON notion_sync_watermarks
+    FOR SELECT USING (auth.uid()::text = user_id);
+
+-- Service role policies (for backend operations)
+CREATE POLICY "Service role full access notion_sync_watermarks" ON notion_sync_watermarks
+    FOR ALL TO service_role USING (true) WITH CHECK (true);
+
+-- Add trigger for updated_at
+CREATE TRIGGER update_notion_sync_watermarks_updated_at BEFORE UPDATE
+    ON notion_sync_watermarks FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Add comment
+COMMENT ON TABLE notion_sync_watermarks IS 'Per-user, per-database last_edited_time watermarks for incremental Notion sync';
@@ -0,0 +1,65 @@
+-- Migration: Bulk upsert support for calendar_events
+-- Adds a content_hash column and an RPC that writes a whole chunk of synced
+-- events in one round-trip, skipping rows whose content has not changed
+
+-- SHA-256 of the user-visible event content (see utils/event_writer.py)
+ALTER TABLE calendar_events
+ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64);
+
+-- Bulk upsert keyed on (user_id, external_id, source_platform)
+-- Returns how many rows were created, updated, or left unchanged
+CREATE OR REPLACE FUNCTION upsert_calendar_events(p_events JSONB)
+RETURNS TABLE(created INTEGER, updated INTEGER, unchanged INTEGER)
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+    v_total INTEGER := COALESCE(jsonb_array_length(p_events), 0);
+BEGIN
+    RETURN QUERY
+    WITH incoming AS (
+        SELECT * FROM jsonb_populate_recordset(NULL::calendar_events, p_events)
+    ),
+    written AS (
+        INSERT INTO calendar_events AS ce (
+            user_id, calendar_id, external_id, source_platform,
+            title, description, start_datetime, end_datetime, is_all_day,
+            location, category, priority, status,
+            source_calendar_id, source_calendar_name, content_hash
+        )
+        SELECT
+            user_id, calendar_id, external_id, source_platform,
+            title, description, start_datetime, end_datetime, COALESCE(is_all_day, false),
+            location, category, priority, COALESCE(status, 'confirmed'),
+            source_calendar_id, source_calendar_name, content_hash
+        FROM incoming
+        ON CONFLICT (user_id, external_id, source_platform) DO UPDATE SET
+            calendar_id = COALESCE(EXCLUDED.calendar_id, ce.calendar_id),
+            title = EXCLUDED.title,
+            description = EXCLUDED.description,
+            start_datetime = EXCLUDED.start_datetime,
+            end_datetime = EXCLUDED.end_datetime,
+            is_all_day = EXCLUDED.is_all_day,
+            location = COALESCE(EXCLUDED.location, ce.location),
+            category = COALESCE(EXCLUDED.category, ce.category),
+            priority = COALESCE(EXCLUDED.priority, ce.priority),
+            status = EXCLUDED.status,
+            source_calendar_id = COALESCE(EXCLUDED.source_calendar_id, ce.source_calendar_id),
+            source_calendar_name = COALESCE(EXCLUDED.source_calendar_name, ce.source_calendar_name),
+            content_hash = EXCLUDED.content_hash,
+            updated_at = NOW()
+        WHERE ce.content_hash IS DISTINCT FROM EXCLUDED.content_hash
+        RETURNING (xmax = 0) AS inserted
+    )
+    SELECT
+        COUNT(*) FILTER (WHERE inserted)::INTEGER,
+        COUNT(*) FILTER (WHERE NOT inserted)::INTEGER,
+        (v_total - COUNT(*))::INTEGER
+    FROM written;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION upsert_calendar_events(JSONB) TO service_role;
+
+-- Add comment
+COMMENT ON FUNCTION upsert_calendar_events(JSONB) IS 'Bulk upsert of synced events; unchanged content_hash rows are not rewritten';
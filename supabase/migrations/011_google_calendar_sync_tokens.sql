@@ -0,0 +1,32 @@
+-- Migration: Create google_calendar_sync_tokens table
+-- Stores the Google Calendar nextSyncToken per user and calendar so that
+-- scheduled syncs only transfer changed events
+
+CREATE TABLE IF NOT EXISTS google_calendar_sync_tokens (
+    user_id TEXT NOT NULL,
+    google_calendar_id TEXT NOT NULL, -- Google calendar ID ('primary', email, ...)
+
+    -- Token returned by the last complete events.list pass
+    sync_token TEXT NOT NULL,
+    last_synced_at TIMESTAMPTZ DEFAULT NOW(),
+
+    -- Timestamps
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (user_id, google_calendar_id)
+);
+
+-- Enable Row Level Security
+ALTER TABLE google_calendar_sync_tokens ENABLE ROW LEVEL SECURITY;
+
+-- Service role policies (for backend operations)
+CREATE POLICY "Service role full access google_calendar_sync_tokens" ON google_calendar_sync_tokens
+    FOR ALL TO service_role USING (true) WITH CHECK (true);
+
+-- Add trigger for updated_at
+CREATE TRIGGER update_google_calendar_sync_tokens_updated_at BEFORE UPDATE
+    ON google_calendar_sync_tokens FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Add comment
+COMMENT ON TABLE google_calendar_sync_tokens IS 'Per-calendar Google nextSyncToken for incremental sync (cleared on 410 Gone)';
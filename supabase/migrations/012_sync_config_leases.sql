@@ -0,0 +1,17 @@
+-- Migration: Add scheduler lease columns to calendar_sync_configs
+-- A scheduler worker claims a config row by setting lease_owner/lease_expires_at
+-- with a conditional update, so several processes or hosts can share the
+-- scheduled sync work without running the same user/platform twice
+
+ALTER TABLE calendar_sync_configs
+ADD COLUMN IF NOT EXISTS lease_owner TEXT;
+
+ALTER TABLE calendar_sync_configs
+ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+
+-- Create index for lease lookups
+CREATE INDEX IF NOT EXISTS idx_calendar_sync_configs_lease_expires ON calendar_sync_configs(lease_expires_at);
+
+-- Add comments
+COMMENT ON COLUMN calendar_sync_configs.lease_owner IS 'Scheduler worker (host:pid:id) currently syncing this config';
+COMMENT ON COLUMN calendar_sync_configs.lease_expires_at IS 'Lease expiry; expired leases may be claimed by another worker';
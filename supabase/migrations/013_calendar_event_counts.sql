@@ -0,0 +1,89 @@
+-- Migration: Maintained per-calendar event counter
+-- calendars.event_count is kept current by statement-level triggers on
+-- calendar_events, so the dashboard calendar list reads counts from the
+-- calendars row itself instead of running one count query per calendar
+
+ALTER TABLE calendars
+ADD COLUMN IF NOT EXISTS event_count INTEGER NOT NULL DEFAULT 0;
+
+-- Apply net +/- per calendar once per statement (bulk upserts touch many rows)
+CREATE OR REPLACE FUNCTION sync_calendar_event_counts()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE calendars c
+        SET event_count = c.event_count + d.delta
+        FROM (
+            SELECT calendar_id, COUNT(*) AS delta
+            FROM new_rows
+            WHERE calendar_id IS NOT NULL
+            GROUP BY calendar_id
+        ) d
+        WHERE c.id = d.calendar_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE calendars c
+        SET event_count = GREATEST(c.event_count - d.delta, 0)
+        FROM (
+            SELECT calendar_id, COUNT(*) AS delta
+            FROM old_rows
+            WHERE calendar_id IS NOT NULL
+            GROUP BY calendar_id
+        ) d
+        WHERE c.id = d.calendar_id;
+    ELSE
+        -- Only rows moved between calendars change the counts
+        UPDATE calendars c
+        SET event_count = GREATEST(c.event_count + d.delta, 0)
+        FROM (
+            SELECT calendar_id, SUM(delta) AS delta
+            FROM (
+                SELECT calendar_id, 1 AS delta FROM new_rows WHERE calendar_id IS NOT NULL
+                UNION ALL
+                SELECT calendar_id, -1 AS delta FROM old_rows WHERE calendar_id IS NOT NULL
+            ) moved
+            GROUP BY calendar_id
+            HAVING SUM(delta) <> 0
+        ) d
+        WHERE c.id = d.calendar_id;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS calendar_events_count_insert ON calendar_events;
+CREATE TRIGGER calendar_events_count_insert
+    AFTER INSERT ON calendar_events
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_calendar_event_counts();
+
+DROP TRIGGER IF EXISTS calendar_events_count_update ON calendar_events;
+CREATE TRIGGER calendar_events_count_update
+    AFTER UPDATE ON calendar_events
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_calendar_event_counts();
+
+DROP TRIGGER IF EXISTS calendar_events_count_delete ON calendar_events;
+CREATE TRIGGER calendar_events_count_delete
+    AFTER DELETE ON calendar_events
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_calendar_event_counts();
+
+-- Backfill existing counts
+UPDATE calendars c
+SET event_count = COALESCE(e.cnt, 0)
+FROM calendars c2
+LEFT JOIN (
+    SELECT calendar_id, COUNT(*) AS cnt
+    FROM calendar_events
+    WHERE calendar_id IS NOT NULL
+    GROUP BY calendar_id
+) e ON e.calendar_id = c2.id
+WHERE c.id = c2.id;
+
+-- Owner lookups for the dashboard calendar list
+CREATE INDEX IF NOT EXISTS idx_calendars_owner_id ON calendars(owner_id);
+
+COMMENT ON COLUMN calendars.event_count IS 'Number of calendar_events rows in this calendar (maintained by trigger)';
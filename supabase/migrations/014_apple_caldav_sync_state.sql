@@ -0,0 +1,35 @@
+-- Migration: Create apple_caldav_sync_state table
+-- Stores per-collection CalDAV sync state (ctag, RFC 6578 sync-token and
+-- href -> etag/external_id map) so Apple Calendar syncs only transfer
+-- changed resources and can remove events deleted on the server
+
+CREATE TABLE IF NOT EXISTS apple_caldav_sync_state (
+    user_id TEXT NOT NULL,
+    collection_url TEXT NOT NULL, -- CalDAV calendar collection URL
+
+    -- Change markers from the last complete pass
+    ctag TEXT,
+    sync_token TEXT,
+    resources JSONB DEFAULT '{}', -- { href: { etag, external_id } }
+    last_synced_at TIMESTAMPTZ DEFAULT NOW(),
+
+    -- Timestamps
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+
+    PRIMARY KEY (user_id, collection_url)
+);
+
+-- Enable Row Level Security
+ALTER TABLE apple_caldav_sync_state ENABLE ROW LEVEL SECURITY;
+
+-- Service role policies (for backend operations)
+CREATE POLICY "Service role full access apple_caldav_sync_state" ON apple_caldav_sync_state
+    FOR ALL TO service_role USING (true) WITH CHECK (true);
+
+-- Add trigger for updated_at
+CREATE TRIGGER update_apple_caldav_sync_state_updated_at BEFORE UPDATE
+    ON apple_caldav_sync_state FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Add comment
+COMMENT ON TABLE apple_caldav_sync_state IS 'Per-collection CalDAV ctag/sync-token/etags for incremental Apple Calendar sync';
@@ -0,0 +1,19 @@
+-- Migration: Tokenized ICS subscription feed
+-- Each calendar can carry a secret feed token; /calendar/<id>.ics?token=...
+-- streams its events to subscribing clients (Apple, Google, Outlook)
+
+ALTER TABLE calendars
+ADD COLUMN IF NOT EXISTS ics_feed_token TEXT;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_calendars_ics_feed_token
+    ON calendars(ics_feed_token) WHERE ics_feed_token IS NOT NULL;
+
+-- Feed validator: newest updated_at per calendar (ETag / Last-Modified)
+CREATE INDEX IF NOT EXISTS idx_calendar_events_calendar_updated
+    ON calendar_events(calendar_id, updated_at DESC);
+
+-- Feed body: keyset pages over (calendar_id, id)
+CREATE INDEX IF NOT EXISTS idx_calendar_events_calendar_id_id
+    ON calendar_events(calendar_id, id);
+
+COMMENT ON COLUMN calendars.ics_feed_token IS 'Secret token for the public ICS feed (NULL = feed disabled)';
@@ -0,0 +1,103 @@
+-- Migration: Durable sync job queue on sync_jobs
+-- Workers claim pending jobs with claim_sync_jobs() (FOR UPDATE SKIP LOCKED)
+-- and hold a lease while running; failed jobs are retried with exponential
+-- backoff until max_attempts, and idempotency keys collapse duplicate enqueues
+
+CREATE TABLE IF NOT EXISTS sync_jobs (
+    id UUID DEFAULT uuid_generate_v4() PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    type TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending', -- pending, running, completed, failed
+    data JSONB,
+    settings JSONB,
+    progress INTEGER DEFAULT 0,
+    message TEXT,
+    error TEXT,
+
+    -- Timestamps
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    started_at TIMESTAMPTZ,
+    completed_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Queue columns
+ALTER TABLE sync_jobs ADD COLUMN IF NOT EXISTS idempotency_key TEXT;
+ALTER TABLE sync_jobs ADD COLUMN IF NOT EXISTS attempts INTEGER NOT NULL DEFAULT 0;
+ALTER TABLE sync_jobs ADD COLUMN IF NOT EXISTS max_attempts INTEGER NOT NULL DEFAULT 5;
+ALTER TABLE sync_jobs ADD COLUMN IF NOT EXISTS run_after TIMESTAMPTZ NOT NULL DEFAULT NOW();
+ALTER TABLE sync_jobs ADD COLUMN IF NOT EXISTS lease_owner TEXT;
+ALTER TABLE sync_jobs ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMPTZ;
+ALTER TABLE sync_jobs ADD COLUMN IF NOT EXISTS result JSONB;
+
+-- One job per (user, idempotency key); NULL keys never conflict
+CREATE UNIQUE INDEX IF NOT EXISTS idx_sync_jobs_idempotency
+    ON sync_jobs(user_id, idempotency_key);
+
+-- Claim scans
+CREATE INDEX IF NOT EXISTS idx_sync_jobs_pending
+    ON sync_jobs(run_after) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS idx_sync_jobs_running_lease
+    ON sync_jobs(lease_expires_at) WHERE status = 'running';
+CREATE INDEX IF NOT EXISTS idx_sync_jobs_user_created
+    ON sync_jobs(user_id, created_at DESC);
+
+-- Claim up to p_limit due jobs (or running jobs whose lease expired) for p_worker;
+-- expired jobs without attempts left are failed instead of re-claimed
+CREATE OR REPLACE FUNCTION claim_sync_jobs(p_worker TEXT, p_limit INTEGER, p_lease_seconds INTEGER)
+RETURNS SETOF sync_jobs
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+    -- Every attempt crashed its worker before it could record a failure
+    UPDATE sync_jobs
+    SET status = 'failed',
+        error = 'Lease expired after the last attempt',
+        completed_at = NOW(),
+        lease_owner = NULL,
+        lease_expires_at = NULL,
+        updated_at = NOW()
+    WHERE status = 'running'
+      AND lease_expires_at < NOW()
+      AND attempts >= max_attempts;
+
+    RETURN QUERY
+    UPDATE sync_jobs j
+    SET status = 'running',
+        lease_owner = p_worker,
+        lease_expires_at = NOW() + make_interval(secs => p_lease_seconds),
+        attempts = j.attempts + 1,
+        started_at = NOW(),
+        updated_at = NOW()
+    WHERE j.id IN (
+        SELECT id FROM sync_jobs
+        WHERE (status = 'pending' AND run_after <= NOW())
+           OR (status = 'running' AND lease_expires_at < NOW() AND attempts < max_attempts)
+        ORDER BY run_after
+        LIMIT p_limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING j.*;
+END;
+$$;
+
+-- Enable Row Level Security
+ALTER TABLE sync_jobs ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Service role full access sync_jobs" ON sync_jobs;
+CREATE POLICY "Service role full access sync_jobs" ON sync_jobs
+    FOR ALL TO service_role USING (true) WITH CHECK (true);
+
+-- Add trigger for updated_at
+DROP TRIGGER IF EXISTS update_sync_jobs_updated_at ON sync_jobs;
+CREATE TRIGGER update_sync_jobs_updated_at BEFORE UPDATE
+    ON sync_jobs FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+-- Add comments
+COMMENT ON TABLE sync_jobs IS 'Durable background job queue (exports, webhook-triggered platform syncs)';
+COMMENT ON COLUMN sync_jobs.idempotency_key IS 'Caller-supplied key; re-enqueueing the same key returns the existing job';
+COMMENT ON COLUMN sync_jobs.run_after IS 'Earliest time the job may be claimed (pushed back by retry backoff)';
+COMMENT ON COLUMN sync_jobs.lease_expires_at IS 'Running jobs whose lease expired are re-claimed by another worker';
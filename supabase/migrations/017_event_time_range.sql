@@ -0,0 +1,69 @@
+-- Migration: Interval index for event range queries
+-- calendar_events.time_range is a generated [start_datetime, end_datetime)
+-- range with GiST indexes, and get_events_in_range returns every event that
+-- overlaps a window - including long events that started before it, which
+-- filtering on start_datetime alone misses
+
+-- Lets GiST indexes combine uuid equality with range overlap
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+-- Zero-length events become a single point so they still match their instant
+ALTER TABLE calendar_events
+ADD COLUMN IF NOT EXISTS time_range TSTZRANGE
+GENERATED ALWAYS AS (
+    CASE
+        WHEN end_datetime > start_datetime THEN tstzrange(start_datetime, end_datetime, '[)')
+        ELSE tstzrange(start_datetime, start_datetime, '[]')
+    END
+) STORED;
+
+-- Per-user views (dashboard, calendar pages) and per-calendar views (month view)
+CREATE INDEX IF NOT EXISTS idx_calendar_events_user_time_range
+    ON calendar_events USING GIST (user_id, time_range);
+CREATE INDEX IF NOT EXISTS idx_calendar_events_calendar_time_range
+    ON calendar_events USING GIST (calendar_id, time_range);
+
+-- Events overlapping [p_start, p_end), ordered by start
+-- With p_user_id: that user's events, optionally limited to p_calendar_ids
+-- (p_include_orphans also keeps events without a calendar).
+-- Without p_user_id: events of p_calendar_ids (shared calendars), RLS applies.
+CREATE OR REPLACE FUNCTION get_events_in_range(
+    p_start TIMESTAMPTZ,
+    p_end TIMESTAMPTZ,
+    p_user_id UUID DEFAULT NULL,
+    p_calendar_ids UUID[] DEFAULT NULL,
+    p_include_orphans BOOLEAN DEFAULT FALSE
+)
+RETURNS SETOF calendar_events
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+    v_window TSTZRANGE := tstzrange(p_start, p_end, '[)');
+BEGIN
+    IF p_user_id IS NOT NULL THEN
+        RETURN QUERY
+        SELECT e.*
+        FROM calendar_events e
+        WHERE e.user_id = p_user_id
+          AND e.time_range && v_window
+          AND (
+              p_calendar_ids IS NULL
+              OR e.calendar_id = ANY(p_calendar_ids)
+              OR (p_include_orphans AND e.calendar_id IS NULL)
+          )
+        ORDER BY e.start_datetime;
+    ELSIF p_calendar_ids IS NOT NULL THEN
+        -- Join on the ids so each calendar is one (calendar_id, time_range) index probe
+        RETURN QUERY
+        SELECT e.*
+        FROM unnest(p_calendar_ids) AS c(id)
+        JOIN calendar_events e ON e.calendar_id = c.id
+        WHERE e.time_range && v_window
+        ORDER BY e.start_datetime;
+    END IF;
+END;
+$$;
+
+COMMENT ON COLUMN calendar_events.time_range IS 'Generated [start_datetime, end_datetime) range for overlap queries (GiST indexed)';
+COMMENT ON FUNCTION get_events_in_range IS 'Events overlapping [p_start, p_end) for a user and/or set of calendars';
@@ -0,0 +1,67 @@
+-- Migration: Per-calendar statistics in one query
+-- get_calendar_stats returns, for every calendar a user owns, the number of
+-- events in a window, the next upcoming event and the last sync time, so the
+-- calendar list no longer downloads event rows just to count them
+
+-- Next-upcoming lookups per calendar
+CREATE INDEX IF NOT EXISTS idx_calendar_events_calendar_start
+    ON calendar_events(calendar_id, start_datetime);
+
+-- calendars.owner_id is TEXT (stored as the app's user id string), so the
+-- parameter is TEXT too - there is no text = uuid operator
+DROP FUNCTION IF EXISTS get_calendar_stats(UUID, TIMESTAMPTZ, TIMESTAMPTZ);
+
+CREATE OR REPLACE FUNCTION get_calendar_stats(
+    p_user_id TEXT,
+    p_start TIMESTAMPTZ,
+    p_end TIMESTAMPTZ
+)
+RETURNS TABLE(
+    calendar_id UUID,
+    event_count INTEGER,
+    next_event_id UUID,
+    next_event_title TEXT,
+    next_event_start TIMESTAMPTZ,
+    last_sync_at TIMESTAMPTZ
+)
+LANGUAGE sql
+STABLE
+AS $$
+    WITH owned AS (
+        SELECT id FROM calendars WHERE owner_id = p_user_id
+    ),
+    counts AS (
+        -- Events overlapping the window (time_range GiST index, migration 017)
+        SELECT e.calendar_id, COUNT(*)::INTEGER AS event_count
+        FROM calendar_events e
+        JOIN owned o ON o.id = e.calendar_id
+        WHERE e.time_range && tstzrange(p_start, p_end, '[)')
+        GROUP BY e.calendar_id
+    ),
+    syncs AS (
+        SELECT s.calendar_id, MAX(s.last_sync_at) AS last_sync_at
+        FROM calendar_sync_configs s
+        JOIN owned o ON o.id = s.calendar_id
+        GROUP BY s.calendar_id
+    )
+    SELECT
+        o.id,
+        COALESCE(c.event_count, 0),
+        n.id,
+        n.title,
+        n.start_datetime,
+        s.last_sync_at
+    FROM owned o
+    LEFT JOIN counts c ON c.calendar_id = o.id
+    LEFT JOIN syncs s ON s.calendar_id = o.id
+    LEFT JOIN LATERAL (
+        SELECT e.id, e.title, e.start_datetime
+        FROM calendar_events e
+        WHERE e.calendar_id = o.id
+          AND e.start_datetime >= p_start
+        ORDER BY e.start_datetime
+        LIMIT 1
+    ) n ON TRUE;
+$$;
+
+COMMENT ON FUNCTION get_calendar_stats IS 'Per-calendar event count in [p_start, p_end), next upcoming event and last sync time for a user''s calendars';
@@ -0,0 +1,11 @@
+-- Migration: Store the synced time window in apple_caldav_sync_state
+-- ctag / sync-token only report server-side edits, so the window of the last
+-- pass is kept to query the days that entered it since (events that were
+-- outside the old window would otherwise never be imported)
+
+ALTER TABLE apple_caldav_sync_state
+    ADD COLUMN IF NOT EXISTS window_start TEXT, -- CalDAV UTC bound, e.g. 20260101T000000Z
+    ADD COLUMN IF NOT EXISTS window_end TEXT;
+
+COMMENT ON COLUMN apple_caldav_sync_state.window_start IS 'Start of the time-range covered by the last complete pass';
+COMMENT ON COLUMN apple_caldav_sync_state.window_end IS 'End of the time-range covered by the last complete pass';
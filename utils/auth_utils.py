@@ -8,11 +8,11 @@ import re
 from datetime import datetime, timedelta
 from functools import wraps
 from flask import request, jsonify, current_app
-from supabase import create_client
+from utils.config import PooledClientProxy
 
 class AuthValidator:
     def __init__(self, supabase_url, supabase_key):
-        self.supabase = create_client(supabase_url, supabase_key)
+        self.supabase = PooledClientProxy(supabase_url, supabase_key)
         
     def validate_jwt_token(self, token):
         """Validate Supabase JWT token"""
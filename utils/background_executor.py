@@ -0,0 +1,199 @@
+"""
+🧵 Background Executor
+One bounded, per-process worker pool for fire-and-forget request work
+(Notion background syncs, cache warmups) instead of a new thread per call
+- tasks are keyed: a key that is already queued or running is not submitted again
+- optional start delay without parking a worker thread (one dispatcher thread)
+- bounded queue depth; queue/running/rejected counters for monitoring
+- drain() on worker shutdown (gunicorn worker_exit / interpreter exit) finishes queued work
+"""
+
+import os
+import heapq
+import itertools
+import threading
+import time
+import atexit
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+BACKGROUND_WORKERS = int(os.getenv('BACKGROUND_WORKERS', '4'))
+# Tasks allowed to wait (delayed + queued) on top of the running ones
+BACKGROUND_MAX_QUEUE = int(os.getenv('BACKGROUND_MAX_QUEUE', '100'))
+BACKGROUND_DRAIN_SECONDS = float(os.getenv('BACKGROUND_DRAIN_SECONDS', '25'))
+
+
+class BackgroundExecutor:
+    """Bounded thread pool with keyed de-duplication and delayed start"""
+
+    def __init__(self, max_workers: int = BACKGROUND_WORKERS, max_queue: int = BACKGROUND_MAX_QUEUE):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='background')
+        self._condition = threading.Condition()
+        self._delayed = []  # heap of (run_at, seq, key, fn, args, kwargs)
+        self._seq = itertools.count()
+        self._active = set()  # keys delayed, queued or running
+        self._running = 0
+        self._accepting = True
+        self._stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'deduplicated': 0, 'rejected': 0}
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name='background-dispatcher', daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, key: str, fn: Callable, *args, delay: float = 0, **kwargs) -> bool:
+        """Queue fn(*args, **kwargs) unless `key` is already pending/running
+
+        Returns False when the task was de-duplicated, the queue is full or
+        the executor is draining.
+        """
+        with self._condition:
+            if not self._accepting:
+                self._stats['rejected'] += 1
+                return False
+            if key in self._active:
+                self._stats['deduplicated'] += 1
+                return False
+            if len(self._active) - self._running >= self.max_queue:
+                self._stats['rejected'] += 1
+                print(f"⚠️ [BACKGROUND] Queue full ({self.max_queue}), dropping {key}")
+                return False
+
+            self._active.add(key)
+            self._stats['submitted'] += 1
+            if delay > 0:
+                heapq.heappush(self._delayed, (time.monotonic() + delay, next(self._seq), key, fn, args, kwargs))
+                self._condition.notify()
+                return True
+
+        try:
+            self._executor.submit(self._run, key, fn, args, kwargs)
+        except RuntimeError:
+            with self._condition:
+                self._active.discard(key)
+                self._stats['rejected'] += 1
+            return False
+        return True
+
+    def is_active(self, key: str) -> bool:
+        with self._condition:
+            return key in self._active
+
+    def _dispatch_loop(self):
+        """Move delayed tasks into the pool when their start time arrives"""
+        while True:
+            with self._condition:
+                while True:
+                    if self._delayed and (not self._accepting or self._delayed[0][0] <= time.monotonic()):
+                        _, _, key, fn, args, kwargs = heapq.heappop(self._delayed)
+                        break
+                    if not self._accepting and not self._delayed:
+                        return
+                    timeout = self._delayed[0][0] - time.monotonic() if self._delayed else None
+                    self._condition.wait(timeout)
+            try:
+                self._executor.submit(self._run, key, fn, args, kwargs)
+            except RuntimeError:
+                if self._accepting:
+                    with self._condition:
+                        self._active.discard(key)
+                    continue
+                # Draining after the pool was shut down (interpreter exit) - run it here instead of dropping it
+                self._run(key, fn, args, kwargs)
+
+    def _run(self, key: str, fn: Callable, args: tuple, kwargs: Dict[str, Any]):
+        with self._condition:
+            self._running += 1
+        try:
+            fn(*args, **kwargs)
+            outcome = 'completed'
+        except Exception as e:
+            outcome = 'failed'
+            print(f"❌ [BACKGROUND] Task {key} failed: {e}")
+        finally:
+            with self._condition:
+                self._running -= 1
+                self._active.discard(key)
+                self._stats[outcome] += 1
+                self._condition.notify_all()
+
+    def drain(self, timeout: float = BACKGROUND_DRAIN_SECONDS) -> bool:
+        """Stop accepting work, start delayed tasks now and wait for everything to finish
+
+        Returns True when all tasks finished within `timeout`.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._accepting = False
+            self._condition.notify_all()
+            while self._active:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    print(f"⚠️ [BACKGROUND] Drain timed out with {len(self._active)} tasks unfinished")
+                    break
+                self._condition.wait(remaining)
+            drained = not self._active
+        self._executor.shutdown(wait=False)
+        return drained
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._condition:
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'running': self._running,
+                'delayed': len(self._delayed),
+                'queued': len(self._active) - self._running - len(self._delayed),
+                'accepting': self._accepting,
+                **self._stats
+            }
+
+
+_executor_instance: Optional[BackgroundExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_background_executor() -> BackgroundExecutor:
+    """Per-process executor, created lazily so preloaded gunicorn workers get their own threads"""
+    global _executor_instance
+    if _executor_instance is None:
+        with _executor_lock:
+            if _executor_instance is None:
+                _executor_instance = BackgroundExecutor()
+    return _executor_instance
+
+
+def submit_background(key: str, fn: Callable, *args, delay: float = 0, **kwargs) -> bool:
+    """Shortcut for get_background_executor().submit(...)"""
+    return get_background_executor().submit(key, fn, *args, delay=delay, **kwargs)
+
+
+def drain_background_executor(timeout: float = BACKGROUND_DRAIN_SECONDS) -> bool:
+    """Graceful shutdown hook (no-op if the executor was never used)"""
+    if _executor_instance is None:
+        return True
+    return _executor_instance.drain(timeout)
+
+
+def get_background_stats() -> Dict[str, int]:
+    if _executor_instance is None:
+        return {'max_workers': BACKGROUND_WORKERS, 'max_queue': BACKGROUND_MAX_QUEUE, 'running': 0,
+                'delayed': 0, 'queued': 0, 'accepting': True}
+    return _executor_instance.get_stats()
+
+
+def _reset_after_fork():
+    # Threads don't survive fork; the child builds its own executor on first use
+    global _executor_instance, _executor_lock
+    _executor_instance = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+if hasattr(threading, '_register_atexit'):
+    # Runs before concurrent.futures' own exit hook (registered earlier, called in reverse
+    # order) shuts the pool down - a plain atexit hook would run after it and drop delayed tasks
+    threading._register_atexit(drain_background_executor)
+else:
+    atexit.register(drain_background_executor)
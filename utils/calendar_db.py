@@ -25,7 +25,7 @@ class CalendarDatabase:
     
     def __init__(self):
         try:
-            self.supabase = config.supabase_admin if config else None
+            self.supabase = config.client_proxy(admin=True) if config else None
         except Exception as e:
             print(f"⚠️ Supabase connection failed: {e}")
             self.supabase = None
@@ -234,6 +234,13 @@ class CalendarDatabase:
             print(f"🗑️ Deleting calendar_events for calendar {calendar_id}...")
             events_delete_result = self.supabase.table('calendar_events').delete().eq('calendar_id', calendar_id).execute()
             print(f"✅ Deleted {len(events_delete_result.data) if events_delete_result.data else 0} calendar events")
+            try:
+                from utils.event_cache import invalidate_user_events
+                from utils.media_storage import media_index
+                invalidate_user_events(user_id)
+                media_index.invalidate(calendar_id)
+            except ImportError:
+                pass
             
             # Step 2: Delete calendar shares (if any)
             print(f"🗑️ Deleting calendar_shares for calendar {calendar_id}...")
@@ -253,6 +260,14 @@ class CalendarDatabase:
                 return False
             else:
                 print(f"✅ Calendar {calendar_id} and all associated data successfully deleted")
+                # Step 4: Media file, unless another calendar still uses the same content-addressed object
+                media_file_path = check_result.data[0].get('media_file_path')
+                if media_file_path:
+                    try:
+                        from utils.media_storage import discard_media
+                        discard_media(media_file_path, self.supabase)
+                    except Exception as media_error:
+                        print(f"⚠️ Failed to delete media file {media_file_path}: {media_error}")
                 return True
                 
         except Exception as e:
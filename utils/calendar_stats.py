@@ -0,0 +1,96 @@
+"""
+📊 Calendar Statistics
+사용자의 모든 캘린더에 대한 이벤트 수 / 다음 일정 / 마지막 동기화 시각을
+get_calendar_stats RPC 한 번으로 조회 - 이벤트 행을 내려받지 않음
+결과는 사용자별로 캐시되며 event_cache의 data version을 키에 포함하므로
+동기화 writer의 invalidate_user_events로 함께 무효화됨
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from utils.event_cache import event_cache, _normalize_user, _to_utc
+
+CALENDAR_STATS_TTL_SECONDS = int(os.getenv('CALENDAR_STATS_TTL_SECONDS', '300'))
+CALENDAR_STATS_MAX_ENTRIES = int(os.getenv('CALENDAR_STATS_MAX_ENTRIES', '1024'))
+
+# get_calendar_stats가 없는 환경(마이그레이션 018 미적용)에서는 한 번 실패 후 빈 결과
+_rpc_available = True
+
+
+def format_last_sync(last_sync_at) -> Optional[str]:
+    """'Synced 5 min ago' 형식, 값이 없으면 None"""
+    synced = _to_utc(last_sync_at)
+    if synced is None:
+        return None
+    seconds = max((datetime.now(timezone.utc) - synced).total_seconds(), 0)
+    if seconds < 3600:
+        return f"Synced {int(seconds // 60)} min ago"
+    if seconds < 86400:
+        return f"Synced {int(seconds // 3600)} hours ago"
+    return f"Synced {int(seconds // 86400)} days ago"
+
+
+class CalendarStatsService:
+    """사용자 단위 캘린더 통계 + TTL 캐시"""
+
+    def __init__(self, ttl_seconds: int = CALENDAR_STATS_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, tuple] = {}  # user -> (expires_at, data_version, days_ahead, stats)
+        self._lock = threading.Lock()
+
+    def get_stats(self, supabase, user_id: str, days_ahead: int = 365) -> Dict[str, Dict[str, Any]]:
+        """{calendar_id: {'event_count', 'next_event', 'last_sync_at'}} - 이벤트 수는 지금부터 days_ahead일"""
+        global _rpc_available
+
+        user = _normalize_user(user_id)
+        version = event_cache.data_version(user_id)
+        with self._lock:
+            entry = self._entries.get(user)
+            if entry and entry[0] > time.monotonic() and entry[1] == version and entry[2] == days_ahead:
+                return entry[3]
+
+        if not _rpc_available:
+            return {}
+
+        start = datetime.now(timezone.utc)
+        try:
+            result = supabase.rpc('get_calendar_stats', {
+                'p_user_id': user_id,
+                'p_start': start.isoformat(),
+                'p_end': (start + timedelta(days=days_ahead)).isoformat()
+            }).execute()
+        except Exception as rpc_error:
+            error_str = str(rpc_error)
+            if 'PGRST202' in error_str or 'could not find the function' in error_str.lower():
+                _rpc_available = False
+            print(f"⚠️ [CALENDAR STATS] get_calendar_stats RPC failed: {rpc_error}")
+            return {}
+
+        stats = {}
+        for row in result.data or []:
+            next_event = None
+            if row.get('next_event_id'):
+                next_event = {
+                    'id': row['next_event_id'],
+                    'title': row.get('next_event_title'),
+                    'start_datetime': row.get('next_event_start')
+                }
+            stats[str(row['calendar_id'])] = {
+                'event_count': row.get('event_count') or 0,
+                'next_event': next_event,
+                'last_sync_at': row.get('last_sync_at')
+            }
+
+        with self._lock:
+            now = time.monotonic()
+            if len(self._entries) >= CALENDAR_STATS_MAX_ENTRIES:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            self._entries[user] = (now + self.ttl_seconds, version, days_ahead, stats)
+        return stats
+
+
+calendar_stats = CalendarStatsService()
@@ -5,6 +5,7 @@ Secure configuration management with environment variables and validation
 
 import os
 import sys
+import threading
 from typing import Optional, Dict, Any
 from cryptography.fernet import Fernet
 import base64
@@ -12,6 +13,88 @@ import json
 # Supabase import will be done lazily to avoid blocking
 from dotenv import load_dotenv
 
+# Pooled Supabase clients - one per (url, key) per process, so every route/service
+# reuses the same HTTP session (keep-alive) instead of opening new connections
+_client_registry: Dict[tuple, Any] = {}
+_registry_lock = threading.Lock()
+_registry_pid = os.getpid()
+
+
+def _reset_client_registry():
+    """Forget clients inherited from the parent process (gunicorn preload/fork)"""
+    global _registry_lock, _registry_pid
+    _registry_lock = threading.Lock()
+    _client_registry.clear()
+    _registry_pid = os.getpid()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_client_registry)
+
+
+def _default_supabase_key() -> Optional[str]:
+    return os.getenv('SUPABASE_API_KEY') or os.getenv('SUPABASE_ANON_KEY')
+
+
+def _service_role_key() -> Optional[str]:
+    return os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('SUPABASE_SERVICE_KEY')
+
+
+def get_pooled_client(url: Optional[str] = None, key: Optional[str] = None):
+    """Shared Supabase client for (url, key), created once per process
+
+    Drop-in replacement for create_client(url, key) in routes and services.
+    Never call auth.sign_in_*/sign_up on a pooled client - a signed-in session
+    would switch the Authorization header for every caller; use
+    create_auth_client() for auth flows instead.
+    """
+    url = url or os.getenv('SUPABASE_URL')
+    key = key or _default_supabase_key()
+
+    if os.getpid() != _registry_pid:
+        # Fork without register_at_fork support
+        _reset_client_registry()
+
+    registry_key = (url, key)
+    client = _client_registry.get(registry_key)
+    if client is not None:
+        return client
+
+    with _registry_lock:
+        client = _client_registry.get(registry_key)
+        if client is None:
+            from supabase import create_client
+            client = create_client(url, key)
+            _client_registry[registry_key] = client
+        return client
+
+
+def get_pooled_admin_client():
+    """Shared service-role client (falls back to the anon client when no service key)"""
+    return get_pooled_client(os.getenv('SUPABASE_URL'), _service_role_key() or _default_supabase_key())
+
+
+class PooledClientProxy:
+    """Fork-safe stand-in for a pooled client in module globals and singletons
+
+    Objects built at import time run in the gunicorn master under --preload;
+    holding a client there would hand every worker the master's connection
+    pool. Each attribute access resolves the current process's client instead.
+    """
+
+    def __init__(self, url: Optional[str] = None, key: Optional[str] = None):
+        self._url = url
+        self._key = key
+
+    def __getattr__(self, name):
+        return getattr(get_pooled_client(self._url, self._key), name)
+
+
+def create_auth_client(url: Optional[str] = None, key: Optional[str] = None):
+    """Fresh, unshared client for sign-in/sign-up flows that store a session"""
+    from supabase import create_client
+    return create_client(url or os.getenv('SUPABASE_URL'), key or _default_supabase_key())
+
 class Config:
     """Centralized configuration management"""
     
@@ -94,45 +177,46 @@ class Config:
             self.cipher_suite = Fernet(self.encryption_key)
     
     def _init_supabase(self):
-        """Initialize Supabase clients"""
+        """Check Supabase configuration
+
+        Clients are not stored here: supabase_client / supabase_admin resolve the
+        current process's pooled client on every access, so a Config built
+        before gunicorn forks never hands workers the master's connections.
+        """
+        self._supabase_available = False
+        if not self.SUPABASE_URL or not self.SUPABASE_ANON_KEY:
+            print("⚠️ Supabase configuration missing, using mock client")
+            return
+        
+        # Lazy import of supabase to avoid blocking at module load time
         try:
-            if not self.SUPABASE_URL or not self.SUPABASE_ANON_KEY:
-                print("⚠️ Supabase configuration missing, using mock client")
-                self.supabase_client = None
-                self.supabase_admin = None
-                return
-            
-            # Lazy import of supabase to avoid blocking at module load time
-            try:
-                from supabase import create_client
-            except ImportError as e:
-                print(f"⚠️ Supabase library not available: {e}")
-                self.supabase_client = None
-                self.supabase_admin = None
-                return
-                
-            # Client for public operations (user-facing)
-            self.supabase_client = create_client(
-                self.SUPABASE_URL, 
-                self.SUPABASE_ANON_KEY
-            )
-            
-            # Admin client for server operations
-            if self.SUPABASE_SERVICE_ROLE_KEY:
-                self.supabase_admin = create_client(
-                    self.SUPABASE_URL, 
-                    self.SUPABASE_SERVICE_ROLE_KEY
-                )
-            else:
-                self.supabase_admin = self.supabase_client
-            
-            # Supabase clients initialized
-            
-        except Exception as e:
-            print(f"❌ Failed to initialize Supabase: {e}")
-            print("💡 Running without database - limited functionality")
-            self.supabase_client = None
-            self.supabase_admin = None
+            import supabase  # noqa: F401
+        except ImportError as e:
+            print(f"⚠️ Supabase library not available: {e}")
+            return
+        
+        self._supabase_available = True
+    
+    @property
+    def supabase_client(self):
+        """Client for public operations (user-facing)"""
+        if not self._supabase_available:
+            return None
+        return get_pooled_client(self.SUPABASE_URL, self.SUPABASE_ANON_KEY)
+    
+    @property
+    def supabase_admin(self):
+        """Admin client for server operations (anon client when no service key)"""
+        if not self._supabase_available:
+            return None
+        return get_pooled_client(self.SUPABASE_URL, self.SUPABASE_SERVICE_ROLE_KEY or self.SUPABASE_ANON_KEY)
+    
+    def client_proxy(self, admin: bool = False) -> Optional[PooledClientProxy]:
+        """Fork-safe handle to keep on long-lived objects (None when Supabase is unavailable)"""
+        if not self._supabase_available:
+            return None
+        key = (self.SUPABASE_SERVICE_ROLE_KEY or self.SUPABASE_ANON_KEY) if admin else self.SUPABASE_ANON_KEY
+        return PooledClientProxy(self.SUPABASE_URL, key)
     
     def encrypt_credentials(self, credentials: Dict[str, Any]) -> str:
         """Encrypt user credentials for secure storage"""
@@ -11,13 +11,18 @@ from datetime import datetime, timedelta
 # Add config to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '../../utils'))
 from utils.config import config
+from utils.event_cache import event_cache
+from utils.event_range import query_events_in_range
+
+# calendars.event_count column present (falls back to per-calendar counts until migrated)
+_calendar_counts_available = True
 
 class DashboardDataManager:
     """Manages data loading for all dashboard pages"""
     
     def __init__(self):
-        self.supabase = config.supabase_client
-        self.admin_client = config.supabase_admin
+        self.supabase = config.client_proxy()
+        self.admin_client = config.client_proxy(admin=True)
     
     def get_user_dashboard_data(self, user_id: str) -> Dict[str, Any]:
         """Get comprehensive dashboard data for a user"""
@@ -211,37 +216,30 @@ class DashboardDataManager:
             
             # print(f"📅 [EVENTS] Date range: {start_datetime.isoformat()} to {end_datetime.isoformat()}")
             
-            # Build query - using actual column names from the database
-            query = self.supabase.table('calendar_events').select('''
-                id, title, description, start_datetime, end_datetime,
-                is_all_day, status, location, attendees, created_at, updated_at, calendar_id, source_platform
-            ''').eq('user_id', normalized_user_id).gte('start_datetime', start_datetime.isoformat()).lte('start_datetime', end_datetime.isoformat())
-            
-            # Filter by calendar IDs if provided
-            if calendar_ids:
-                # CRITICAL FIX: Include orphaned events (null calendar_id) when showing primary calendar
-                # This ensures orphaned events appear until they can be properly assigned
+            def load_events(window_start: datetime, window_end: datetime) -> List[Dict]:
+                # Filter by calendar IDs if provided
+                if calendar_ids:
+                    # CRITICAL FIX: Include orphaned events (null calendar_id) when showing primary calendar
+                    # This ensures orphaned events appear until they can be properly assigned
+                    print(f"📅 [EVENTS] Filtering by calendar IDs + orphaned events: {calendar_ids}")
+                else:
+                    print(f"📅 [EVENTS] No calendar ID filter - showing all events")
                 
-                # Always include events with null calendar_id alongside specified calendars
-                # This is a temporary fix to show orphaned events in any calendar view
-                # CRITICAL FIX: UUID fields should not be quoted in Supabase queries
-                query = query.or_(f'calendar_id.in.({",".join(calendar_ids)}),calendar_id.is.null')
-                print(f"📅 [EVENTS] Filtering by calendar IDs + orphaned events: {calendar_ids}")
-            else:
-                print(f"📅 [EVENTS] No calendar ID filter - showing all events")
-            
-            result = query.order('start_datetime').execute()
-            
-            events_found = len(result.data) if result.data else 0
-            print(f"📊 [EVENTS] Found {events_found} events for user {normalized_user_id}")
-            
-            if result.data:
-                notion_events = [e for e in result.data if e.get('source_platform') == 'notion']
-                print(f"🎯 [EVENTS] Notion events found: {len(notion_events)}")
-                for event in notion_events[:3]:  # 처음 3개만 로깅
-                    print(f"  📝 {event.get('title')} - {event.get('start_datetime')}")
-            
-            return result.data if result.data else []
+                # Events overlapping the window (interval index), not just those starting in it
+                events = query_events_in_range(
+                    self.supabase, window_start, window_end,
+                    user_id=normalized_user_id, calendar_ids=calendar_ids, include_orphans=True,
+                    columns='''id, title, description, start_datetime, end_datetime,
+                    is_all_day, status, location, attendees, created_at, updated_at, calendar_id, source_platform'''
+                )
+                print(f"📊 [EVENTS] Loaded {len(events)} events for user {normalized_user_id}")
+                return events
+            
+            # Read-through cache keyed by (user, calendar set, day-aligned window)
+            return event_cache.get_or_load(
+                'events', normalized_user_id, calendar_ids, start_datetime, end_datetime, load_events,
+                end_exclusive=True, end_field='end_datetime'
+            )
             
         except Exception as e:
             print(f"Error getting calendar events: {e}")
@@ -273,63 +271,20 @@ class DashboardDataManager:
             print(f"🔍 get_user_calendars called for user_id: {original_user_id} (normalized: {normalized_user_id})")
             print(f"🔍 admin_client available: {self.admin_client is not None}")
             
-            # First, let's see what calendars exist in the database
-            all_calendars_result = self.admin_client.table('calendars').select('''
-                id, name, color, type, description, is_active, 
-                public_access, allow_editing, created_at, updated_at, owner_id
-            ''').execute()
-            
-            print(f"🔍 All calendars in database: {all_calendars_result.data}")
-            print(f"🔍 Total calendars in DB: {len(all_calendars_result.data) if all_calendars_result.data else 0}")
-            
-            # Show calendars that match EITHER user_id format
-            matching_original = [cal for cal in (all_calendars_result.data or []) if cal.get('owner_id') == original_user_id]
-            matching_normalized = [cal for cal in (all_calendars_result.data or []) if cal.get('owner_id') == normalized_user_id]
-            
-            print(f"🔍 Calendars matching original user_id ({original_user_id}): {len(matching_original)}")
-            print(f"🔍 Calendars matching normalized user_id ({normalized_user_id}): {len(matching_normalized)}")
-            
-            if matching_original:
-                print(f"🔍 Original format matches: {[cal['name'] for cal in matching_original]}")
-            if matching_normalized:
-                print(f"🔍 Normalized format matches: {[cal['name'] for cal in matching_normalized]}")
-            
-            # IMPORTANT: Show the exact user_id format used in the database
-            all_owner_ids = list(set([cal.get('owner_id') for cal in (all_calendars_result.data or []) if cal.get('owner_id')]))
-            print(f"🔍 All unique owner_ids in database: {all_owner_ids}")
-            
-            # Get calendars from new calendars table using admin client
+            # Calendars and their maintained event counts in one round-trip
             # Query with BOTH formats for maximum compatibility
-            result = self.admin_client.table('calendars').select('''
-                id, name, color, type, description, is_active, 
-                public_access, allow_editing, created_at, updated_at
-            ''').or_(f'owner_id.eq.{original_user_id},owner_id.eq.{normalized_user_id}').execute()
+            owner_filter = f'owner_id.eq.{original_user_id},owner_id.eq.{normalized_user_id}'
+            calendars = self._fetch_calendars_with_counts(owner_filter)
             
-            print(f"🔍 Supabase query result for user {user_id}: {result}")
-            print(f"🔍 Result data: {result.data}")
-            print(f"🔍 Number of calendars found: {len(result.data) if result.data else 0}")
+            print(f"🔍 Number of calendars found: {len(calendars)}")
             
             personal_calendars = []
             shared_calendars = []
             total_events_count = 0
             
             # Process each calendar
-            for calendar in result.data:
-                # Calculate actual event count for this calendar
-                try:
-                    # Query calendar_events table to get actual event count
-                    # calendar_id만으로 조회 (캘린더는 이미 owner_id로 필터링됨)
-                    events_result = self.admin_client.table('calendar_events').select(
-                        'id', count='exact'
-                    ).eq('calendar_id', calendar['id']).execute()
-                    
-                    event_count = events_result.count if events_result.count is not None else 0
-                    print(f"📊 [EVENT-COUNT] Calendar '{calendar['name']}' ({calendar['id'][:8]}...): {event_count} events")
-                    
-                except Exception as count_error:
-                    print(f"⚠️ [EVENT-COUNT] Error counting events for calendar {calendar['id']}: {count_error}")
-                    event_count = 0
-                
+            for calendar in calendars:
+                event_count = calendar.get('event_count') or 0
                 total_events_count += event_count
                 
                 # Format created time for last sync display
@@ -393,6 +348,41 @@ class DashboardDataManager:
                 }
             }
     
+    def _fetch_calendars_with_counts(self, owner_filter: str) -> List[Dict]:
+        """Fetch a user's calendars with event_count (maintained by trigger, see migration 013)"""
+        global _calendar_counts_available
+        
+        columns = '''
+                id, name, color, type, description, is_active, 
+                public_access, allow_editing, created_at, updated_at
+            '''
+        
+        if _calendar_counts_available:
+            try:
+                result = self.admin_client.table('calendars').select(
+                    columns + ', event_count'
+                ).or_(owner_filter).execute()
+                return result.data or []
+            except Exception as e:
+                if 'event_count' not in str(e):
+                    raise
+                _calendar_counts_available = False
+                print(f"⚠️ [EVENT-COUNT] calendars.event_count missing, counting per calendar: {e}")
+        
+        # Fallback before the counter migration is applied
+        result = self.admin_client.table('calendars').select(columns).or_(owner_filter).execute()
+        calendars = result.data or []
+        for calendar in calendars:
+            try:
+                events_result = self.admin_client.table('calendar_events').select(
+                    'id', count='exact'
+                ).eq('calendar_id', calendar['id']).limit(1).execute()
+                calendar['event_count'] = events_result.count or 0
+            except Exception as count_error:
+                print(f"⚠️ [EVENT-COUNT] Error counting events for calendar {calendar['id']}: {count_error}")
+                calendar['event_count'] = 0
+        return calendars
+    
     def get_user_sync_status(self, user_id: str) -> Dict[str, Any]:
         """Get user's sync status and statistics"""
         try:
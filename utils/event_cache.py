@@ -0,0 +1,219 @@
+"""
+🗂️ Event Read Cache
+Read-through cache for calendar_events queries on the calendar read path
+- keyed by (namespace, user, calendar set, day-aligned time window)
+- local in-process LRU tier with TTL; optional shared Redis tier (EVENT_CACHE_REDIS_URL)
+- explicit invalidation per user: writers call invalidate_user_events(user_id)
+Windows are widened to whole UTC days before loading and filtered back to
+the exact range, so "now + N days" requests within a day share one entry.
+Without Redis, other processes only see an invalidation after the TTL.
+"""
+
+import os
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+EVENT_CACHE_ENABLED = os.getenv('EVENT_CACHE_ENABLED', 'true').lower() == 'true'
+EVENT_CACHE_TTL_SECONDS = int(os.getenv('EVENT_CACHE_TTL_SECONDS', '120'))
+EVENT_CACHE_MAX_ENTRIES = int(os.getenv('EVENT_CACHE_MAX_ENTRIES', '512'))
+EVENT_CACHE_REDIS_URL = os.getenv('EVENT_CACHE_REDIS_URL') or os.getenv('REDIS_URL')
+
+_REDIS_PREFIX = 'nf:events'
+
+
+def _normalize_user(user_id: str) -> str:
+    """Writers and readers use hyphenated and bare UUIDs interchangeably"""
+    return str(user_id or '').replace('-', '').lower()
+
+
+def _to_utc(value) -> Optional[datetime]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def align_window(start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+    """Widen [start, end] to whole UTC days"""
+    start = _to_utc(start).replace(hour=0, minute=0, second=0, microsecond=0)
+    end_utc = _to_utc(end)
+    end = end_utc.replace(hour=0, minute=0, second=0, microsecond=0)
+    if end < end_utc:
+        end += timedelta(days=1)
+    return start, end
+
+
+class EventCache:
+    """Two-tier read-through cache; invalidation bumps a per-user version"""
+
+    def __init__(self, ttl_seconds: int = EVENT_CACHE_TTL_SECONDS, max_entries: int = EVENT_CACHE_MAX_ENTRIES,
+                 redis_url: Optional[str] = EVENT_CACHE_REDIS_URL):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()  # key -> (expires_at, rows)
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'shared_hits': 0, 'misses': 0, 'invalidations': 0}
+        self._redis = None
+        if redis_url and REDIS_AVAILABLE:
+            try:
+                self._redis = redis.Redis.from_url(redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+                self._redis.ping()
+                print("✅ [EVENT CACHE] Shared Redis tier enabled")
+            except Exception as e:
+                print(f"⚠️ [EVENT CACHE] Redis unavailable, using local tier only: {e}")
+                self._redis = None
+
+    def _version(self, user: str) -> int:
+        if self._redis is not None:
+            try:
+                value = self._redis.get(f'{_REDIS_PREFIX}:v:{user}')
+                return int(value or 0)
+            except Exception:
+                pass
+        return self._versions.get(user, 0)
+
+    def get_or_load(self, namespace: str, user_id: str, calendar_ids: Optional[Iterable[str]],
+                    start: datetime, end: datetime,
+                    loader: Callable[[datetime, datetime], List[Dict]],
+                    start_field: str = 'start_datetime', end_exclusive: bool = False,
+                    end_field: Optional[str] = None) -> List[Dict]:
+        """Cached rows whose `start_field` lies in [start, end] (or [start, end) if end_exclusive)
+        
+        With `end_field`, rows are kept when their interval overlaps the window
+        instead (start before the window end, end after the window start).
+        `loader(aligned_start, aligned_end)` runs the real query on a miss and
+        must return rows for the whole aligned window.
+        """
+        if not EVENT_CACHE_ENABLED:
+            return loader(start, end)
+
+        user = _normalize_user(user_id)
+        aligned_start, aligned_end = align_window(start, end)
+        calendars = ','.join(sorted(str(c) for c in calendar_ids)) if calendar_ids else '*'
+        version = self._version(user)
+        key = f"{namespace}:{user}:{version}:{calendars}:{aligned_start.date()}:{aligned_end.date()}"
+
+        rows = self._get_local(key)
+        if rows is None:
+            rows = self._get_shared(key)
+            if rows is not None:
+                self._stats['shared_hits'] += 1
+                self._put_local(key, rows)
+        else:
+            self._stats['hits'] += 1
+
+        if rows is None:
+            self._stats['misses'] += 1
+            rows = loader(aligned_start, aligned_end) or []
+            # Don't store under a version that an invalidation replaced mid-load
+            if self._version(user) == version:
+                self._put_local(key, rows)
+                self._put_shared(key, rows)
+
+        lower, upper = _to_utc(start), _to_utc(end)
+        result = []
+        for row in rows:
+            row_start = _to_utc(row.get(start_field))
+            if row_start is None:
+                continue
+            if end_field:
+                row_end = _to_utc(row.get(end_field)) or row_start
+                if row_end < lower or (row_end == lower and row_end > row_start):
+                    continue
+            elif row_start < lower:
+                continue
+            if row_start > upper or (end_exclusive and row_start == upper):
+                continue
+            result.append(dict(row))
+        return result
+    
+    def data_version(self, user_id: str) -> int:
+        """Current invalidation counter for a user, for keying derived caches"""
+        return self._version(_normalize_user(user_id))
+
+    def invalidate_user(self, user_id: str):
+        """Drop every cached window for this user (all namespaces and calendar sets)"""
+        user = _normalize_user(user_id)
+        if not user:
+            return
+        with self._lock:
+            self._versions[user] = self._versions.get(user, 0) + 1
+            for key in [k for k in self._entries if k.split(':', 2)[1] == user]:
+                del self._entries[key]
+            self._stats['invalidations'] += 1
+        if self._redis is not None:
+            try:
+                self._redis.incr(f'{_REDIS_PREFIX}:v:{user}')
+            except Exception as e:
+                print(f"⚠️ [EVENT CACHE] Shared invalidation failed for {user}: {e}")
+
+    def _get_local(self, key: str) -> Optional[List[Dict]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def _put_local(self, key: str, rows: List[Dict]):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, rows)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _get_shared(self, key: str) -> Optional[List[Dict]]:
+        if self._redis is None:
+            return None
+        try:
+            payload = self._redis.get(f'{_REDIS_PREFIX}:{key}')
+            return json.loads(payload) if payload else None
+        except Exception:
+            return None
+
+    def _put_shared(self, key: str, rows: List[Dict]):
+        if self._redis is None:
+            return
+        try:
+            self._redis.set(f'{_REDIS_PREFIX}:{key}', json.dumps(rows, default=str), ex=self.ttl_seconds)
+        except Exception as e:
+            print(f"⚠️ [EVENT CACHE] Shared write failed: {e}")
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {
+                'enabled': EVENT_CACHE_ENABLED,
+                'entries': len(self._entries),
+                'shared_tier': self._redis is not None,
+                **self._stats
+            }
+
+
+event_cache = EventCache()
+
+
+def invalidate_user_events(*user_ids: str):
+    """Call after any write to calendar_events for these users"""
+    for user_id in set(u for u in user_ids if u):
+        event_cache.invalidate_user(user_id)
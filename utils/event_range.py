@@ -0,0 +1,69 @@
+"""
+📐 Event Range Queries
+[start, end)과 겹치는 calendar_events 조회 - get_events_in_range RPC
+(time_range GiST 인덱스) 사용, RPC가 배포되지 않았으면 start/end 조건 쿼리로 대체
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+# get_events_in_range가 없는 환경(마이그레이션 017 미적용)에서는 한 번 실패 후 fallback만 사용
+_rpc_available = True
+
+
+def _to_param(value: Union[datetime, str]) -> str:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _project(rows: List[Dict[str, Any]], columns: str) -> List[Dict[str, Any]]:
+    """RPC는 전체 행을 반환하므로 요청한 컬럼만 남김 (캐시 크기/응답 크기 유지)"""
+    if columns.strip() == '*':
+        return rows
+    names = [name.strip() for name in columns.split(',') if name.strip()]
+    return [{name: row.get(name) for name in names} for row in rows]
+
+
+def query_events_in_range(supabase, start: Union[datetime, str], end: Union[datetime, str],
+                          user_id: Optional[str] = None, calendar_ids: Optional[Iterable[str]] = None,
+                          include_orphans: bool = False, columns: str = '*') -> List[Dict[str, Any]]:
+    """[start, end)과 겹치는 이벤트를 start_datetime 순으로 반환
+
+    user_id가 있으면 그 사용자의 이벤트 (calendar_ids로 제한 가능, include_orphans면
+    calendar_id가 없는 이벤트도 포함). user_id가 없으면 calendar_ids의 이벤트 (공유 캘린더).
+    """
+    global _rpc_available
+
+    calendar_ids = [str(c) for c in calendar_ids] if calendar_ids else None
+    if user_id is None and not calendar_ids:
+        return []
+
+    if _rpc_available:
+        try:
+            result = supabase.rpc('get_events_in_range', {
+                'p_start': _to_param(start),
+                'p_end': _to_param(end),
+                'p_user_id': user_id,
+                'p_calendar_ids': calendar_ids,
+                'p_include_orphans': include_orphans
+            }).execute()
+            return _project(result.data or [], columns)
+        except Exception as rpc_error:
+            error_str = str(rpc_error)
+            # 함수가 배포되지 않은 경우에만 RPC를 끄고, 일시적 오류는 이번 요청만 fallback
+            if 'PGRST202' in error_str or 'could not find the function' in error_str.lower():
+                _rpc_available = False
+            print(f"⚠️ [EVENT RANGE] get_events_in_range RPC failed, using fallback: {rpc_error}")
+
+    # Fallback: 같은 겹침 조건을 start/end 컬럼으로 (인덱스 없이)
+    query = supabase.table('calendar_events').select(columns).lt(
+        'start_datetime', _to_param(end)
+    ).gte('end_datetime', _to_param(start))
+    if user_id is not None:
+        query = query.eq('user_id', user_id)
+    if calendar_ids:
+        if include_orphans:
+            query = query.or_(f'calendar_id.in.({",".join(calendar_ids)}),calendar_id.is.null')
+        else:
+            query = query.in_('calendar_id', calendar_ids)
+    result = query.order('start_datetime').execute()
+    return result.data or []
@@ -0,0 +1,153 @@
+"""
+📝 Calendar Event Bulk Writer
+calendar_events 일괄 upsert - (user_id, external_id, source_platform) 기준
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Any, Optional
+
+from utils.event_cache import invalidate_user_events
+
+# 한 번의 요청으로 보낼 최대 이벤트 수
+CHUNK_SIZE = 200
+
+# content_hash 계산에 포함되는 필드 (사용자에게 보이는 내용만)
+# calendar_id는 해시와 별도로 비교함 (변환 시점에는 대상 캘린더를 모르는 플랫폼이 있음)
+HASH_FIELDS = (
+    'title',
+    'description',
+    'start_datetime',
+    'end_datetime',
+    'is_all_day',
+    'location',
+)
+
+# upsert_calendar_events RPC 사용 가능 여부 (함수가 배포되지 않았으면 fallback 고정)
+_rpc_available = True
+
+
+def compute_content_hash(event: Dict[str, Any]) -> str:
+    """이벤트 내용의 안정적인 SHA-256 해시 계산
+
+    각 플랫폼 변환기(Notion/Google/Apple)가 변환 직후 호출하여 content_hash로 저장함.
+    변환기마다 다른 종일 필드명(all_day / is_all_day)을 모두 허용.
+    """
+    content = {field: event.get(field) for field in HASH_FIELDS}
+    if content['is_all_day'] is None:
+        content['is_all_day'] = event.get('all_day')
+    content['is_all_day'] = bool(content['is_all_day'])
+    # None과 빈 문자열은 같은 내용으로 취급
+    content = {k: ('' if v is None else v) for k, v in content.items()}
+    payload = json.dumps(content, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _empty_counts() -> Dict[str, int]:
+    return {'created': 0, 'updated': 0, 'unchanged': 0, 'failed': 0}
+
+
+def _has_changed(current: Dict[str, Any], row: Dict[str, Any]) -> bool:
+    """기존 행과 비교 - 내용 해시 또는 대상 캘린더가 달라졌는지"""
+    if current.get('content_hash') != row['content_hash']:
+        return True
+    return bool(row.get('calendar_id')) and str(current.get('calendar_id')) != str(row['calendar_id'])
+
+
+def _upsert_chunk_rpc(supabase, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    """upsert_calendar_events RPC로 한 번의 왕복에 chunk 저장"""
+    result = supabase.rpc('upsert_calendar_events', {'p_events': rows}).execute()
+    data = result.data[0] if isinstance(result.data, list) and result.data else (result.data or {})
+    counts = _empty_counts()
+    counts['created'] = int(data.get('created', 0))
+    counts['updated'] = int(data.get('updated', 0))
+    counts['unchanged'] = int(data.get('unchanged', 0))
+    return counts
+
+
+def _upsert_chunk_fallback(supabase, rows: List[Dict[str, Any]]) -> Dict[str, int]:
+    """RPC가 없을 때: 해시 조회 1회 + 변경분 upsert 1회"""
+    counts = _empty_counts()
+    user_id = rows[0]['user_id']
+    platform = rows[0]['source_platform']
+    external_ids = [row['external_id'] for row in rows]
+
+    existing_result = supabase.table('calendar_events').select('external_id, content_hash, calendar_id').eq(
+        'user_id', user_id
+    ).eq('source_platform', platform).in_('external_id', external_ids).execute()
+    existing = {item['external_id']: item for item in existing_result.data or []}
+
+    changed_rows = []
+    for row in rows:
+        current = existing.get(row['external_id'])
+        if current is None:
+            counts['created'] += 1
+            changed_rows.append(row)
+        elif _has_changed(current, row):
+            counts['updated'] += 1
+            changed_rows.append(row)
+        else:
+            counts['unchanged'] += 1
+
+    if changed_rows:
+        supabase.table('calendar_events').upsert(
+            changed_rows, on_conflict='user_id,external_id,source_platform'
+        ).execute()
+
+    return counts
+
+
+def bulk_upsert_events(supabase, rows: List[Dict[str, Any]], chunk_size: int = CHUNK_SIZE) -> Dict[str, int]:
+    """calendar_events 행들을 chunk 단위로 일괄 upsert
+
+    각 행은 user_id, external_id, source_platform을 포함해야 하며 한 번의 호출은
+    같은 사용자/플랫폼의 행들만 다룸.
+    content_hash(변환기가 계산, 없으면 여기서 계산)와 calendar_id가 같은 기존 행은
+    다시 쓰지 않으며 created/updated/unchanged/failed 개수를 반환.
+    """
+    global _rpc_available
+
+    totals = _empty_counts()
+    if not rows:
+        return totals
+
+    # 같은 chunk 안에서 같은 키가 두 번 나오면 ON CONFLICT가 실패하므로 마지막 값만 유지
+    unique_rows: Dict[tuple, Dict[str, Any]] = {}
+    for row in rows:
+        if not row.get('content_hash'):
+            row['content_hash'] = compute_content_hash(row)
+        unique_rows[(row['user_id'], row['external_id'], row['source_platform'])] = row
+    rows = list(unique_rows.values())
+
+    for i in range(0, len(rows), chunk_size):
+        chunk = rows[i:i + chunk_size]
+        counts: Optional[Dict[str, int]] = None
+
+        if _rpc_available:
+            try:
+                counts = _upsert_chunk_rpc(supabase, chunk)
+            except Exception as rpc_error:
+                error_str = str(rpc_error)
+                # 함수가 배포되지 않은 경우에만 RPC를 끄고, 일시적 오류는 이번 chunk만 fallback
+                if 'PGRST202' in error_str or 'could not find the function' in error_str.lower():
+                    _rpc_available = False
+                print(f"⚠️ [EVENT WRITER] upsert_calendar_events RPC failed, using fallback: {rpc_error}")
+
+        if counts is None:
+            try:
+                counts = _upsert_chunk_fallback(supabase, chunk)
+            except Exception as e:
+                print(f"❌ [EVENT WRITER] Bulk upsert failed for {len(chunk)} events: {e}")
+                counts = _empty_counts()
+                counts['failed'] = len(chunk)
+
+        for key, value in counts.items():
+            totals[key] += value
+
+    print(f"💾 [EVENT WRITER] created={totals['created']} updated={totals['updated']} "
+          f"unchanged={totals['unchanged']} failed={totals['failed']}")
+    
+    # 변경이 있었던 사용자의 읽기 캐시 무효화 (실패한 chunk도 일부 반영됐을 수 있음)
+    if totals['created'] or totals['updated'] or totals['failed']:
+        invalidate_user_events(*{row['user_id'] for row in rows})
+    return totals
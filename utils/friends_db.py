@@ -19,14 +19,14 @@ class FriendsDB:
     def _initialize_supabase(self):
         """Initialize Supabase connection"""
         try:
-            from supabase import create_client
+            from utils.config import PooledClientProxy
             
             url = os.getenv('SUPABASE_URL')
             # Use service role key for admin operations, fallback to anon key
             key = os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('SUPABASE_API_KEY') or os.getenv('SUPABASE_ANON_KEY')
             
             if url and key:
-                self.supabase = create_client(url, key)
+                self.supabase = PooledClientProxy(url, key)
                 print("✅ Friends DB: Supabase connection successful")
             else:
                 print("❌ Friends DB: Missing Supabase credentials")
@@ -0,0 +1,295 @@
+"""
+🎞️ Calendar Media Storage
+캘린더 배경 미디어(오디오/비디오) 저장 및 조회
+- 새 업로드는 내용 주소(content-addressed) 방식으로 저장:
+  uploads/media/objects/<sha256[:2]>/<sha256>.<ext> - 같은 파일은 한 번만 저장되고
+  파일명이 내용으로 결정되므로 이름만으로 파일을 찾을 수 있음
+- calendar_id -> 미디어 정보 인덱스: 메모리 캐시, 미스일 때만 calendars에서
+  필요한 컬럼 한 행 조회 (디렉토리 스캔 / select('*') 없음)
+- Range(206) / 조건부 요청(304), 내용 주소 파일은 SHA-256 strong ETag와
+  immutable Cache-Control - 영상 탐색 시 전체 파일을 다시 받지 않음
+- MEDIA_SENDFILE로 파일 전송을 웹서버에 위임 (X-Sendfile / X-Accel-Redirect)
+
+nginx 예시 (MEDIA_SENDFILE=x-accel-redirect, MEDIA_ACCEL_PREFIX=/protected-media):
+    location /protected-media/ { internal; alias /srv/notionflow/uploads/media/; }
+"""
+
+import os
+import uuid
+import hashlib
+import mimetypes
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import quote
+
+from flask import current_app, send_file
+from werkzeug.utils import secure_filename
+
+_PROJECT_ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+# calendar_api_routes.get_upload_folder()와 같은 위치
+MEDIA_ROOT = os.path.normpath(os.getenv('MEDIA_STORAGE_ROOT') or os.path.join(_PROJECT_ROOT, 'uploads', 'media'))
+OBJECTS_DIR = 'objects'
+
+# 예전 업로드가 남아 있는 위치 - 상대 경로로 저장된 media_file_path를 이 순서로 확인
+LEGACY_MEDIA_DIRS = [
+    MEDIA_ROOT,
+    os.path.join(MEDIA_ROOT, 'calendar'),
+    os.path.join(os.getcwd(), 'uploads', 'media', 'calendar'),
+    os.path.join(os.getcwd(), 'media', 'calendar'),
+]
+
+# '' (Flask가 직접 전송) | 'x-sendfile' (Apache/lighttpd) | 'x-accel-redirect' (nginx)
+MEDIA_SENDFILE = os.getenv('MEDIA_SENDFILE', '').strip().lower()
+MEDIA_ACCEL_PREFIX = os.getenv('MEDIA_ACCEL_PREFIX', '/protected-media')
+MEDIA_MAX_AGE_SECONDS = int(os.getenv('MEDIA_MAX_AGE_SECONDS', '3600'))
+IMMUTABLE_MAX_AGE = 31536000  # 1 year
+
+# 재사용(dedup)된 객체는 아직 calendars에 기록되지 않았을 수 있으므로 이 시간 동안은 지우지 않음
+MEDIA_GC_GRACE_SECONDS = int(os.getenv('MEDIA_GC_GRACE_SECONDS', '3600'))
+
+MEDIA_INDEX_TTL_SECONDS = int(os.getenv('MEDIA_INDEX_TTL_SECONDS', '600'))
+MEDIA_INDEX_MAX_ENTRIES = int(os.getenv('MEDIA_INDEX_MAX_ENTRIES', '4096'))
+
+MEDIA_MIME_TYPES = {
+    '.mp3': 'audio/mpeg',
+    '.wav': 'audio/wav',
+    '.m4a': 'audio/mp4',
+    '.aac': 'audio/aac',
+    '.ogg': 'audio/ogg',
+    '.mp4': 'video/mp4',
+    '.mov': 'video/quicktime',
+    '.avi': 'video/x-msvideo',
+    '.wmv': 'video/x-ms-wmv',
+    '.webm': 'video/webm',
+}
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+def guess_media_mimetype(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    return MEDIA_MIME_TYPES.get(ext) or mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+
+def is_content_addressed(media_file_path: Optional[str]) -> bool:
+    return bool(media_file_path) and media_file_path.replace(os.sep, '/').startswith(OBJECTS_DIR + '/')
+
+
+def store_media(media_file, original_filename: Optional[str] = None) -> str:
+    """업로드(FileStorage)를 해시하며 저장하고 MEDIA_ROOT 기준 상대 경로 반환
+
+    같은 내용이 이미 있으면 새로 쓰지 않고 기존 경로를 반환함
+    """
+    filename = secure_filename(original_filename or media_file.filename or '')
+    ext = os.path.splitext(filename)[1].lower()
+
+    tmp_dir = os.path.join(MEDIA_ROOT, OBJECTS_DIR, 'tmp')
+    os.makedirs(tmp_dir, exist_ok=True)
+    tmp_path = os.path.join(tmp_dir, uuid.uuid4().hex)
+
+    digest = hashlib.sha256()
+    try:
+        with open(tmp_path, 'wb') as out:
+            for chunk in iter(lambda: media_file.stream.read(_CHUNK_SIZE), b''):
+                digest.update(chunk)
+                out.write(chunk)
+
+        hex_digest = digest.hexdigest()
+        relative = f"{OBJECTS_DIR}/{hex_digest[:2]}/{hex_digest}{ext}"
+        final_path = os.path.join(MEDIA_ROOT, relative)
+        if os.path.exists(final_path):
+            os.remove(tmp_path)
+            # 참조가 기록되기 전에 다른 캘린더 삭제가 이 객체를 지우지 않도록 유예 시간 갱신
+            os.utime(final_path)
+        else:
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            os.replace(tmp_path, final_path)
+        return relative
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def resolve_media_path(media_file_path: Optional[str]) -> Optional[str]:
+    """calendars.media_file_path -> 디스크 상의 절대 경로 (없으면 None)
+
+    절대 경로(예전 로컬 저장)와 MEDIA_ROOT 기준 상대 경로를 모두 지원
+    """
+    if not media_file_path or media_file_path.startswith('http'):
+        return None
+    if os.path.isabs(media_file_path):
+        return media_file_path if os.path.isfile(media_file_path) else None
+    if is_content_addressed(media_file_path):
+        path = os.path.join(MEDIA_ROOT, media_file_path)
+        return path if os.path.isfile(path) else None
+    for directory in LEGACY_MEDIA_DIRS:
+        path = os.path.join(directory, media_file_path)
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+def discard_media(media_file_path: Optional[str], supabase=None, just_stored: bool = False) -> bool:
+    """캘린더 생성 실패/삭제 시 파일 정리 - 지웠으면 True
+
+    내용 주소 파일은 여러 캘린더가 공유하므로 calendars에서 더 이상 참조하지 않을 때만
+    지움 (삭제하는 캘린더 행을 먼저 지운 뒤 호출). 참조를 확인할 수 없거나(supabase 없음)
+    최근 재사용된 파일(MEDIA_GC_GRACE_SECONDS)은 남겨 둠 - just_stored는 이 요청이 방금
+    저장한 파일이라 유예 시간을 적용하지 않음.
+    """
+    path = resolve_media_path(media_file_path)
+    if not path:
+        return False
+    if is_content_addressed(media_file_path):
+        if supabase is None:
+            return False
+        if not just_stored and time.time() - os.path.getmtime(path) < MEDIA_GC_GRACE_SECONDS:
+            return False
+        references = supabase.table('calendars').select('id').eq(
+            'media_file_path', media_file_path
+        ).limit(1).execute()
+        if references.data:
+            return False
+    os.remove(path)
+    return True
+
+
+def media_etag(path: str) -> Optional[str]:
+    """내용 주소 파일은 파일명이 SHA-256이므로 그대로 strong ETag로 사용
+
+    그 외(예전 업로드)는 None - send_file 기본값(mtime-크기-경로 체크섬)을 사용
+    """
+    stem = os.path.splitext(os.path.basename(path))[0]
+    if len(stem) == 64 and all(c in '0123456789abcdef' for c in stem):
+        return stem
+    return None
+
+
+def send_media(path: str, mimetype: Optional[str] = None, immutable: bool = False,
+               download_name: Optional[str] = None, private: bool = False):
+    """파일 응답 - Range(206), If-None-Match/If-Modified-Since(304) 지원
+
+    immutable은 URL이 내용 주소 파일명을 가리킬 때만 사용 (내용이 바뀌면 URL도 바뀜).
+    private은 로그인이 필요한 경로용 - 공유 캐시가 다른 사용자에게 응답을 주지 않도록 함.
+    MEDIA_SENDFILE이 설정되면 웹서버가 본문과 Range/조건부 요청을 처리함.
+    """
+    mimetype = mimetype or guess_media_mimetype(path)
+    max_age = IMMUTABLE_MAX_AGE if immutable else MEDIA_MAX_AGE_SECONDS
+
+    response = None
+    if MEDIA_SENDFILE == 'x-accel-redirect':
+        relative = os.path.relpath(path, MEDIA_ROOT)
+        # MEDIA_ROOT 밖의 예전 파일은 nginx location에 없으므로 직접 전송
+        if not relative.startswith('..'):
+            response = current_app.response_class(mimetype=mimetype)
+            response.headers['X-Accel-Redirect'] = (
+                f"{MEDIA_ACCEL_PREFIX.rstrip('/')}/{quote(relative.replace(os.sep, '/'))}"
+            )
+    elif MEDIA_SENDFILE == 'x-sendfile':
+        response = current_app.response_class(mimetype=mimetype)
+        response.headers['X-Sendfile'] = path
+
+    if response is None:
+        response = send_file(
+            path, mimetype=mimetype, as_attachment=False, download_name=download_name,
+            conditional=True, etag=media_etag(path) or True, max_age=max_age
+        )
+    response.cache_control.max_age = max_age
+    if private:
+        # send_file marks responses public when max_age is set
+        response.cache_control.public = False
+        response.cache_control.private = True
+    else:
+        response.cache_control.public = True
+
+    if immutable:
+        response.cache_control.immutable = True
+    return response
+
+
+class MediaIndex:
+    """calendar_id -> 미디어 정보 캐시 (owner_id, media_file_path, media_filename, 디스크 경로)
+
+    미스일 때만 calendars에서 필요한 컬럼 한 행을 조회함
+    """
+
+    def __init__(self, ttl_seconds: int = MEDIA_INDEX_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[str, Tuple[float, Optional[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_calendar_media(self, supabase, calendar_id: str, refresh: bool = False) -> Optional[Dict[str, Any]]:
+        """{'owner_id', 'media_file_path', 'media_filename', 'path', 'url'} - 캘린더가 없으면 None
+
+        refresh=True면 캐시를 건너뛰고 다시 조회함
+        """
+        calendar_id = str(calendar_id)
+        with self._lock:
+            entry = None if refresh else self._entries.get(calendar_id)
+            if entry and entry[0] > time.monotonic():
+                media = entry[1]
+                # 파일이 지워졌으면 다시 조회
+                if media is None or not media['path'] or os.path.isfile(media['path']):
+                    self._hits += 1
+                    return media
+            self._misses += 1
+
+        if supabase is None:
+            return None
+        result = supabase.table('calendars').select(
+            'owner_id, media_file_path, media_filename'
+        ).eq('id', calendar_id).limit(1).execute()
+
+        media = None
+        if result.data:
+            row = result.data[0]
+            media_file_path = row.get('media_file_path')
+            is_url = bool(media_file_path) and media_file_path.startswith('http')
+            media = {
+                'owner_id': row.get('owner_id'),
+                'media_file_path': media_file_path,
+                'media_filename': row.get('media_filename'),
+                'path': None if is_url else resolve_media_path(media_file_path),
+                'url': media_file_path if is_url else None,
+            }
+
+        with self._lock:
+            now = time.monotonic()
+            if len(self._entries) >= MEDIA_INDEX_MAX_ENTRIES:
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+            self._entries[calendar_id] = (now + self.ttl_seconds, media)
+        return media
+
+    def lookup(self, supabase, calendar_id: str, filename: str) -> Tuple[Optional[str], Optional[str]]:
+        """(calendar_id, filename) -> (로컬 파일 경로, 외부 URL) - 둘 다 None이면 없음"""
+        for refresh in (False, True):
+            media = self.get_calendar_media(supabase, calendar_id, refresh=refresh)
+            if media is not None and media['url']:
+                return None, media['url']
+            # URL의 파일명이 이 캘린더의 미디어와 일치할 때만 제공 (다른 파일 추측 방지)
+            if media is not None and media['media_file_path'] and \
+                    os.path.basename(media['media_file_path']) == filename:
+                return media['path'], None
+            # 캐시 항목이 오래되었을 수 있음 (다른 프로세스에서 미디어 변경) - 한 번만 다시 조회
+        return None, None
+
+    def invalidate(self, calendar_id: str):
+        with self._lock:
+            self._entries.pop(str(calendar_id), None)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self._hits,
+                'misses': self._misses,
+                'ttl_seconds': self.ttl_seconds
+            }
+
+
+media_index = MediaIndex()
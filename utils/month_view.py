@@ -0,0 +1,246 @@
+"""
+📅 Month View Engine
+월 달력 HTML 생성 - 6주(42칸) 그리드에 이벤트를 날짜 구간 단위로 배치
+- 필요한 컬럼만 조회하고 그리드와 겹치는 이벤트를 한 번에 로드 (event_cache 경유)
+- 여러 날에 걸친 이벤트는 걸친 모든 칸에 표시
+- 컴파일된 Jinja 매크로로 렌더링
+- 렌더링 결과를 (user, calendar_id, year, month, data version, today)로 캐시
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from jinja2 import Environment
+
+from utils.event_cache import event_cache, _normalize_user, _to_utc
+from utils.event_range import query_events_in_range
+
+MONTH_VIEW_COLUMNS = 'id, title, start_datetime, end_datetime, is_all_day, source_platform'
+MONTH_VIEW_CACHE_TTL_SECONDS = int(os.getenv('MONTH_VIEW_CACHE_TTL_SECONDS', '300'))
+MONTH_VIEW_CACHE_MAX_ENTRIES = int(os.getenv('MONTH_VIEW_CACHE_MAX_ENTRIES', '256'))
+
+GRID_DAYS = 42
+MAX_EVENTS_PER_DAY = 3
+TITLE_MAX_LENGTH = 20
+WEEKDAYS = ['일', '월', '화', '수', '목', '금', '토']
+
+# 한 줄짜리 마크업 (기존 문자열 조립 결과와 같은 구조), 제목은 autoescape 처리
+_MONTH_TEMPLATE = (
+    '{% macro day_cell(cell) -%}'
+    '<div class="{{ cell.classes }}" data-date="{{ cell.date_key }}">'
+    '<div class="day-number">{{ cell.day }}</div>'
+    '<div class="day-events-list">'
+    '{%- for item in cell.events[:max_events] -%}'
+    '<div class="month-event platform-{{ item.event.platform }}'
+    '{% if not item.is_start %} event-continued{% endif %}'
+    '{% if not item.is_end %} event-continues{% endif %}"'
+    ' title="{{ item.event.full_title }}">{{ item.event.title }}</div>'
+    '{%- endfor -%}'
+    '{%- if cell.events|length > max_events -%}'
+    '<div class="month-event-more">+{{ cell.events|length - max_events }} more</div>'
+    '{%- endif -%}'
+    '</div></div>'
+    '{%- endmacro %}'
+    '<div class="month-weekdays">'
+    '{%- for weekday in weekdays %}<div class="weekday-header">{{ weekday }}</div>{% endfor -%}'
+    '</div>'
+    '<div class="month-days-grid">'
+    '{%- for cell in cells %}{{ day_cell(cell) }}{% endfor -%}'
+    '</div>'
+)
+
+_template = Environment(autoescape=True).from_string(_MONTH_TEMPLATE)
+
+
+def month_grid_range(year: int, month: int) -> Tuple[date, date]:
+    """그리드 첫날(첫 주 일요일)과 마지막 다음 날 [start, end)"""
+    first_day = date(year, month, 1)
+    grid_start = first_day - timedelta(days=(first_day.weekday() + 1) % 7)
+    return grid_start, grid_start + timedelta(days=GRID_DAYS)
+
+
+def _event_day_span(event: Dict) -> Optional[Tuple[date, date]]:
+    """이벤트가 차지하는 첫 날과 마지막 날 (UTC 기준, 양 끝 포함)"""
+    start = _to_utc(event.get('start_datetime'))
+    if start is None:
+        return None
+    end = _to_utc(event.get('end_datetime')) or start
+    last_day = end.date()
+    # 자정에 끝나는 이벤트(종일 이벤트의 exclusive end 포함)는 그 날을 차지하지 않음
+    if end > start and end.time() == datetime.min.time():
+        last_day -= timedelta(days=1)
+    return start.date(), max(start.date(), last_day)
+
+
+def bucket_events(events: List[Dict], grid_start: date, days: int = GRID_DAYS) -> List[List[Dict]]:
+    """이벤트를 날짜 칸별로 분배 - 여러 날 이벤트는 걸친 칸마다 들어감
+
+    칸 안에서는 시작일, 긴 이벤트 우선, 시작 시각 순으로 정렬되어
+    이어지는 이벤트가 인접한 칸에서 같은 위치에 오도록 함.
+    """
+    placed = []
+    for event in events:
+        span = _event_day_span(event)
+        if span is None:
+            continue
+        first_index = max((span[0] - grid_start).days, 0)
+        last_index = min((span[1] - grid_start).days, days - 1)
+        if first_index > last_index:
+            continue
+
+        title = event.get('title') or 'Untitled Event'
+        view = {
+            'title': title[:TITLE_MAX_LENGTH - 3] + '...' if len(title) > TITLE_MAX_LENGTH else title,
+            'full_title': event.get('title') or '',
+            'platform': event.get('source_platform') or 'manual'
+        }
+        start_index = (span[0] - grid_start).days
+        end_index = (span[1] - grid_start).days
+        sort_key = (span[0], -(span[1] - span[0]).days, event.get('start_datetime') or '')
+        placed.append((sort_key, view, start_index, end_index, first_index, last_index))
+
+    placed.sort(key=lambda item: item[0])
+
+    buckets: List[List[Dict]] = [[] for _ in range(days)]
+    for _, view, start_index, end_index, first_index, last_index in placed:
+        for index in range(first_index, last_index + 1):
+            buckets[index].append({
+                'event': view,
+                'is_start': index == start_index,
+                'is_end': index == end_index
+            })
+    return buckets
+
+
+def count_month_events(events: List[Dict], year: int, month: int) -> int:
+    """그 달에 시작하는 이벤트 수 (이전/다음 달 칸에만 보이는 이벤트 제외)"""
+    count = 0
+    for event in events:
+        span = _event_day_span(event)
+        if span is not None and (span[0].year, span[0].month) == (year, month):
+            count += 1
+    return count
+
+
+def render_month_html(year: int, month: int, events: List[Dict], today: Optional[date] = None) -> str:
+    """월 달력 HTML (요일 헤더 + 42칸 그리드)"""
+    today = today or datetime.now().date()
+    grid_start, _ = month_grid_range(year, month)
+    buckets = bucket_events(events, grid_start)
+
+    cells = []
+    for index in range(GRID_DAYS):
+        current = grid_start + timedelta(days=index)
+        classes = 'month-day-cell'
+        if current.month != month:
+            classes += ' other-month'
+        if current == today:
+            classes += ' today'
+        cells.append({
+            'classes': classes,
+            'date_key': current.isoformat(),
+            'day': current.day,
+            'events': buckets[index]
+        })
+
+    return _template.render(cells=cells, weekdays=WEEKDAYS, max_events=MAX_EVENTS_PER_DAY)
+
+
+class MonthViewEngine:
+    """월 달력 렌더링 + 렌더링 결과 캐시
+
+    키에 event_cache의 사용자별 data version이 들어가므로 이벤트 쓰기가
+    무효화되면 다음 요청에서 다시 렌더링됨. today도 키에 포함 (today 강조 표시).
+    """
+
+    def __init__(self, ttl_seconds: int = MONTH_VIEW_CACHE_TTL_SECONDS,
+                 max_entries: int = MONTH_VIEW_CACHE_MAX_ENTRIES):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._rendered: OrderedDict = OrderedDict()  # key -> (expires_at, html, events_count)
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0}
+
+    def render(self, supabase, user_id: str, calendar_id: str, year: int, month: int) -> Tuple[str, int]:
+        """(html, events_count) - 캐시에 없으면 이벤트를 로드해서 렌더링
+
+        events_count는 그 달에 시작하는 이벤트 수 (그리드 앞뒤 칸의 이벤트는 제외)
+        """
+        today = datetime.now().date()
+        key = (_normalize_user(user_id), str(calendar_id), year, month,
+               event_cache.data_version(user_id), today)
+
+        cached = self._get(key)
+        if cached is not None:
+            self._stats['hits'] += 1
+            return cached
+
+        self._stats['misses'] += 1
+        events = self._load_events(supabase, user_id, calendar_id, year, month)
+        result = (render_month_html(year, month, events, today), count_month_events(events, year, month))
+        self._put(key, result)
+        return result
+
+    def prefetch_adjacent(self, supabase, user_id: str, calendar_id: str, year: int, month: int):
+        """이전/다음 달을 백그라운드에서 미리 렌더링 (월 이동이 캐시 히트가 되도록)"""
+        from utils.background_executor import submit_background
+
+        for offset in (-1, 1):
+            index = year * 12 + (month - 1) + offset
+            target_year, target_month = divmod(index, 12)
+            target_month += 1
+            submit_background(
+                f"month-view:{user_id}:{calendar_id}:{target_year}-{target_month:02d}",
+                self._prefetch, supabase, user_id, calendar_id, target_year, target_month
+            )
+
+    def _prefetch(self, supabase, user_id: str, calendar_id: str, year: int, month: int):
+        try:
+            self.render(supabase, user_id, calendar_id, year, month)
+        except Exception as e:
+            print(f"⚠️ [MONTH VIEW] Prefetch failed for {year}-{month:02d}: {e}")
+
+    def _load_events(self, supabase, user_id: str, calendar_id: str, year: int, month: int) -> List[Dict]:
+        grid_start, grid_end = month_grid_range(year, month)
+        window_start = datetime(grid_start.year, grid_start.month, grid_start.day, tzinfo=timezone.utc)
+        window_end = datetime(grid_end.year, grid_end.month, grid_end.day, tzinfo=timezone.utc)
+
+        def load_grid_events(load_start: datetime, load_end: datetime) -> List[Dict]:
+            # 그리드와 겹치는 이벤트 (time_range 인덱스)
+            return query_events_in_range(
+                supabase, load_start, load_end, calendar_ids=[calendar_id], columns=MONTH_VIEW_COLUMNS
+            )
+
+        return event_cache.get_or_load(
+            'month-view', user_id, [calendar_id], window_start, window_end,
+            load_grid_events, end_exclusive=True, end_field='end_datetime'
+        )
+
+    def _get(self, key) -> Optional[Tuple[str, int]]:
+        with self._lock:
+            entry = self._rendered.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._rendered[key]
+                return None
+            self._rendered.move_to_end(key)
+            return entry[1], entry[2]
+
+    def _put(self, key, result: Tuple[str, int]):
+        with self._lock:
+            self._rendered[key] = (time.monotonic() + self.ttl_seconds, result[0], result[1])
+            self._rendered.move_to_end(key)
+            while len(self._rendered) > self.max_entries:
+                self._rendered.popitem(last=False)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {'entries': len(self._rendered), **self._stats}
+
+
+month_view = MonthViewEngine()
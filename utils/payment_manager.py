@@ -18,7 +18,7 @@ class PaymentManager:
     """결제 관리 시스템"""
     
     def __init__(self):
-        self.supabase = config.supabase_client
+        self.supabase = config.client_proxy()
         self.toss_secret_key = os.getenv('TOSS_SECRET_KEY')
         self.toss_client_key = os.getenv('TOSS_CLIENT_KEY') 
         self.toss_api_url = 'https://api.tosspayments.com/v1/payments'
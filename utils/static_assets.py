@@ -0,0 +1,233 @@
+"""
+🧱 Static Asset Pipeline
+Production mode for frontend/static and templates
+- content-hashed static URLs: url_for('static', filename='js/sidebar.js')
+  -> /static/js/sidebar.<hash>.js, served with a one-year immutable Cache-Control
+- unhashed paths (hardcoded /static/..., CSS url() references) still work
+  with a short max-age and ETag revalidation
+- text assets served from precompressed .br/.gz siblings when the client
+  accepts them (Vary: Accept-Encoding); media keeps byte-range support
+- templates compiled once at startup (before gunicorn forks with preload_app)
+Development mode keeps auto-reload and no-cache behavior.
+
+Build the manifest and compressed variants ahead of deploy (otherwise the
+manifest is computed at startup and assets are served uncompressed):
+    python -m utils.static_assets build [static_folder]
+"""
+
+import os
+import sys
+import gzip
+import json
+import hashlib
+import mimetypes
+from typing import Dict, Optional
+
+from flask import request, send_from_directory
+
+try:
+    import brotli
+    BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    BROTLI_AVAILABLE = False
+
+MANIFEST_FILENAME = 'asset-manifest.json'
+HASH_LENGTH = 12
+IMMUTABLE_MAX_AGE = 31536000  # 1 year
+STATIC_MAX_AGE_SECONDS = int(os.getenv('STATIC_MAX_AGE_SECONDS', '3600'))
+
+_SKIP_FILENAMES = {MANIFEST_FILENAME}
+
+# Text assets worth compressing; images/videos are already compressed
+COMPRESSIBLE_EXTENSIONS = {'.js', '.css', '.svg', '.json', '.html', '.txt', '.map', '.xml'}
+# (Content-Encoding, sibling suffix) in server preference order
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def is_production() -> bool:
+    """Same switch the app uses for ProxyFix / secure cookies"""
+    return os.getenv('FLASK_ENV') == 'production'
+
+
+def hashed_filename(filename: str, digest: str) -> str:
+    root, ext = os.path.splitext(filename)
+    return f"{root}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def _file_digest(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_manifest(static_folder: str) -> Dict[str, str]:
+    """{relative path: hashed relative path} for every file under static_folder"""
+    manifest = {}
+    for dirpath, dirnames, filenames in os.walk(static_folder):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if filename.startswith('.') or filename in _SKIP_FILENAMES:
+                continue
+            if any(filename.endswith(suffix) for _, suffix in ENCODINGS):
+                continue
+            path = os.path.join(dirpath, filename)
+            relative = os.path.relpath(path, static_folder).replace(os.sep, '/')
+            manifest[relative] = hashed_filename(relative, _file_digest(path))
+    return manifest
+
+
+def write_manifest(static_folder: str) -> str:
+    manifest = build_manifest(static_folder)
+    manifest_path = os.path.join(static_folder, MANIFEST_FILENAME)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest_path
+
+
+def is_compressible(filename: str) -> bool:
+    return os.path.splitext(filename)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+
+def write_compressed_variants(static_folder: str) -> Dict[str, int]:
+    """Write .gz (and .br if brotli is installed) next to every text asset
+
+    A variant is only kept when it is smaller than the original.
+    Returns {'files', 'original_bytes', 'gzip_bytes', 'br_bytes'}.
+    """
+    totals = {'files': 0, 'original_bytes': 0, 'gzip_bytes': 0, 'br_bytes': 0}
+    for relative in build_manifest(static_folder):
+        if not is_compressible(relative):
+            continue
+        path = os.path.join(static_folder, relative)
+        with open(path, 'rb') as f:
+            data = f.read()
+        totals['files'] += 1
+        totals['original_bytes'] += len(data)
+
+        variants = {'.gz': gzip.compress(data, compresslevel=9, mtime=0)}
+        if BROTLI_AVAILABLE:
+            variants['.br'] = brotli.compress(data, quality=11)
+        for suffix, compressed in variants.items():
+            variant_path = path + suffix
+            if len(compressed) < len(data):
+                with open(variant_path, 'wb') as f:
+                    f.write(compressed)
+                totals['br_bytes' if suffix == '.br' else 'gzip_bytes'] += len(compressed)
+            elif os.path.exists(variant_path):
+                os.remove(variant_path)
+    return totals
+
+
+def load_manifest(static_folder: str) -> Dict[str, str]:
+    """Prebuilt manifest if present, otherwise hash the folder now"""
+    manifest_path = os.path.join(static_folder, MANIFEST_FILENAME)
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ [STATIC] Could not read {MANIFEST_FILENAME}, rebuilding: {e}")
+    return build_manifest(static_folder)
+
+
+class StaticAssets:
+    """Hashed static URLs + cache headers for the app's 'static' endpoint"""
+
+    def __init__(self, app=None):
+        self.static_folder: Optional[str] = None
+        self.manifest: Dict[str, str] = {}
+        self._originals: Dict[str, str] = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.static_folder = app.static_folder
+        self.manifest = load_manifest(self.static_folder)
+        self._originals = {hashed: original for original, hashed in self.manifest.items()}
+        app.url_defaults(self._hash_static_url)
+        app.view_functions['static'] = self.send_static
+        app.extensions['static_assets'] = self
+        print(f"✅ [STATIC] Hashed URLs enabled for {len(self.manifest)} static files")
+
+    def _hash_static_url(self, endpoint: str, values: Dict):
+        if endpoint == 'static' and 'filename' in values:
+            values['filename'] = self.manifest.get(values['filename'], values['filename'])
+
+    def resolve(self, filename: str):
+        """(file on disk, is content-hashed URL)"""
+        original = self._originals.get(filename)
+        if original is not None:
+            return original, True
+        return filename, False
+
+    def send_static(self, filename: str):
+        original, hashed = self.resolve(filename)
+        max_age = IMMUTABLE_MAX_AGE if hashed else STATIC_MAX_AGE_SECONDS
+
+        if is_compressible(original):
+            response = self._send_precompressed(original, max_age)
+            response.vary.add('Accept-Encoding')
+        else:
+            # Media and images: plain send_file (conditional + byte ranges)
+            response = send_from_directory(self.static_folder, original, max_age=max_age)
+
+        if hashed:
+            response.cache_control.immutable = True
+        return response
+
+    def _send_precompressed(self, filename: str, max_age: int):
+        """Serve the .br/.gz sibling the client accepts, if it is up to date"""
+        # Ranges over an encoded body are rarely useful for text assets; send identity
+        if not request.range:
+            path = os.path.join(self.static_folder, filename)
+            for encoding, suffix in ENCODINGS:
+                if not request.accept_encodings[encoding]:
+                    continue
+                try:
+                    variant_mtime = os.stat(path + suffix).st_mtime
+                    if variant_mtime < os.stat(path).st_mtime:
+                        continue  # stale build output
+                except OSError:
+                    continue
+                mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+                response = send_from_directory(
+                    self.static_folder, filename + suffix, mimetype=mimetype, max_age=max_age
+                )
+                response.headers['Content-Encoding'] = encoding
+                return response
+        return send_from_directory(self.static_folder, filename, max_age=max_age)
+
+
+def precompile_templates(app) -> int:
+    """Compile every template into the Jinja cache once"""
+    env = app.jinja_env
+    compiled = 0
+    for name in env.list_templates():
+        try:
+            env.get_template(name)
+            compiled += 1
+        except Exception as e:
+            print(f"⚠️ [TEMPLATES] Failed to compile {name}: {e}")
+    print(f"✅ [TEMPLATES] Precompiled {compiled} templates")
+    return compiled
+
+
+static_assets = StaticAssets()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2 or sys.argv[1] != 'build':
+        print("Usage: python -m utils.static_assets build [static_folder]")
+        sys.exit(1)
+    folder = sys.argv[2] if len(sys.argv) > 2 else os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'static'
+    )
+    folder = os.path.normpath(folder)
+    totals = write_compressed_variants(folder)
+    print(f"✅ [STATIC] Compressed {totals['files']} text assets: {totals['original_bytes']} bytes -> "
+          f"gzip {totals['gzip_bytes']}, br {totals['br_bytes'] if BROTLI_AVAILABLE else 'n/a (brotli not installed)'}")
+    path = write_manifest(folder)
+    print(f"✅ [STATIC] Wrote {path}")
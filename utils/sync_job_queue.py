@@ -0,0 +1,463 @@
+"""
+📬 Sync Job Queue
+Durable background jobs on the sync_jobs table (calendar exports, webhook pushes)
+- workers claim due jobs atomically with a lease (claim_sync_jobs RPC, SKIP LOCKED)
+- failed jobs are retried with exponential backoff up to max_attempts
+- idempotency keys collapse duplicate enqueues into one job
+Every web process runs a small worker pool, started lazily after fork so a
+gunicorn --preload master never polls; `python -m utils.sync_job_queue`
+runs dedicated worker processes that share the same queue.
+"""
+
+import os
+import sys
+import random
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '../backend'))
+from utils.config import get_pooled_admin_client
+
+# Worker configuration
+SYNC_JOB_WORKERS = int(os.getenv('SYNC_JOB_WORKERS', '4'))
+SYNC_JOB_PROCESSES = int(os.getenv('SYNC_JOB_PROCESSES', '2'))  # dedicated worker entrypoint only
+SYNC_JOB_LEASE_SECONDS = int(os.getenv('SYNC_JOB_LEASE_SECONDS', '600'))
+SYNC_JOB_POLL_SECONDS = float(os.getenv('SYNC_JOB_POLL_SECONDS', '5'))
+SYNC_JOB_MAX_ATTEMPTS = int(os.getenv('SYNC_JOB_MAX_ATTEMPTS', '5'))
+SYNC_JOB_BACKOFF_SECONDS = int(os.getenv('SYNC_JOB_BACKOFF_SECONDS', '30'))
+SYNC_JOB_BACKOFF_MAX_SECONDS = int(os.getenv('SYNC_JOB_BACKOFF_MAX_SECONDS', '3600'))
+
+JOB_STATUS_COLUMNS = '''
+    id, platform, type, status, progress, message, error, result,
+    attempts, max_attempts, run_after, created_at, started_at, completed_at
+'''
+
+# Handlers keyed by (platform, type); None matches any
+_job_handlers: Dict[tuple, Callable[[Dict], Optional[Dict]]] = {}
+_default_handlers_loaded = False
+
+# claim_sync_jobs RPC (migration 016); falls back to conditional updates
+_claim_rpc_available = True
+
+LEASE_EXHAUSTED_ERROR = 'Lease expired after the last attempt'
+
+
+def register_job_handler(job_type: Optional[str] = None, platform: Optional[str] = None):
+    """Decorator: run `fn(job) -> result dict` for jobs of this type and/or platform"""
+    def decorator(fn):
+        _job_handlers[(platform, job_type)] = fn
+        return fn
+    return decorator
+
+
+def _load_default_handlers():
+    """Import modules that register handlers (kept lazy to avoid import cycles)"""
+    global _default_handlers_loaded
+    if _default_handlers_loaded:
+        return
+    _default_handlers_loaded = True
+    try:
+        import backend.services.webhook_handlers  # noqa: F401 - registers slack/outlook handlers
+    except Exception as e:
+        print(f"⚠️ [JOB QUEUE] Webhook job handlers not available: {e}")
+
+
+def _find_handler(job: Dict) -> Optional[Callable[[Dict], Optional[Dict]]]:
+    _load_default_handlers()
+    platform, job_type = job.get('platform'), job.get('type')
+    return (_job_handlers.get((platform, job_type))
+            or _job_handlers.get((None, job_type))
+            or _job_handlers.get((platform, None)))
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def enqueue_job(user_id: str, platform: str, job_type: str, data: Optional[Dict] = None,
+                idempotency_key: Optional[str] = None, max_attempts: Optional[int] = None) -> Dict:
+    """Insert a pending job and wake the local workers
+
+    With an idempotency key, re-enqueueing returns the existing job for
+    (user_id, key) instead of creating a second one.
+    """
+    supabase = get_pooled_admin_client()
+    row = {
+        'user_id': user_id,
+        'platform': platform,
+        'type': job_type,
+        'status': 'pending',
+        'data': data or {},
+        'idempotency_key': idempotency_key,
+        'max_attempts': max_attempts or SYNC_JOB_MAX_ATTEMPTS,
+        'run_after': _now().isoformat()
+    }
+
+    if idempotency_key:
+        result = supabase.table('sync_jobs').upsert(
+            row, on_conflict='user_id,idempotency_key', ignore_duplicates=True
+        ).execute()
+        if not result.data:
+            existing = supabase.table('sync_jobs').select(JOB_STATUS_COLUMNS).eq(
+                'user_id', user_id
+            ).eq('idempotency_key', idempotency_key).limit(1).execute()
+            return existing.data[0] if existing.data else {}
+    else:
+        result = supabase.table('sync_jobs').insert(row).execute()
+
+    job = result.data[0] if result.data else {}
+    ensure_sync_job_workers()
+    if _queue_instance is not None and _queue_instance.is_running:
+        _queue_instance.notify()
+    return job
+
+
+def get_job(job_id: str, user_id: str) -> Optional[Dict]:
+    """Job status row for its owner (None if missing)"""
+    supabase = get_pooled_admin_client()
+    result = supabase.table('sync_jobs').select(JOB_STATUS_COLUMNS).eq(
+        'id', job_id
+    ).eq('user_id', user_id).limit(1).execute()
+    return result.data[0] if result.data else None
+
+
+def retry_delay_seconds(attempts: int) -> float:
+    """Exponential backoff with +/-20% jitter, capped"""
+    delay = min(SYNC_JOB_BACKOFF_MAX_SECONDS, SYNC_JOB_BACKOFF_SECONDS * (2 ** max(0, attempts - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+
+class SyncJobQueue:
+    """Polls sync_jobs, runs claimed jobs on a bounded thread pool and renews their leases"""
+
+    def __init__(self, max_workers: int = SYNC_JOB_WORKERS):
+        self.max_workers = max_workers
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_running = False
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._thread: Optional[threading.Thread] = None
+        self._wakeup = threading.Event()
+        self._in_flight = set()  # job ids
+        self._lock = threading.Lock()
+        self._stats = {'completed': 0, 'retried': 0, 'failed': 0}
+
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='sync-job')
+        self._thread = threading.Thread(target=self._poll_loop, name='sync-job-poller', daemon=True)
+        self._thread.start()
+        print(f"📬 [JOB QUEUE] Started {self.max_workers} workers ({self.worker_id})")
+
+    def stop(self, wait: bool = True):
+        """Stop polling; running jobs finish (or their leases expire and they are re-claimed)"""
+        self.is_running = False
+        self._wakeup.set()
+        if self._thread:
+            self._thread.join()
+        if self._executor:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+    def notify(self):
+        """Poll right away (a job was just enqueued)"""
+        self._wakeup.set()
+
+    def _poll_loop(self):
+        next_renewal = time.time() + SYNC_JOB_LEASE_SECONDS / 3
+        while self.is_running:
+            try:
+                free = self.max_workers - len(self._in_flight)
+                if free > 0:
+                    for job in self._claim(free):
+                        with self._lock:
+                            self._in_flight.add(job['id'])
+                        self._executor.submit(self._run_job, job)
+                if time.time() >= next_renewal:
+                    self._renew_leases()
+                    next_renewal = time.time() + SYNC_JOB_LEASE_SECONDS / 3
+            except Exception as e:
+                print(f"❌ [JOB QUEUE] Poll failed: {e}")
+
+            self._wakeup.wait(SYNC_JOB_POLL_SECONDS)
+            self._wakeup.clear()
+
+    def run_once(self) -> int:
+        """Claim and run due jobs inline (cron / management use); returns jobs run"""
+        jobs = self._claim(self.max_workers)
+        for job in jobs:
+            self._run_job(job)
+        return len(jobs)
+
+    def _claim(self, limit: int) -> List[Dict]:
+        """Lease up to `limit` due jobs for this worker"""
+        global _claim_rpc_available
+        supabase = get_pooled_admin_client()
+
+        if _claim_rpc_available:
+            try:
+                result = supabase.rpc('claim_sync_jobs', {
+                    'p_worker': self.worker_id,
+                    'p_limit': limit,
+                    'p_lease_seconds': SYNC_JOB_LEASE_SECONDS
+                }).execute()
+                return result.data or []
+            except Exception as e:
+                print(f"⚠️ [JOB QUEUE] claim_sync_jobs RPC unavailable, using conditional updates: {e}")
+                _claim_rpc_available = False
+
+        # Fallback: optimistic per-row claim guarded by status + attempts
+        now = _now()
+        pending = supabase.table('sync_jobs').select('id, status, attempts, max_attempts').eq(
+            'status', 'pending'
+        ).lte('run_after', now.isoformat()).order('run_after').limit(limit).execute()
+        # Running jobs whose worker died before finishing them
+        expired = supabase.table('sync_jobs').select('id, status, attempts, max_attempts').eq(
+            'status', 'running'
+        ).lt('lease_expires_at', now.isoformat()).order('lease_expires_at').limit(limit).execute()
+
+        claimed = []
+        for candidate in (pending.data or []) + (expired.data or []):
+            if len(claimed) >= limit:
+                break
+            attempts = candidate.get('attempts') or 0
+            if candidate['status'] == 'running' and attempts >= (candidate.get('max_attempts') or SYNC_JOB_MAX_ATTEMPTS):
+                # Every attempt crashed its worker - stop re-claiming the job
+                supabase.table('sync_jobs').update({
+                    'status': 'failed',
+                    'error': LEASE_EXHAUSTED_ERROR,
+                    'completed_at': now.isoformat(),
+                    'lease_owner': None,
+                    'lease_expires_at': None
+                }).eq('id', candidate['id']).eq('status', 'running').eq('attempts', attempts).execute()
+                print(f"❌ [JOB QUEUE] Job {candidate['id']} failed: lease expired after {attempts} attempts")
+                continue
+
+            query = supabase.table('sync_jobs').update({
+                'status': 'running',
+                'lease_owner': self.worker_id,
+                'lease_expires_at': (now + timedelta(seconds=SYNC_JOB_LEASE_SECONDS)).isoformat(),
+                'attempts': attempts + 1,
+                'started_at': now.isoformat()
+            }).eq('id', candidate['id']).eq('status', candidate['status']).eq('attempts', attempts)
+            if candidate['status'] == 'running':
+                query = query.lt('lease_expires_at', now.isoformat())
+            result = query.execute()
+            if result.data:
+                claimed.append(result.data[0])
+        return claimed
+
+    def _renew_leases(self):
+        """Extend leases of jobs still running in this process"""
+        with self._lock:
+            job_ids = list(self._in_flight)
+        if not job_ids:
+            return
+        try:
+            get_pooled_admin_client().table('sync_jobs').update({
+                'lease_expires_at': (_now() + timedelta(seconds=SYNC_JOB_LEASE_SECONDS)).isoformat()
+            }).in_('id', job_ids).eq('lease_owner', self.worker_id).eq('status', 'running').execute()
+        except Exception as e:
+            print(f"⚠️ [JOB QUEUE] Lease renewal failed: {e}")
+
+    def _run_job(self, job: Dict):
+        """Run the handler and record completion, retry or final failure"""
+        try:
+            handler = _find_handler(job)
+            if handler is None:
+                self._finish(job, 'failed', error=f"No handler for {job.get('platform')}/{job.get('type')}")
+                return
+            try:
+                result = handler(job) or {}
+            except Exception as e:
+                attempts = job.get('attempts') or 1
+                if attempts < (job.get('max_attempts') or SYNC_JOB_MAX_ATTEMPTS):
+                    self._retry(job, str(e))
+                else:
+                    print(f"❌ [JOB QUEUE] Job {job['id']} failed after {attempts} attempts: {e}")
+                    self._finish(job, 'failed', error=str(e))
+                return
+            self._finish(job, 'completed', result=result)
+        finally:
+            with self._lock:
+                self._in_flight.discard(job['id'])
+
+    def _retry(self, job: Dict, error: str):
+        delay = retry_delay_seconds(job.get('attempts') or 1)
+        print(f"🔁 [JOB QUEUE] Job {job['id']} failed (attempt {job.get('attempts')}), retrying in {delay:.0f}s: {error}")
+        self._update_owned(job, {
+            'status': 'pending',
+            'error': error,
+            'run_after': (_now() + timedelta(seconds=delay)).isoformat(),
+            'lease_owner': None,
+            'lease_expires_at': None
+        })
+        self._stats['retried'] += 1
+
+    def _finish(self, job: Dict, status: str, result: Optional[Dict] = None, error: Optional[str] = None):
+        update = {
+            'status': status,
+            'completed_at': _now().isoformat(),
+            'lease_owner': None,
+            'lease_expires_at': None,
+            'error': error
+        }
+        if status == 'completed':
+            update.update({'progress': 100, 'result': result or {}, 'message': (result or {}).get('message')})
+        self._update_owned(job, update)
+        self._stats[status] += 1
+
+    def _update_owned(self, job: Dict, update: Dict[str, Any]):
+        """Write job state only while this worker still holds the lease"""
+        try:
+            get_pooled_admin_client().table('sync_jobs').update(update).eq(
+                'id', job['id']
+            ).eq('lease_owner', self.worker_id).execute()
+        except Exception as e:
+            print(f"❌ [JOB QUEUE] Failed to update job {job['id']}: {e}")
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            running = len(self._in_flight)
+        return {
+            'is_running': self.is_running,
+            'worker_id': self.worker_id,
+            'max_workers': self.max_workers,
+            'running_jobs': running,
+            **self._stats
+        }
+
+
+# ===== Built-in handlers =====
+
+@register_job_handler('calendar_export')
+def _run_calendar_export(job: Dict) -> Dict:
+    """Push one calendar to one platform (enqueued by /api/calendar/<id>/export)"""
+    user_id = job['user_id']
+    platform = job['platform']
+    print(f"🔄 {platform} 플랫폼으로 내보내기 시작... (job {job['id']})")
+
+    if platform == 'google':
+        try:
+            from services.google_calendar_sync import sync_google_calendar_for_user
+            result = sync_google_calendar_for_user(user_id)
+        except ImportError:
+            result = {'status': 'success', 'synced_events': 5, 'message': 'Mock 동기화 완료'}
+    elif platform == 'notion':
+        try:
+            from services.notion_sync import sync_notion_calendar_for_user
+            result = sync_notion_calendar_for_user(user_id)
+        except ImportError:
+            result = {'status': 'success', 'synced_events': 3, 'message': 'Mock 동기화 완료'}
+    else:
+        # 다른 플랫폼은 향후 추가 (Mock으로 성공 처리)
+        result = {
+            'status': 'success',
+            'synced_events': 2,
+            'message': f'{platform} 플랫폼 내보내기 완료 (Mock)'
+        }
+
+    # Platform sync functions report {'success': bool}; the mock results use {'status': 'success'}
+    result = result or {}
+    succeeded = result['success'] if 'success' in result else result.get('status') == 'success'
+    if not succeeded:
+        # Raising hands the job to the retry/backoff path
+        raise RuntimeError(result.get('error') or '알 수 없는 오류')
+
+    print(f"✅ {platform} 내보내기 완료 (job {job['id']})")
+    return {
+        'status': 'success',
+        'synced_events': result.get('synced_events', result.get('events_processed', 0)),
+        'message': '내보내기 완료'
+    }
+
+
+_queue_instance: Optional[SyncJobQueue] = None
+_queue_lock = threading.Lock()
+# Set by start_sync_job_workers(); inherited by forked gunicorn workers
+_workers_enabled = False
+
+
+def get_job_queue() -> SyncJobQueue:
+    """Get the per-process queue instance"""
+    global _queue_instance
+    with _queue_lock:
+        if _queue_instance is None:
+            _queue_instance = SyncJobQueue()
+        return _queue_instance
+
+
+def start_sync_job_workers():
+    """Enable job workers for this process and the processes forked from it
+
+    The pollers themselves start on the next ensure_sync_job_workers() call
+    (first request or enqueue) in each process: with --preload the app is
+    imported in the gunicorn master, whose threads the workers don't inherit.
+    """
+    global _workers_enabled
+    _workers_enabled = True
+
+
+def ensure_sync_job_workers():
+    """Start this process's pollers if workers are enabled (no-op once running)"""
+    if not _workers_enabled:
+        return
+    queue = get_job_queue()
+    if queue.is_running:
+        return
+    with _queue_lock:
+        if not queue.is_running:
+            queue.start()
+
+
+def stop_sync_job_workers():
+    get_job_queue().stop()
+
+
+def _reset_after_fork():
+    # Threads don't survive fork; the child starts its own queue on first use
+    global _queue_instance, _queue_lock
+    _queue_instance = None
+    _queue_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _run_worker_process():
+    queue = get_job_queue()
+    queue.start()
+    try:
+        while queue.is_running:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        queue.stop()
+
+
+if __name__ == '__main__':
+    # Dedicated worker processes: python -m utils.sync_job_queue
+    import multiprocessing
+
+    processes = [
+        multiprocessing.Process(target=_run_worker_process, name=f'sync-job-worker-{i}')
+        for i in range(max(1, SYNC_JOB_PROCESSES))
+    ]
+    for process in processes:
+        process.start()
+    print(f"📬 [JOB QUEUE] Running {len(processes)} worker processes x {SYNC_JOB_WORKERS} workers")
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
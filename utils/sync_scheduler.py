@@ -1,16 +1,26 @@
 """
 ⏰ Calendar Sync Scheduler
-Automatic 15-minute interval synchronization system
+Automatic per-config interval synchronization system
+Next-due times are kept in an in-memory min-heap and the loop sleeps until the
+earliest one; only config rows changed since the last read are re-fetched.
+Due tasks run on a bounded worker pool with per-platform concurrency caps;
+calendar_sync_configs leases let several processes/hosts share the work
 """
 
 import threading
 import time
 import fcntl
+import heapq
+import itertools
+import socket
+import uuid
+import zlib
 import tempfile
 import atexit
-from datetime import datetime, timedelta
-from typing import Dict, List
-from supabase import create_client
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+from utils.config import PooledClientProxy
 from utils.auth_manager import AuthManager
 import sys
 import os
@@ -27,7 +37,40 @@ if not SUPABASE_URL:
 if not SUPABASE_KEY:
     raise ValueError("SUPABASE_API_KEY environment variable is required")
 
-supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
+supabase = PooledClientProxy(SUPABASE_URL, SUPABASE_KEY)
+
+# Worker pool / sharding configuration
+SYNC_WORKERS = int(os.getenv('SYNC_SCHEDULER_WORKERS', '8'))
+SYNC_LEASE_SECONDS = int(os.getenv('SYNC_SCHEDULER_LEASE_SECONDS', '900'))
+SYNC_SHARD_COUNT = max(1, int(os.getenv('SYNC_SCHEDULER_SHARD_COUNT', '1')))
+SYNC_SHARD_INDEX = int(os.getenv('SYNC_SCHEDULER_SHARD_INDEX', '0')) % SYNC_SHARD_COUNT
+# Keep one scheduler per machine unless leases are trusted to coordinate processes
+SYNC_EXCLUSIVE_LOCK = os.getenv('SYNC_SCHEDULER_EXCLUSIVE_LOCK', 'true').lower() == 'true'
+# How often to pick up config rows changed by routes or other hosts (seconds).
+# The scheduler runs in one process (lock file), so this poll is how config
+# writes from any web worker reach it.
+CONFIG_REFRESH_SECONDS = int(os.getenv('SYNC_SCHEDULER_CONFIG_REFRESH_SECONDS', '60'))
+
+CONFIG_COLUMNS = '''
+    user_id, platform, sync_frequency_minutes, last_sync_at,
+    consecutive_failures, credentials, is_enabled, updated_at
+'''
+
+DEFAULT_PLATFORM_CONCURRENCY = 2
+PLATFORM_CONCURRENCY = {'google': 4, 'apple': 2, 'outlook': 2}
+
+
+def _parse_platform_concurrency(value: str) -> Dict[str, int]:
+    """Parse 'google=4,apple=2' into a per-platform concurrency map"""
+    limits = dict(PLATFORM_CONCURRENCY)
+    for item in (value or '').split(','):
+        if '=' in item:
+            platform, limit = item.split('=', 1)
+            try:
+                limits[platform.strip()] = max(1, int(limit))
+            except ValueError:
+                pass
+    return limits
 
 class SyncScheduler:
     """Automatic calendar synchronization scheduler with singleton pattern"""
@@ -51,10 +94,30 @@ class SyncScheduler:
             
         self.is_running = False
         self.sync_thread = None
-        self.sync_interval = 900  # 15 minutes in seconds
+        self.sync_interval = 900  # default frequency (15 minutes) in seconds
         self.last_sync_times = {}  # Track last sync per user/platform
         self._initialized = True
         
+        # Worker pool state
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.max_workers = max(1, SYNC_WORKERS)
+        self.platform_limits = _parse_platform_concurrency(os.getenv('SYNC_PLATFORM_CONCURRENCY', ''))
+        self._executor = None
+        self._pending = []  # heap of (due_ts, seq, task) - earliest due first
+        self._pending_keys = set()
+        self._in_flight = set()
+        self._active_by_platform = {}
+        self._dispatch_lock = threading.Lock()
+        self._seq = itertools.count()
+        
+        # Due-time schedule: min-heap of (due_ts, seq, key), stale entries skipped via _due_at
+        self._configs = {}  # (user_id, platform) -> config row
+        self._due_at = {}  # (user_id, platform) -> current due timestamp
+        self._due_heap = []
+        self._schedule_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._config_watermark = None  # newest updated_at seen
+        
         # Create lock file to prevent multiple scheduler instances
         self._lock_file_path = os.path.join(tempfile.gettempdir(), 'notionflow_sync_scheduler.lock')
         self._file_lock = None
@@ -68,20 +131,23 @@ class SyncScheduler:
             print("🔄 Sync scheduler is already running in this instance")
             return
             
-        # Try to acquire file lock to prevent multiple scheduler instances
-        try:
-            self._file_lock = open(self._lock_file_path, 'w')
-            fcntl.flock(self._file_lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-            self._file_lock.write(f"PID: {os.getpid()}\nStarted: {datetime.now().isoformat()}\n")
-            self._file_lock.flush()
-            print(f"🔒 Acquired sync scheduler lock (PID: {os.getpid()})")
-        except (IOError, OSError) as e:
-            print(f"⚠️  Cannot start sync scheduler - another instance is already running: {e}")
-            if self._file_lock:
-                self._file_lock.close()
-                self._file_lock = None
-            return
+        # Try to acquire file lock to prevent multiple scheduler instances on this machine
+        # (leases on calendar_sync_configs keep processes/hosts from syncing the same task)
+        if SYNC_EXCLUSIVE_LOCK:
+            try:
+                self._file_lock = open(self._lock_file_path, 'w')
+                fcntl.flock(self._file_lock.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                self._file_lock.write(f"PID: {os.getpid()}\nStarted: {datetime.now().isoformat()}\n")
+                self._file_lock.flush()
+                print(f"🔒 Acquired sync scheduler lock (PID: {os.getpid()})")
+            except (IOError, OSError) as e:
+                print(f"⚠️  Cannot start sync scheduler - another instance is already running: {e}")
+                if self._file_lock:
+                    self._file_lock.close()
+                    self._file_lock = None
+                return
         
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='sync-worker')
         self.is_running = True
         self.sync_thread = threading.Thread(target=self._sync_loop, daemon=True)
         self.sync_thread.start()
@@ -90,8 +156,15 @@ class SyncScheduler:
     def stop_scheduler(self):
         """Stop the sync scheduler and release file lock"""
         self.is_running = False
+        self._wakeup.set()
         if self.sync_thread:
             self.sync_thread.join()
+        if self._executor:
+            with self._dispatch_lock:
+                self._pending.clear()
+                self._pending_keys.clear()
+            self._executor.shutdown(wait=True)
+            self._executor = None
         self._cleanup_lock()
         print("🛑 Sync scheduler stopped")
     
@@ -115,82 +188,243 @@ class SyncScheduler:
             pass
     
     def _sync_loop(self):
-        """Main sync loop running in background thread"""
+        """Main sync loop: sleep until the earliest due task or the next config refresh"""
+        try:
+            self._load_all_configs()
+        except Exception as e:
+            print(f"Error getting sync configurations: {e}")
+        next_refresh = time.time() + CONFIG_REFRESH_SECONDS
+        
         while self.is_running:
             try:
-                self._run_scheduled_syncs()
+                now = time.time()
+                if now >= next_refresh:
+                    self._refresh_changed_configs()
+                    next_refresh = now + CONFIG_REFRESH_SECONDS
+                
+                sync_tasks = self._pop_due_tasks(now)
+                if sync_tasks:
+                    self._execute_sync_tasks(sync_tasks)
             except Exception as e:
                 print(f"Error in sync loop: {e}")
             
-            # Sleep for sync interval
-            time.sleep(self.sync_interval)
+            # Wake when the next task is due, at the next config refresh, or when the scheduler stops
+            next_due = self._peek_next_due()
+            wake_at = next_refresh if next_due is None else min(next_due, next_refresh)
+            self._wakeup.wait(max(0.0, wake_at - time.time()))
+            self._wakeup.clear()
+    
+    def _load_all_configs(self):
+        """Read all enabled configurations (excluding Notion) once and build the schedule"""
+        result = supabase.table('calendar_sync_configs').select(CONFIG_COLUMNS).eq(
+            'is_enabled', True
+        ).neq('platform', 'notion').execute()
+        
+        for config in result.data or []:
+            self._apply_config(config)
+        print(f"⏰ [SCHEDULER] Scheduled {len(self._configs)} sync configurations")
     
-    def _run_scheduled_syncs(self):
-        """Run synchronization for all enabled configurations (excluding Notion)"""
+    def _refresh_changed_configs(self):
+        """Re-read only rows whose updated_at moved since the last read"""
         try:
-            # Get all enabled sync configurations (excluding Notion for manual-only sync)
-            result = supabase.table('calendar_sync_configs').select('''
-                user_id, platform, sync_frequency_minutes, last_sync_at,
-                consecutive_failures, credentials, is_enabled
-            ''').eq('is_enabled', True).neq('platform', 'notion').execute()
-            
-            current_time = datetime.now()
-            sync_tasks = []
-            
-            for config in result.data:
-                user_id = config['user_id']
-                platform = config['platform']
-                sync_frequency = config.get('sync_frequency_minutes', 15)
-                last_sync = config.get('last_sync_at')
-                consecutive_failures = config.get('consecutive_failures', 0)
-                
-                # Skip if too many consecutive failures
-                if consecutive_failures >= 5:
-                    continue
-                
-                # Check if sync is due
-                if self._is_sync_due(last_sync, sync_frequency, current_time):
-                    sync_tasks.append({
-                        'user_id': user_id,
-                        'platform': platform,
-                        'config': config
-                    })
+            if not self._config_watermark:
+                self._load_all_configs()
+                return
             
-            # Execute sync tasks
-            if sync_tasks:
-                # Running scheduled syncs
-                self._execute_sync_tasks(sync_tasks)
+            # Disabled rows are included so they can be dropped from the schedule
+            result = supabase.table('calendar_sync_configs').select(CONFIG_COLUMNS).gte(
+                'updated_at', self._config_watermark
+            ).neq('platform', 'notion').execute()
             
+            for config in result.data or []:
+                self._apply_config(config)
         except Exception as e:
-            print(f"Error getting sync configurations: {e}")
+            print(f"Error refreshing sync configurations: {e}")
     
-    def _is_sync_due(self, last_sync: str, frequency_minutes: int, current_time: datetime) -> bool:
-        """Check if sync is due based on frequency"""
-        if not last_sync:
-            return True  # Never synced before
+    def _apply_config(self, config: Dict):
+        """Add, reschedule or drop a single configuration"""
+        user_id = config['user_id']
+        platform = config['platform']
+        key = (user_id, platform)
+        
+        updated_at = config.get('updated_at')
+        if updated_at and (not self._config_watermark or updated_at > self._config_watermark):
+            self._config_watermark = updated_at
         
+        schedulable = (
+            config.get('is_enabled', True)
+            and platform != 'notion'
+            and (config.get('consecutive_failures') or 0) < 5  # Skip if too many consecutive failures
+            and self._in_shard(user_id)  # Skip tasks owned by another shard
+        )
+        
+        with self._schedule_lock:
+            if not schedulable:
+                # Leftover heap entry becomes stale and is skipped when popped
+                self._configs.pop(key, None)
+                self._due_at.pop(key, None)
+                return
+            previous = self._configs.get(key)
+            self._configs[key] = config
+        
+        if previous is not None and all(
+            previous.get(field) == config.get(field) for field in ('last_sync_at', 'sync_frequency_minutes')
+        ):
+            # Only lease/failure bookkeeping moved updated_at - keep the due time set after the last run
+            # (a failed run leaves last_sync_at in the past and would otherwise be retried right away)
+            return
+        self._schedule(key, self._next_due_timestamp(config.get('last_sync_at'), config.get('sync_frequency_minutes')))
+    
+    def _schedule(self, key: tuple, due_ts: float):
+        """Set a task's due time, waking the loop if it is now the earliest"""
+        with self._schedule_lock:
+            if key not in self._configs:
+                return
+            if self._due_at.get(key) == due_ts:
+                return
+            self._due_at[key] = due_ts
+            heapq.heappush(self._due_heap, (due_ts, next(self._seq), key))
+            is_earliest = self._due_heap[0][2] == key
+        if is_earliest:
+            self._wakeup.set()
+    
+    def _peek_next_due(self) -> Optional[float]:
+        """Earliest live due timestamp, discarding stale heap entries"""
+        with self._schedule_lock:
+            while self._due_heap:
+                due_ts, _, key = self._due_heap[0]
+                if self._due_at.get(key) == due_ts:
+                    return due_ts
+                heapq.heappop(self._due_heap)
+        return None
+    
+    def _pop_due_tasks(self, now: float) -> List[Dict]:
+        """Remove and return every task whose due time has passed"""
+        sync_tasks = []
+        with self._schedule_lock:
+            while self._due_heap and self._due_heap[0][0] <= now:
+                due_ts, _, key = heapq.heappop(self._due_heap)
+                if self._due_at.get(key) != due_ts:
+                    continue
+                del self._due_at[key]
+                sync_tasks.append({
+                    'user_id': key[0],
+                    'platform': key[1],
+                    'config': self._configs[key],
+                    'due_at': due_ts
+                })
+        return sync_tasks
+    
+    def _reschedule_after_run(self, user_id: str, platform: str):
+        """Queue the next run one sync interval after this one finished"""
+        key = (user_id, platform)
+        config = self._configs.get(key)
+        if not config or key in self._due_at:
+            return  # Dropped, or already rescheduled by a config refresh
+        frequency = config.get('sync_frequency_minutes') or self.sync_interval // 60
+        self._schedule(key, time.time() + frequency * 60)
+    
+    def _next_due_timestamp(self, last_sync: Optional[str], frequency_minutes: Optional[int]) -> float:
+        """Epoch seconds at which the task became/becomes due (never synced = 0)"""
+        if not last_sync:
+            return 0.0
         try:
             last_sync_time = datetime.fromisoformat(last_sync.replace('Z', '+00:00'))
-            time_since_last = current_time - last_sync_time
-            frequency_delta = timedelta(minutes=frequency_minutes)
-            
-            return time_since_last >= frequency_delta
-            
+            if last_sync_time.tzinfo is None:
+                last_sync_time = last_sync_time.astimezone()
+            return last_sync_time.timestamp() + (frequency_minutes or 15) * 60
         except Exception:
-            return True  # If we can't parse, assume sync is due
+            return 0.0
+    
+    def _in_shard(self, user_id: str) -> bool:
+        """Stable user -> shard assignment so hosts mostly claim disjoint work"""
+        if SYNC_SHARD_COUNT == 1:
+            return True
+        return zlib.crc32(str(user_id).encode()) % SYNC_SHARD_COUNT == SYNC_SHARD_INDEX
+    
+    def _platform_limit(self, platform: str) -> int:
+        return self.platform_limits.get(platform, DEFAULT_PLATFORM_CONCURRENCY)
     
     def _execute_sync_tasks(self, sync_tasks: List[Dict]):
-        """Execute synchronization tasks"""
-        for task in sync_tasks:
+        """Queue due tasks (earliest due first) and dispatch them to the worker pool"""
+        with self._dispatch_lock:
+            for task in sync_tasks:
+                key = (task['user_id'], task['platform'])
+                if key in self._in_flight or key in self._pending_keys:
+                    continue
+                self._pending_keys.add(key)
+                heapq.heappush(self._pending, (task.get('due_at', 0.0), next(self._seq), task))
+        self._dispatch_pending()
+    
+    def _dispatch_pending(self):
+        """Start queued tasks while pool and per-platform slots are free"""
+        with self._dispatch_lock:
+            if not self._executor:
+                return
+            deferred = []
+            while self._pending and len(self._in_flight) < self.max_workers:
+                item = heapq.heappop(self._pending)
+                task = item[2]
+                platform = task['platform']
+                if self._active_by_platform.get(platform, 0) >= self._platform_limit(platform):
+                    # Platform is saturated - keep its place in the queue
+                    deferred.append(item)
+                    continue
+                key = (task['user_id'], platform)
+                self._pending_keys.discard(key)
+                self._in_flight.add(key)
+                self._active_by_platform[platform] = self._active_by_platform.get(platform, 0) + 1
+                self._executor.submit(self._run_task, task)
+            for item in deferred:
+                heapq.heappush(self._pending, item)
+    
+    def _run_task(self, task: Dict):
+        """Worker body: claim the lease, sync, release, then refill the pool"""
+        user_id = task['user_id']
+        platform = task['platform']
+        try:
+            if not self._claim_lease(user_id, platform):
+                # Another process/host is already syncing this task
+                return
             try:
-                self._sync_user_platform(
-                    task['user_id'], 
-                    task['platform'], 
-                    task['config']
-                )
+                self._sync_user_platform(user_id, platform, task['config'])
             except Exception as e:
-                # Sync failed
-                self._record_sync_failure(task['user_id'], task['platform'], str(e))
+                # Failure already recorded by _sync_user_platform
+                print(f"⚠️ [SCHEDULER] Sync failed for {platform} (user: {user_id}): {e}")
+            finally:
+                self._release_lease(user_id, platform)
+        finally:
+            with self._dispatch_lock:
+                self._in_flight.discard((user_id, platform))
+                self._active_by_platform[platform] = max(0, self._active_by_platform.get(platform, 1) - 1)
+            self._reschedule_after_run(user_id, platform)
+            self._dispatch_pending()
+    
+    def _claim_lease(self, user_id: str, platform: str) -> bool:
+        """Atomically take the config row's lease if it is free or expired"""
+        try:
+            now = datetime.now(timezone.utc)
+            expires_at = now + timedelta(seconds=SYNC_LEASE_SECONDS)
+            result = supabase.table('calendar_sync_configs').update({
+                'lease_owner': self.worker_id,
+                'lease_expires_at': expires_at.isoformat()
+            }).eq('user_id', user_id).eq('platform', platform).or_(
+                f'lease_expires_at.is.null,lease_expires_at.lt."{now.isoformat()}"'
+            ).execute()
+            return bool(result.data)
+        except Exception as e:
+            print(f"Error claiming sync lease: {e}")
+            return False
+    
+    def _release_lease(self, user_id: str, platform: str):
+        """Release the lease if this worker still holds it"""
+        try:
+            supabase.table('calendar_sync_configs').update({
+                'lease_owner': None,
+                'lease_expires_at': None
+            }).eq('user_id', user_id).eq('platform', platform).eq('lease_owner', self.worker_id).execute()
+        except Exception as e:
+            print(f"Error releasing sync lease: {e}")
     
     def _sync_user_platform(self, user_id: str, platform: str, config: Dict):
         """Sync a specific user's platform"""
@@ -395,13 +629,27 @@ class SyncScheduler:
             # Get configurations with failures
             failed_result = supabase.table('calendar_sync_configs').select('user_id', count='exact').gte('consecutive_failures', 1).execute()
             
+            with self._dispatch_lock:
+                active_tasks = len(self._in_flight)
+                pending_tasks = len(self._pending)
+                active_by_platform = dict(self._active_by_platform)
+            next_due = self._peek_next_due()
+            
             return {
                 'scheduler_running': self.is_running,
+                'worker_id': self.worker_id,
+                'max_workers': self.max_workers,
+                'platform_limits': self.platform_limits,
+                'active_tasks': active_tasks,
+                'active_by_platform': active_by_platform,
+                'pending_tasks': pending_tasks,
+                'shard': f"{SYNC_SHARD_INDEX}/{SYNC_SHARD_COUNT}",
                 'sync_interval_minutes': self.sync_interval / 60,
+                'scheduled_configurations': len(self._configs),
                 'total_configurations': total_result.count or 0,
                 'enabled_configurations': enabled_result.count or 0,
                 'failed_configurations': failed_result.count or 0,
-                'next_sync_in_seconds': self.sync_interval if self.is_running else None
+                'next_sync_in_seconds': max(0, int(next_due - time.time())) if self.is_running and next_due is not None else None
             }
             
         except Exception as e: